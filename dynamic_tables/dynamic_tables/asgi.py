@@ -8,9 +8,19 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
 
 import os
+import threading
 
+from decouple import config
+from django.apps import apps
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dynamic_tables.settings")
+# Connections are closed at the end of each request unless configured otherwise, see CONN_MAX_AGE in the settings.
+os.environ.setdefault("DJANGO_DATABASE_CONN_MAX_AGE", config("DJANGO_DATABASE_CONN_MAX_AGE", default="0"))
 
 application = get_asgi_application()
+
+# ASGI servers may import the application inside a running event loop, where synchronous queries are refused.
+warm_up = threading.Thread(target=apps.get_app_config("tables").warm_up)
+warm_up.start()
+warm_up.join()
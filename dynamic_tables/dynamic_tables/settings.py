@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,6 +42,7 @@ EXTERNAL_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_extensions",
     "drf_yasg",
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "tables.replicas.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "dynamic_tables.urls"
@@ -91,7 +93,142 @@ DATABASES = {
         "PASSWORD": config("DJANGO_DATABASE_PASSWORD"),
         "HOST": config("DJANGO_DATABASE_HOST"),
         "PORT": config("DJANGO_DATABASE_PORT"),
+        # Connections are kept open for this many seconds and checked before reuse. Each worker thread holds
+        # at most one connection per alias, so the number of workers bounds the number of connections.
+        # Under ASGI synchronous code runs in executor threads which are not bounded by the workers, kept
+        # connections pile up and admission slots are session locks on them, so dynamic_tables.asgi defaults it to 0.
+        "CONN_MAX_AGE": config("DJANGO_DATABASE_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Parameters are sent separately from the query so the SQL of a table does not depend on the values
+            # and psycopg prepares it on the server after `prepare_threshold` executions on a connection. Turn
+            # both off behind transaction pooling poolers which do not support prepared statements.
+            "server_side_binding": config("DJANGO_DATABASE_SERVER_SIDE_BINDING", default=True, cast=bool),
+            "prepare_threshold": config(
+                "DJANGO_DATABASE_PREPARE_THRESHOLD", default="5", cast=lambda value: int(value) if value else None
+            ),
+        },
+    }
+}
+
+# Read replicas as "host[:port]", sharing the credentials of the primary. In tests they mirror the primary through
+# their own connection, so only transactional tests see rows on them, leave this empty for the regular test suite.
+for index, replica_host in enumerate(config("DJANGO_DATABASE_REPLICA_HOSTS", default="", cast=Csv())):
+    host, _, port = replica_host.partition(":")
+    DATABASES[f"replica{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["tables.replicas.ReplicaRouter"]
+TABLE_DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+# Replicas lagging more than this many seconds are skipped, health is rechecked every interval.
+TABLE_REPLICA_MAX_LAG = config("DJANGO_TABLE_REPLICA_MAX_LAG", default=5.0, cast=float)
+TABLE_REPLICA_HEALTH_INTERVAL = config("DJANGO_TABLE_REPLICA_HEALTH_INTERVAL", default=10.0, cast=float)
+# Clients are pinned to the primary for this many seconds after a write, to read their own writes.
+TABLE_REPLICA_STICKY_SECONDS = config("DJANGO_TABLE_REPLICA_STICKY_SECONDS", default=10, cast=int)
+TABLE_REPLICA_STICKY_COOKIE = "tables_primary"
+# Prepared statements kept per connection, dropped once a table the connection served changes schema version.
+TABLE_PREPARED_STATEMENTS_MAX = config("DJANGO_TABLE_PREPARED_STATEMENTS_MAX", default=200, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+ROWS_CACHE_BACKEND = config("DJANGO_ROWS_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache")
+
+CACHES = {
+    "default": {
+        "BACKEND": config("DJANGO_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("DJANGO_CACHE_LOCATION", default=""),
+    },
+    "rows": {
+        "BACKEND": ROWS_CACHE_BACKEND,
+        "LOCATION": config("DJANGO_ROWS_CACHE_LOCATION", default="rows"),
+        "TIMEOUT": config("DJANGO_ROWS_CACHE_TIMEOUT", default=60, cast=int),
+        # Redis enforces its own memory cap through `maxmemory`, the entry limit applies to local backends only.
+        "OPTIONS": (
+            {}
+            if "redis" in ROWS_CACHE_BACKEND
+            else {"MAX_ENTRIES": config("DJANGO_ROWS_CACHE_MAX_ENTRIES", default=1000, cast=int)}
+        ),
+    },
+}
+
+# Invalidation goes through a data version kept in the rows cache, a local memory cache is private to its process
+# and other workers keep serving rows written through one of them. It is only enabled by default with a shared
+# backend, enable it with a local one for a single worker process only.
+ROWS_CACHE_ENABLED = config("DJANGO_ROWS_CACHE_ENABLED", default="locmem" not in ROWS_CACHE_BACKEND, cast=bool)
+ROWS_CACHE_MAX_ENTRY_SIZE = config("DJANGO_ROWS_CACHE_MAX_ENTRY_SIZE", default=1024 * 1024, cast=int)
+# The API schema and per-table schemas are kept in the default cache, per-table entries are keyed by schema version.
+API_SCHEMA_CACHE_TIMEOUT = config("DJANGO_API_SCHEMA_CACHE_TIMEOUT", default=3600, cast=int)
+
+
+# Dynamic tables
+
+TABLE_PARTITIONS_AHEAD = config("DJANGO_TABLE_PARTITIONS_AHEAD", default=4, cast=int)
+# "all", "none" or the number of most recently used tables built when a worker process starts.
+TABLE_WARMUP = config("DJANGO_TABLE_WARMUP", default="none")
+
+TABLE_JOB_WORKERS = config("DJANGO_TABLE_JOB_WORKERS", default=2, cast=int)
+TABLE_JOB_CONCURRENCY_PER_TABLE = config("DJANGO_TABLE_JOB_CONCURRENCY_PER_TABLE", default=1, cast=int)
+TABLE_JOB_POLL_INTERVAL = config("DJANGO_TABLE_JOB_POLL_INTERVAL", default=1.0, cast=float)
+# Running jobs report progress as a heartbeat, jobs without one for this many seconds are failed as abandoned.
+TABLE_JOB_TIMEOUT = config("DJANGO_TABLE_JOB_TIMEOUT", default=600, cast=int)
+TABLE_IMPORT_BATCH_SIZE = config("DJANGO_TABLE_IMPORT_BATCH_SIZE", default=1000, cast=int)
+TABLE_UPSERT_BATCH_SIZE = config("DJANGO_TABLE_UPSERT_BATCH_SIZE", default=1000, cast=int)
+# Single-row writes to tables with `coalesce_writes` wait up to the window (milliseconds, per table override)
+# for other writes to commit with, and a group is committed early once it reaches the row limit.
+TABLE_COALESCE_WINDOW = config("DJANGO_TABLE_COALESCE_WINDOW", default=5, cast=int)
+TABLE_COALESCE_MAX_ROWS = config("DJANGO_TABLE_COALESCE_MAX_ROWS", default=500, cast=int)
+# Concurrent requests per table and endpoint class across all workers, tables can override them and 0 disables
+# a limit. Requests over the limit wait up to the timeout for a slot, then get 429 with Retry-After.
+TABLE_CONCURRENCY_LIMITS = {
+    "read": config("DJANGO_TABLE_CONCURRENCY_READ", default=16, cast=int),
+    "bulk_write": config("DJANGO_TABLE_CONCURRENCY_BULK_WRITE", default=2, cast=int),
+    "schema": config("DJANGO_TABLE_CONCURRENCY_SCHEMA", default=1, cast=int),
+    "export": config("DJANGO_TABLE_CONCURRENCY_EXPORT", default=2, cast=int),
+}
+TABLE_ADMISSION_TIMEOUT = config("DJANGO_TABLE_ADMISSION_TIMEOUT", default=5.0, cast=float)
+TABLE_ADMISSION_POLL_INTERVAL = config("DJANGO_TABLE_ADMISSION_POLL_INTERVAL", default=0.05, cast=float)
+TABLE_ADMISSION_MAX_QUEUE = config("DJANGO_TABLE_ADMISSION_MAX_QUEUE", default=16, cast=int)
+TABLE_ADMISSION_RETRY_AFTER = config("DJANGO_TABLE_ADMISSION_RETRY_AFTER", default=1, cast=int)
+TABLE_LOOKUP_MAX_IDS = config("DJANGO_TABLE_LOOKUP_MAX_IDS", default=10000, cast=int)
+TABLE_EXPORT_CHUNK_SIZE = config("DJANGO_TABLE_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+TABLE_CHANGES_PAGE_SIZE = config("DJANGO_TABLE_CHANGES_PAGE_SIZE", default=1000, cast=int)
+# Row samples are capped at the max, tables estimated under the min are previewed with their first rows.
+TABLE_SAMPLE_MAX_ROWS = config("DJANGO_TABLE_SAMPLE_MAX_ROWS", default=10000, cast=int)
+TABLE_SAMPLE_MIN_ROWS = config("DJANGO_TABLE_SAMPLE_MIN_ROWS", default=1000, cast=int)
+# Seconds table statistics and the all-tables summary are cached for.
+TABLE_STATS_CACHE_TIMEOUT = config("DJANGO_TABLE_STATS_CACHE_TIMEOUT", default=10, cast=int)
+# Seconds between folds of logged changes into rollup tables by `manage.py refresh_rollups`.
+TABLE_ROLLUP_REFRESH_INTERVAL = config("DJANGO_TABLE_ROLLUP_REFRESH_INTERVAL", default=5.0, cast=float)
+# Rows per page and columns shown when browsing rows in the admin.
+TABLE_ADMIN_PAGE_SIZE = config("DJANGO_TABLE_ADMIN_PAGE_SIZE", default=100, cast=int)
+TABLE_ADMIN_MAX_COLUMNS = config("DJANGO_TABLE_ADMIN_MAX_COLUMNS", default=10, cast=int)
+# Text search configuration baked into generated search columns, changing it only affects new columns.
+TABLE_SEARCH_CONFIG = config("DJANGO_TABLE_SEARCH_CONFIG", default="simple")
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "tables": {
+            "handlers": ["console"],
+            "level": config("DJANGO_TABLES_LOG_LEVEL", default="INFO"),
+        },
+    },
 }
 
 
@@ -15,15 +15,20 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import functools
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
-schema_view = get_schema_view(
+SchemaView = get_schema_view(
     openapi.Info(
         title="Dynamic Tables API",
         default_version="v1",
@@ -32,20 +37,43 @@ schema_view = get_schema_view(
     permission_classes=(permissions.AllowAny,),
 )
 
+
+def revalidated(view):
+    # Cache hits are already rendered, which conditional_page leaves alone, so the ETag is handled here.
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs).render()
+        if not response.has_header("ETag"):
+            set_response_etag(response)
+        return get_conditional_response(request, etag=response["ETag"], response=response)
+
+    return wrapper
+
+
+class CachedSchemaView(SchemaView):
+    @classmethod
+    def apply_cache(cls, view, cache_timeout, cache_kwargs):
+        # Generated once per timeout and revalidated by clients with an ETag, where drf-yasg forbids
+        # client caching altogether.
+        view = vary_on_headers("Cookie", "Authorization")(view)
+        view = cache_page(cache_timeout, **cache_kwargs)(view)
+        return revalidated(view)
+
+
 urlpatterns = [
     path(
         "swagger<format>/",
-        schema_view.without_ui(cache_timeout=0),
+        CachedSchemaView.without_ui(cache_timeout=settings.API_SCHEMA_CACHE_TIMEOUT),
         name="schema-json",
     ),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        CachedSchemaView.with_ui("swagger", cache_timeout=settings.API_SCHEMA_CACHE_TIMEOUT),
         name="schema-swagger-ui",
     ),
     path(
         "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
+        CachedSchemaView.with_ui("redoc", cache_timeout=settings.API_SCHEMA_CACHE_TIMEOUT),
         name="schema-redoc",
     ),
     path("admin/", admin.site.urls),
@@ -1,8 +1,64 @@
-from django.contrib import admin
-from tables.models import DynamicModel, DynamicModelField
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import F
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+from rest_framework import serializers
+from tables.helpers import construct_rows_queryset, filter_rows, get_dynamic_table
+from tables.models import DynamicModel, DynamicModelField, Job
+from tables.sampling import estimate_rows
+
+ROWS_PAGE_PARAMS = ("after", "before")
+
+
+def page_id(params, name: str):
+    return serializers.IntegerField(min_value=0).run_validation(params[name]) if params.get(name) else None
+
+
+def browse_rows(dynamic_model: DynamicModel, params):
+    """
+    Return one keyset page of a dynamic model's rows for the admin, with at most `TABLE_ADMIN_MAX_COLUMNS`
+    columns and exact or lookup filters on indexed fields only, so every page is an index range scan.
+    """
+    table = get_dynamic_table(dynamic_model)
+    fields = {field.name: field for field in table.fields}
+    columns = [name.strip() for name in params.get("columns", "").split(",") if name.strip() in fields]
+    columns = columns[: settings.TABLE_ADMIN_MAX_COLUMNS] or list(fields)[: settings.TABLE_ADMIN_MAX_COLUMNS]
+    indexed = [field.name for field in table.fields if field.indexed or field.natural_key]
+    filters = {param: value for param, value in params.items() if value and param.partition("__")[0] in indexed}
+    queryset = filter_rows(construct_rows_queryset(dynamic_model, table.model, table.fields), filters)
+
+    size = settings.TABLE_ADMIN_PAGE_SIZE
+    after, before = (page_id(params, name) for name in ROWS_PAGE_PARAMS)
+    values = ["pk", *[F(name) for name in columns]]
+    if before is not None:
+        rows = list(queryset.filter(pk__lt=before).order_by("-pk").values_list(*values)[: size + 1])
+        has_previous, has_next = len(rows) > size, True
+        rows = rows[:size][::-1]
+    else:
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+        rows = list(queryset.order_by("pk").values_list(*values)[: size + 1])
+        has_previous, has_next = after is not None, len(rows) > size
+        rows = rows[:size]
+    return {
+        "columns": columns,
+        "hidden_columns": [name for name in fields if name not in columns],
+        "filter_fields": [(name, filters.get(name, "")) for name in indexed],
+        "filters": filters,
+        "rows": rows,
+        "previous_id": rows[0][0] if rows and has_previous else None,
+        "next_id": rows[-1][0] if rows and has_next else None,
+        "estimated_count": estimate_rows(table.model),
+    }
 
 
 class ReadOnlyAdmin(admin.ModelAdmin):
+    show_full_result_count = False
+
     def has_add_permission(self, request):
         return False
 
@@ -18,8 +74,42 @@ class DynamicModelAdmin(ReadOnlyAdmin):
     list_display = (
         "id",
         "name",
+        "rows_link",
     )
 
+    def get_urls(self):
+        rows_view = self.admin_site.admin_view(self.rows_view)
+        return [path("<int:object_id>/rows/", rows_view, name="tables_dynamicmodel_rows"), *super().get_urls()]
+
+    @admin.display(description="Rows")
+    def rows_link(self, obj):
+        return format_html('<a href="{}">Browse rows</a>', reverse("admin:tables_dynamicmodel_rows", args=[obj.pk]))
+
+    def rows_view(self, request, object_id):
+        """
+        Read-only, keyset paginated list of the rows of a dynamic model.
+        """
+        dynamic_model = get_object_or_404(DynamicModel, pk=object_id)
+        if not self.has_view_permission(request, dynamic_model):
+            raise PermissionDenied
+        try:
+            page = browse_rows(dynamic_model, request.GET)
+        except serializers.ValidationError as error:
+            self.message_user(request, f"Invalid filters: {error.detail}", messages.ERROR)
+            page = browse_rows(dynamic_model, {})
+        params = request.GET.copy()
+        for name in ROWS_PAGE_PARAMS:
+            params.pop(name, None)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "original": dynamic_model,
+            "title": f"Rows of {dynamic_model.name}",
+            "query": params.urlencode(),
+            **page,
+        }
+        return TemplateResponse(request, "admin/tables/dynamicmodel/rows.html", context)
+
 
 @admin.register(DynamicModelField)
 class DynamicModelFieldAdmin(ReadOnlyAdmin):
@@ -30,3 +120,17 @@ class DynamicModelFieldAdmin(ReadOnlyAdmin):
         "type",
         "allow_null",
     )
+
+
+@admin.register(Job)
+class JobAdmin(ReadOnlyAdmin):
+    list_display = (
+        "id",
+        "dynamic_model",
+        "kind",
+        "status",
+        "processed",
+        "total",
+        "created_at",
+    )
+    list_filter = ("status", "kind")
@@ -0,0 +1,124 @@
+import functools
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.exceptions import Throttled
+from tables import metrics
+from tables.constants import EndpointClassE
+from tables.models import DynamicModel
+
+# High bits of the bigint advisory lock keys of admission slots. Bigint keys do not conflict with the two-key
+# locks of change tracking.
+ADMISSION_LOCK = 32
+MAX_SLOTS = 256
+
+# Takes the first free slot only, the filter is evaluated row by row until the limit is reached.
+ACQUIRE_SLOT_SQL = """
+    SELECT %(base)s + slot FROM generate_series(0, %(slots)s - 1) AS slot
+    WHERE pg_try_advisory_lock(%(base)s + slot)
+    LIMIT 1
+"""
+
+
+def admission_metrics(endpoint_class: str):
+    return [f"admission_{endpoint_class}_{name}" for name in ("queued", "waits", "wait_ms", "rejected")]
+
+
+ADMISSION_METRICS = [name for endpoint_class in EndpointClassE for name in admission_metrics(endpoint_class.value)]
+
+
+def admission_limit(dynamic_model: DynamicModel, endpoint_class: str):
+    """
+    Return the concurrency limit of an endpoint class for the model, None when it is unlimited.
+    """
+    limit = (dynamic_model.concurrency_limits or {}).get(endpoint_class)
+    if limit is None:
+        limit = settings.TABLE_CONCURRENCY_LIMITS.get(endpoint_class)
+    return min(limit, MAX_SLOTS) if limit else None
+
+
+def slot_base(dynamic_model_id: int, endpoint_class: str):
+    index = list(EndpointClassE).index(EndpointClassE(endpoint_class))
+    return (ADMISSION_LOCK << 56) | (dynamic_model_id << 16) | (index << 8)
+
+
+def try_acquire_slot(dynamic_model: DynamicModel, endpoint_class: str, limit: int):
+    with connection.cursor() as cursor:
+        cursor.execute(ACQUIRE_SLOT_SQL, {"base": slot_base(dynamic_model.pk, endpoint_class), "slots": limit})
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def reject(dynamic_model: DynamicModel, endpoint_class: str):
+    metrics.increment(dynamic_model.pk, f"admission_{endpoint_class}_rejected")
+    raise Throttled(
+        wait=settings.TABLE_ADMISSION_RETRY_AFTER,
+        detail=f"Too many concurrent {EndpointClassE(endpoint_class).name.lower().replace('_', ' ')} requests "
+        "for this table.",
+    )
+
+
+def acquire_slot(dynamic_model: DynamicModel, endpoint_class: str):
+    """
+    Take one of the table's slots for the endpoint class, waiting up to `TABLE_ADMISSION_TIMEOUT` for one.
+
+    Slots are session advisory locks, shared by all workers and released with the connection if a worker dies.
+    At most `TABLE_ADMISSION_MAX_QUEUE` requests of a process wait, later ones are rejected right away. Waiting
+    requests are counted in the memory of the process.
+    Returns the lock key to release, None when the endpoint class is unlimited.
+    """
+    limit = admission_limit(dynamic_model, endpoint_class)
+    if limit is None:
+        return None
+    key = try_acquire_slot(dynamic_model, endpoint_class, limit)
+    if key is not None:
+        return key
+
+    queued = f"admission_{endpoint_class}_queued"
+    started = time.monotonic()
+    try:
+        if metrics.adjust_gauge(dynamic_model.pk, queued, 1) > settings.TABLE_ADMISSION_MAX_QUEUE:
+            reject(dynamic_model, endpoint_class)
+        while key is None:
+            if time.monotonic() - started >= settings.TABLE_ADMISSION_TIMEOUT:
+                reject(dynamic_model, endpoint_class)
+            time.sleep(settings.TABLE_ADMISSION_POLL_INTERVAL)
+            key = try_acquire_slot(dynamic_model, endpoint_class, limit)
+    finally:
+        metrics.adjust_gauge(dynamic_model.pk, queued, -1)
+    metrics.increment(dynamic_model.pk, f"admission_{endpoint_class}_waits")
+    metrics.increment(dynamic_model.pk, f"admission_{endpoint_class}_wait_ms", int((time.monotonic() - started) * 1000))
+    return key
+
+
+def release_slot(key):
+    if key is not None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+
+@contextmanager
+def admit(dynamic_model: DynamicModel, endpoint_class: str):
+    key = acquire_slot(dynamic_model, endpoint_class)
+    try:
+        yield
+    finally:
+        release_slot(key)
+
+
+def admitted(endpoint_class: EndpointClassE):
+    """
+    Run a viewset action only within the concurrency limit of its endpoint class for the requested table.
+    """
+
+    def decorator(action):
+        @functools.wraps(action)
+        def wrapper(self, request, *args, **kwargs):
+            with admit(self.get_object(), endpoint_class.value):
+                return action(self, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
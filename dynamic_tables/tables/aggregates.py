@@ -0,0 +1,73 @@
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from rest_framework import serializers
+from tables.constants import AggregateFunctionE
+from tables.helpers import DynamicTable, construct_rows_queryset, construct_text_expression, filter_rows
+from tables.models import DynamicModel, DynamicModelField
+from tables.renderers import TabularRows
+
+AGGREGATE_FUNCTIONS = {
+    AggregateFunctionE.SUM.value: Sum,
+    AggregateFunctionE.AVG.value: Avg,
+    AggregateFunctionE.MIN.value: Min,
+    AggregateFunctionE.MAX.value: Max,
+}
+NUMERIC_FUNCTIONS = (AggregateFunctionE.SUM.value, AggregateFunctionE.AVG.value)
+
+
+def split_param(value: str):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def construct_aggregates(dynamic_model: DynamicModel, fields: dict, metrics: list):
+    """
+    Translate `count` and `<function>:<field>` metrics into named aggregate expressions.
+    """
+    aggregates = {}
+    for metric in metrics:
+        if metric == AggregateFunctionE.COUNT.value:
+            aggregates[metric] = Count("pk")
+            continue
+        function, _, name = metric.partition(":")
+        if function not in AGGREGATE_FUNCTIONS or name not in fields:
+            raise serializers.ValidationError(
+                {"metrics": f"{metric} is not count or <{'|'.join(AGGREGATE_FUNCTIONS)}>:<field> of this model."}
+            )
+        if function in NUMERIC_FUNCTIONS and fields[name].type != DynamicModelField.DynamicModelFieldType.NUMBER:
+            raise serializers.ValidationError({"metrics": f"{function} requires a number field."})
+        if fields[name].type == DynamicModelField.DynamicModelFieldType.BOOLEAN:
+            raise serializers.ValidationError({"metrics": f"{function} is not available for boolean fields."})
+        aggregates[f"{function}_{name}"] = AGGREGATE_FUNCTIONS[function](
+            construct_text_expression(dynamic_model, fields[name])
+        )
+    return aggregates
+
+
+def aggregate_rows(dynamic_model: DynamicModel, table: DynamicTable, query_params):
+    """
+    Group the filtered rows of a dynamic model by the `group_by` fields and compute the `metrics` of every group.
+
+    Returns the groups as `values_list` tuples, group fields first and metrics in the requested order.
+    """
+    fields = {field.name: field for field in table.fields}
+    group_by = split_param(query_params.get("group_by", ""))
+    for name in group_by:
+        if name not in fields:
+            raise serializers.ValidationError({"group_by": f"{name} is not a field of this model."})
+    aggregates = construct_aggregates(
+        dynamic_model, fields, split_param(query_params.get("metrics", AggregateFunctionE.COUNT.value))
+    )
+    if not aggregates:
+        raise serializers.ValidationError({"metrics": "At least one metric is required."})
+
+    queryset = filter_rows(construct_rows_queryset(dynamic_model, table.model, table.fields), query_params)
+    columns = [*group_by, *aggregates]
+    if not group_by:
+        result = queryset.aggregate(**aggregates)
+        return TabularRows(columns, [tuple(result[column] for column in columns)])
+    if dynamic_model.storage_mode == DynamicModel.StorageMode.COLUMNS:
+        queryset = queryset.values(*group_by)
+    else:
+        # Jsonb fields are aliases, which have to be promoted before they can be grouped by.
+        queryset = queryset.values(**{name: F(name) for name in group_by})
+    rows = queryset.annotate(**aggregates).order_by(*group_by).values_list(*columns)
+    return TabularRows(columns, rows)
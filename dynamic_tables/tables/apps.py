@@ -1,6 +1,72 @@
+import logging
+import time
+import tracemalloc
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
 
 
 class TablesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tables"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from tables import checks  # noqa: F401
+        from tables.statements import configure_connection
+
+        connection_created.connect(configure_connection, dispatch_uid="tables_configure_connection")
+
+    def warm_up(self, mode=None):
+        """
+        Build and register generated models and row serializers before the first request needs them.
+
+        `mode` is "all", "none" or the number of most recently used tables and defaults to `TABLE_WARMUP`.
+        Django discourages queries from `ready()`, so this is called by the WSGI/ASGI entry points and the
+        `warm_dynamic_models` command instead.
+
+        Returns a report with the number of tables, elapsed seconds and allocated bytes, or None when skipped.
+        """
+        from tables.helpers import get_dynamic_table
+        from tables.models import DynamicModel
+
+        mode = str(settings.TABLE_WARMUP if mode is None else mode)
+        if mode == "none":
+            return None
+        queryset = DynamicModel.objects.prefetch_related("fields")
+        if mode != "all":
+            queryset = queryset.order_by(F("last_used_at").desc(nulls_last=True), "-pk")[: int(mode)]
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            dynamic_models = list(queryset)
+            for dynamic_model in dynamic_models:
+                get_dynamic_table(dynamic_model)
+        except DatabaseError:
+            logger.exception("Dynamic models warm-up failed.")
+            return None
+        finally:
+            memory_after = tracemalloc.get_traced_memory()[0]
+            if not tracing:
+                tracemalloc.stop()
+
+        report = {
+            "tables": len(dynamic_models),
+            "seconds": time.perf_counter() - start,
+            "memory_bytes": memory_after - memory_before,
+        }
+        logger.info(
+            "Warmed up %d dynamic models in %.3f s using %.1f KiB.",
+            report["tables"],
+            report["seconds"],
+            report["memory_bytes"] / 1024,
+        )
+        return report
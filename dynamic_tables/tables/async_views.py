@@ -0,0 +1,172 @@
+"""
+Asynchronous versions of the row endpoints, for serving many slow clients from one ASGI process.
+
+Run them under an ASGI server, e.g. `uvicorn dynamic_tables.asgi:application`. Queries still execute through
+Django's thread sensitive executor, what the async views save is a worker thread per request waiting on its client.
+"""
+
+import functools
+import json
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import exceptions, serializers
+from rest_framework.renderers import JSONRenderer
+from tables.admission import acquire_slot, release_slot
+from tables.cache import invalidate_rows_cache
+from tables.coalescing import create_row
+from tables.constants import EndpointClassE
+from tables.helpers import (
+    check_row_references,
+    get_dynamic_table,
+    lookup_rows,
+    parse_expand,
+    parse_row_ids,
+    query_rows,
+    serialize_rows,
+)
+from tables.metrics import increment, request_metric
+from tables.models import DynamicModel
+from tables.replicas import replica_read
+
+
+def async_api_view(view):
+    """
+    Translate missing dynamic models and API exceptions into JSON responses, like the DRF views do.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except DynamicModel.DoesNotExist:
+            return JsonResponse({"detail": "No DynamicModel matches the given query."}, status=404)
+        except exceptions.APIException as error:
+            detail = error.detail if isinstance(error.detail, (list, dict)) else {"detail": error.detail}
+            response = JsonResponse(detail, status=error.status_code, safe=False)
+            if getattr(error, "wait", None):
+                response["Retry-After"] = f"{error.wait:.0f}"
+            return response
+
+    return wrapper
+
+
+ASYNC_ACTIONS = ["async_rows", "async_row", "async_export"]
+
+
+def mark_request(dynamic_model: DynamicModel, action: str):
+    dynamic_model.mark_used()
+    increment(dynamic_model.pk, request_metric(action))
+
+
+async def aget_dynamic_table(pk, action):
+    dynamic_model = await DynamicModel.objects.aget(pk=pk)
+    await sync_to_async(mark_request)(dynamic_model, action)
+    return dynamic_model, await sync_to_async(get_dynamic_table)(dynamic_model)
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@asynccontextmanager
+async def admit(dynamic_model: DynamicModel, endpoint_class: str):
+    # Slots are locks of the connection of the request's thread, which also runs the queries of the request.
+    slot = await sync_to_async(acquire_slot)(dynamic_model, endpoint_class)
+    try:
+        yield
+    finally:
+        await sync_to_async(release_slot)(slot)
+
+
+@replica_read
+@require_GET
+@async_api_view
+async def rows(request, pk):
+    """
+    Endpoint to retrieve rows for a dynamic model, accepting the query parameters of the synchronous rows endpoint.
+
+    Returns a response with status 200 and a JSON array containing serialized rows.
+    """
+    dynamic_model, table = await aget_dynamic_table(pk, "async_rows")
+    expand = parse_expand(table, request.GET["expand"]) if "expand" in request.GET else []
+    async with admit(dynamic_model, EndpointClassE.READ.value):
+        if "ids" in request.GET:
+            ids = parse_row_ids(request.GET["ids"])
+            instances = await sync_to_async(lookup_rows)(dynamic_model, table, ids)
+        else:
+            # Sampling sizes up the table before the rows are queried.
+            queryset = await sync_to_async(query_rows)(dynamic_model, table, request.GET)
+            instances = [instance async for instance in queryset.aiterator()]
+        # Expanding references queries the referenced tables.
+        if expand:
+            data = await sync_to_async(serialize_rows)(table, instances, expand)
+        else:
+            data = serialize_rows(table, instances)
+    return HttpResponse(render(data), content_type="application/json")
+
+
+@csrf_exempt
+@require_POST
+@async_api_view
+async def row(request, pk):
+    """
+    Endpoint to create a row in a dynamic model from a JSON or form encoded body.
+
+    Returns a response with status 201 and the serialized data of the created row.
+    """
+    dynamic_model, table = await aget_dynamic_table(pk, "async_row")
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError as error:
+            raise serializers.ValidationError({"detail": f"JSON parse error - {error}"})
+    else:
+        data = request.POST
+    serializer = table.serializer_class(data=data)
+    async with admit(dynamic_model, EndpointClassE.READ.value):
+        # Validators of the row serializer may query the table, e.g. for natural keys.
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+        await sync_to_async(check_row_references)(table, serializer.validated_data)
+        if dynamic_model.coalesce_writes:
+            # Waiting for the group to commit blocks the thread of this request only.
+            instance = await sync_to_async(create_row)(dynamic_model, table.model, serializer.validated_data)
+        else:
+            instance = await table.model.objects.acreate(**serializer.validated_data)
+            await sync_to_async(invalidate_rows_cache)(dynamic_model)
+    return HttpResponse(render(table.serializer_class(instance).data), status=201, content_type="application/json")
+
+
+@replica_read
+@require_GET
+@async_api_view
+async def export(request, pk):
+    """
+    Endpoint to stream rows of a dynamic model as newline delimited JSON, accepting the rows query parameters.
+
+    Rows are fetched in chunks of `TABLE_EXPORT_CHUNK_SIZE` and sent as they are read, so memory use does not grow
+    with the table and a slow client only holds a suspended coroutine. The export holds a slot of the table's
+    export concurrency limit until the stream ends.
+
+    Returns a streaming response with status 200 and one JSON object per line.
+    """
+    dynamic_model, table = await aget_dynamic_table(pk, "async_export")
+    queryset = await sync_to_async(query_rows)(dynamic_model, table, request.GET)
+    # The slot is held until the stream ends, not until the view returns.
+    slot = await sync_to_async(acquire_slot)(dynamic_model, EndpointClassE.EXPORT.value)
+
+    async def stream():
+        try:
+            async for instance in queryset.aiterator(chunk_size=settings.TABLE_EXPORT_CHUNK_SIZE):
+                yield render(table.serializer_class(instance).data) + b"\n"
+        finally:
+            await sync_to_async(release_slot)(slot)
+
+    response = StreamingHttpResponse(stream(), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{dynamic_model.name}.ndjson"'
+    return response
@@ -0,0 +1,83 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from tables import metrics
+from tables.models import DynamicModel
+
+ROWS_CACHE_ALIAS = "rows"
+ROWS_CACHE_KEY_PREFIX = "tables:rows"
+ROWS_CACHE_METRICS = ["rows_cache_hits", "rows_cache_misses"]
+
+
+def rows_cache():
+    return caches[ROWS_CACHE_ALIAS]
+
+
+def rows_cache_enabled(dynamic_model: DynamicModel):
+    return settings.ROWS_CACHE_ENABLED and dynamic_model.cache_rows
+
+
+def data_version_key(dynamic_model_id: int):
+    return f"{ROWS_CACHE_KEY_PREFIX}:{dynamic_model_id}:data_version"
+
+
+def get_data_version(dynamic_model_id: int):
+    # A missing version (first read or evicted) starts from a fresh value so stale entries are never addressed again.
+    key = data_version_key(dynamic_model_id)
+    rows_cache().add(key, time.time_ns(), timeout=None)
+    return rows_cache().get(key)
+
+
+def bump_data_version(dynamic_model_id: int):
+    key = data_version_key(dynamic_model_id)
+    try:
+        rows_cache().incr(key)
+    except ValueError:
+        rows_cache().set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_rows_cache(dynamic_model: DynamicModel):
+    dynamic_model_id = dynamic_model.pk
+    transaction.on_commit(lambda: bump_data_version(dynamic_model_id))
+
+
+def rows_cache_key(dynamic_model: DynamicModel, request):
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    digest = hashlib.sha256(repr((request.accepted_media_type, params)).encode()).hexdigest()
+    return ":".join(
+        [
+            ROWS_CACHE_KEY_PREFIX,
+            str(dynamic_model.pk),
+            str(dynamic_model.schema_version),
+            str(get_data_version(dynamic_model.pk)),
+            digest,
+        ]
+    )
+
+
+def get_cached_rows_response(dynamic_model: DynamicModel, key: str):
+    cached = rows_cache().get(key)
+    if cached is None:
+        metrics.increment(dynamic_model.pk, "rows_cache_misses")
+        return None
+    metrics.increment(dynamic_model.pk, "rows_cache_hits")
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def cache_rows_response(dynamic_model: DynamicModel, key: str, response):
+    timeout = dynamic_model.cache_timeout if dynamic_model.cache_timeout is not None else rows_cache().default_timeout
+
+    def store(rendered_response):
+        if len(rendered_response.content) <= settings.ROWS_CACHE_MAX_ENTRY_SIZE:
+            rows_cache().set(key, (rendered_response.content, rendered_response["Content-Type"]), timeout)
+
+    response["X-Cache"] = "MISS"
+    response.add_post_render_callback(store)
+    return response
@@ -0,0 +1,64 @@
+from django.db import connection
+from tables.helpers import UPDATED_SEQ_FIELD, get_dynamic_table
+from tables.models import DynamicModel
+
+# First key of the advisory lock taken by the change tracking trigger, the second key is the model id.
+# Must match the tables_track_changes() function created in migration 0012.
+CHANGES_LOCK = 31
+
+
+def install_change_trigger(dynamic_model: DynamicModel, model):
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TRIGGER {quote_name(f'{model._meta.db_table}_changes')} "
+            f"BEFORE INSERT OR UPDATE OR DELETE ON {quote_name(model._meta.db_table)} "
+            f"FOR EACH ROW EXECUTE FUNCTION tables_track_changes({int(dynamic_model.pk)})"
+        )
+
+
+def get_change_horizon(dynamic_model: DynamicModel):
+    """
+    Return the highest change sequence number below which every change of the model is committed.
+
+    Sequence numbers are taken before commit, so a later number can become visible before an earlier one.
+    Writers hold the shared advisory lock of the model until they commit, taking it exclusively waits for
+    them, and no number handed out before that point can appear later.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s, %s)", [CHANGES_LOCK, dynamic_model.pk])
+        try:
+            cursor.execute("SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM tables_change_seq")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [CHANGES_LOCK, dynamic_model.pk])
+
+
+def get_changes(dynamic_model: DynamicModel, since: int, limit: int):
+    """
+    Return rows inserted or updated and ids of rows deleted after the `since` cursor, at most `limit` of them,
+    with the cursor to continue from.
+    """
+    horizon = get_change_horizon(dynamic_model)
+    table = get_dynamic_table(dynamic_model)
+    seq_range = {f"{UPDATED_SEQ_FIELD}__gt": since, f"{UPDATED_SEQ_FIELD}__lte": horizon}
+    rows = table.model.objects.filter(**seq_range).order_by(UPDATED_SEQ_FIELD)[: limit + 1]
+    tombstones = (
+        dynamic_model.tombstones.filter(seq__gt=since, seq__lte=horizon)
+        .order_by("seq")
+        .values_list("seq", "row_id")[: limit + 1]
+    )
+    changes = sorted(
+        [(getattr(row, UPDATED_SEQ_FIELD), row, None) for row in rows]
+        + [(seq, None, row_id) for seq, row_id in tombstones],
+        key=lambda change: change[0],
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    cursor = changes[-1][0] if has_more else max(horizon, since)
+    return {
+        "upserted": table.serializer_class([row for _, row, _ in changes if row is not None], many=True).data,
+        "deleted": [row_id for _, _, row_id in changes if row_id is not None],
+        "cursor": str(cursor),
+        "has_more": has_more,
+    }
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_rows_cache(app_configs, **kwargs):
+    """
+    Warn when rows are cached in local memory, only correct with a single worker process.
+    """
+    if settings.ROWS_CACHE_ENABLED and "locmem" in settings.CACHES["rows"]["BACKEND"]:
+        return [
+            Warning(
+                "The rows cache is kept in local memory, workers serve stale rows after writes through other workers.",
+                hint="Set DJANGO_ROWS_CACHE_BACKEND to a shared backend such as Redis, or run a single worker process.",
+                id="tables.W001",
+            )
+        ]
+    return []
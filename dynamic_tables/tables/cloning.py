@@ -0,0 +1,83 @@
+from django.db import connection
+from tables.changes import install_change_trigger
+from tables.helpers import JSONB_DATA_FIELD, construct_dynamic_model, construct_rows_queryset, filter_rows
+from tables.models import DynamicModel, DynamicModelField
+
+
+def clone_dynamic_model(source: DynamicModel, name: str, filters: dict | None = None):
+    """
+    Copy a dynamic model's metadata, physical table and (optionally filtered) rows without leaving Postgres.
+
+    Returns the new dynamic model and the number of copied rows.
+    """
+    clone = DynamicModel.objects.create(
+        name=name,
+        storage_mode=source.storage_mode,
+        cache_rows=source.cache_rows,
+        cache_timeout=source.cache_timeout,
+        track_changes=source.track_changes,
+        coalesce_writes=source.coalesce_writes,
+        coalesce_window=source.coalesce_window,
+        concurrency_limits=source.concurrency_limits,
+    )
+    source_fields = list(source.fields.all())
+    clone_fields = DynamicModelField.objects.bulk_create(
+        [
+            DynamicModelField(
+                dynamic_model=clone,
+                name=field.name,
+                type=field.type,
+                allow_null=field.allow_null,
+                indexed=field.indexed,
+                search=field.search,
+                natural_key=field.natural_key,
+                expression=field.expression,
+                target=field.target,
+            )
+            for field in source_fields
+        ]
+    )
+    Source = construct_dynamic_model(source)
+    Clone = construct_dynamic_model(clone)
+    queryset = filter_rows(construct_rows_queryset(source, Source, source_fields), filters or {})
+    quote_name = connection.ops.quote_name
+
+    # Search columns and indexes are named after field ids, so the clone's table is created from its own model
+    # rather than copied with LIKE.
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Clone)
+    if clone.track_changes:
+        install_change_trigger(clone, Clone)
+    if source.storage_mode == DynamicModel.StorageMode.JSONB:
+        # JSONB values are keyed by field id, so the documents are re-keyed for the new fields.
+        select_sql, params = queryset.values_list("pk", JSONB_DATA_FIELD).query.sql_with_params()
+        keys = [(field.storage_key, clone_field.storage_key) for field, clone_field in zip(source_fields, clone_fields)]
+        values_sql = ", ".join(["(%s, %s)"] * len(keys)) or "(NULL, NULL)"
+        insert_sql = f"""
+            INSERT INTO {quote_name(Clone._meta.db_table)} ("id", {quote_name(JSONB_DATA_FIELD)})
+            SELECT source.col1, COALESCE(
+                (
+                    SELECT jsonb_object_agg(keys.new_key, source.col2 -> keys.old_key)
+                    FROM (VALUES {values_sql}) AS keys (old_key, new_key)
+                    WHERE source.col2 ? keys.old_key
+                ),
+                '{{}}'::jsonb
+            )
+            FROM ({select_sql}) AS source (col1, col2)
+        """
+        params = [key for pair in keys for key in pair] + list(params)
+    else:
+        fields = [field for field in Source._meta.concrete_fields if not field.generated]
+        select_sql, params = queryset.values_list(*[field.attname for field in fields]).query.sql_with_params()
+        columns = ", ".join(quote_name(field.column) for field in fields)
+        insert_sql = f"INSERT INTO {quote_name(Clone._meta.db_table)} ({columns}) {select_sql}"
+
+    with connection.cursor() as cursor:
+        cursor.execute(insert_sql, params)
+        copied_rows = cursor.rowcount
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) "
+            f"FROM {quote_name(Clone._meta.db_table)}",
+            [Clone._meta.db_table],
+        )
+    return clone, copied_rows
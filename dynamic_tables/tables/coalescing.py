@@ -0,0 +1,101 @@
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from tables.cache import invalidate_rows_cache
+from tables.models import DynamicModel
+
+
+class PendingRow:
+    def __init__(self, data):
+        self.data = data
+        self.instance = None
+        self.error = None
+
+
+class RowGroup:
+    def __init__(self):
+        self.rows = []
+        self.full = threading.Event()
+        self.committed = threading.Event()
+
+
+class WriteCoalescer:
+    """
+    Group single-row inserts into the same table made by concurrent requests of this process into one transaction.
+
+    The first writer of a group is its leader: it waits for the table's window or until the group is full, then
+    inserts all rows with one multi-row INSERT and commits. Every writer returns only after that commit, with its
+    own instance or error, so a response still means the row is durable.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups = {}
+
+    def insert(self, dynamic_model: DynamicModel, model, data: dict):
+        key = (dynamic_model.pk, dynamic_model.schema_version)
+        row = PendingRow(data)
+        with self.lock:
+            group = self.groups.get(key)
+            leader = group is None
+            if leader:
+                group = self.groups[key] = RowGroup()
+            group.rows.append(row)
+            if len(group.rows) >= settings.TABLE_COALESCE_MAX_ROWS:
+                del self.groups[key]
+                group.full.set()
+
+        if leader:
+            window = dynamic_model.coalesce_window
+            group.full.wait((window if window is not None else settings.TABLE_COALESCE_WINDOW) / 1000)
+            with self.lock:
+                if self.groups.get(key) is group:
+                    del self.groups[key]
+            try:
+                self.commit(model, group.rows)
+                invalidate_rows_cache(dynamic_model)
+            except Exception as error:
+                for pending in group.rows:
+                    if pending.instance is None and pending.error is None:
+                        pending.error = error
+            finally:
+                group.committed.set()
+        else:
+            group.committed.wait()
+
+        if row.error is not None:
+            raise row.error
+        return row.instance
+
+    def commit(self, model, rows):
+        instances = [model(**row.data) for row in rows]
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(instances)
+        except DatabaseError:
+            # One bad row fails the whole statement, retry the rows one by one so only its writer gets the error.
+            for row in rows:
+                try:
+                    row.instance = model.objects.create(**row.data)
+                except DatabaseError as error:
+                    row.error = error
+        else:
+            for row, instance in zip(rows, instances):
+                row.instance = instance
+
+
+coalescer = WriteCoalescer()
+
+
+def create_row(dynamic_model: DynamicModel, model, data: dict):
+    """
+    Insert a validated row, coalesced with concurrent writes when the table opts in.
+
+    Writes made inside a transaction are inserted directly, another writer's commit cannot commit them.
+    """
+    if dynamic_model.coalesce_writes and not connection.in_atomic_block:
+        return coalescer.insert(dynamic_model, model, data)
+    instance = model.objects.create(**data)
+    invalidate_rows_cache(dynamic_model)
+    return instance
@@ -11,3 +11,34 @@ class ActionTypeE(ChoiceEnum):
     CREATE = "create"
     UPDATE = "update"
     DELETE = "delete"
+
+
+class PartitionActionTypeE(ChoiceEnum):
+    DETACH = "detach"
+    DROP = "drop"
+
+
+class UpsertRuleE(ChoiceEnum):
+    OVERWRITE = "overwrite"
+    KEEP = "keep"
+    COALESCE = "coalesce"
+
+
+class AggregateFunctionE(ChoiceEnum):
+    COUNT = "count"
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+
+
+class EndpointClassE(ChoiceEnum):
+    READ = "read"
+    BULK_WRITE = "bulk_write"
+    SCHEMA = "schema"
+    EXPORT = "export"
+
+
+class SampleMethodE(ChoiceEnum):
+    SYSTEM = "system"
+    BERNOULLI = "bernoulli"
@@ -0,0 +1,219 @@
+"""
+The expression language of computed fields, a small subset of Python syntax compiled to Django expressions.
+
+Expressions refer to other non-computed fields by name and support number and string literals, `True`, `False`,
+`None`, arithmetic (`+ - * /`), comparisons, `and`, `or`, `not` and the functions in `FUNCTIONS`. Division by
+zero gives null. Everything compiles to immutable SQL, as Postgres requires for generated columns.
+"""
+
+import ast
+
+from django.db import models
+from django.db.models import Func, Q, Value
+from django.db.models.functions import Abs, Coalesce, Length, Lower, NullIf, Round, Trim, Upper
+from django.db.models.lookups import Exact, GreaterThan, GreaterThanOrEqual, IsNull, LessThan, LessThanOrEqual
+from tables.models import DynamicModelField
+
+NUMBER = DynamicModelField.DynamicModelFieldType.NUMBER
+STRING = DynamicModelField.DynamicModelFieldType.STRING
+BOOLEAN = DynamicModelField.DynamicModelFieldType.BOOLEAN
+OUTPUT_FIELDS = {NUMBER: models.FloatField, STRING: models.TextField, BOOLEAN: models.BooleanField}
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPRESSION_DEPTH = 32
+
+
+class Join(Func):
+    # Postgres' CONCAT() is only stable, generated columns need the immutable || operator.
+    arg_joiner = " || "
+    template = "(%(expressions)s)"
+
+
+def concat(*expressions, output_field):
+    return Join(
+        *[Coalesce(expression, Value("", output_field=models.TextField())) for expression in expressions],
+        output_field=output_field,
+    )
+
+
+ARITHMETIC = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+COMPARISONS = {
+    ast.Lt: LessThan,
+    ast.LtE: LessThanOrEqual,
+    ast.Gt: GreaterThan,
+    ast.GtE: GreaterThanOrEqual,
+    ast.Eq: Exact,
+}
+# Name: (function, argument types, result type), a type of None is the type of the first argument.
+FUNCTIONS = {
+    "lower": (Lower, [STRING], STRING),
+    "upper": (Upper, [STRING], STRING),
+    "trim": (Trim, [STRING], STRING),
+    "length": (Length, [STRING], NUMBER),
+    "abs": (Abs, [NUMBER], NUMBER),
+    "round": (Round, [NUMBER], NUMBER),
+    "coalesce": (Coalesce, [None, None], None),
+    "concat": (concat, [STRING, STRING], STRING),
+}
+
+
+class ExpressionError(Exception):
+    pass
+
+
+class ExpressionCompiler:
+    def __init__(self, fields: dict):
+        self.fields = fields
+        self.references = set()
+
+    def compile(self, node, depth=0):
+        if depth > MAX_EXPRESSION_DEPTH:
+            raise ExpressionError("Expression is nested too deeply.")
+        method = getattr(self, f"compile_{type(node).__name__.lower()}", None)
+        if method is None:
+            raise ExpressionError(f"Unsupported syntax: {ast.unparse(node)}")
+        return method(node, depth + 1)
+
+    def compile_expression(self, node, depth):
+        return self.compile(node.body, depth)
+
+    def compile_constant(self, node, depth):
+        if node.value is None:
+            return Value(None), None
+        if isinstance(node.value, bool):
+            return Value(node.value, output_field=models.BooleanField()), BOOLEAN
+        if isinstance(node.value, (int, float)):
+            return Value(float(node.value), output_field=models.FloatField()), NUMBER
+        if isinstance(node.value, str):
+            return Value(node.value, output_field=models.TextField()), STRING
+        raise ExpressionError(f"Unsupported literal: {node.value!r}")
+
+    def compile_name(self, node, depth):
+        field = self.fields.get(node.id)
+        if field is None:
+            raise ExpressionError(f"{node.id} is not a field of this model.")
+        if field.is_computed:
+            raise ExpressionError(f"{node.id} is a computed field, computed fields cannot refer to each other.")
+        if field.is_reference:
+            raise ExpressionError(f"{node.id} is a reference field, computed fields cannot refer to it.")
+        self.references.add(node.id)
+        return models.F(node.id), field.type
+
+    def compile_unaryop(self, node, depth):
+        operand, operand_type = self.compile(node.operand, depth)
+        if isinstance(node.op, ast.Not):
+            self.expect(operand_type, BOOLEAN, "not")
+            return ~Q(operand), BOOLEAN
+        if isinstance(node.op, ast.USub):
+            self.expect(operand_type, NUMBER, "-")
+            return Value(0.0, output_field=models.FloatField()) - operand, NUMBER
+        raise ExpressionError(f"Unsupported operator: {ast.unparse(node)}")
+
+    def compile_binop(self, node, depth):
+        operator = ARITHMETIC.get(type(node.op))
+        if operator is None:
+            raise ExpressionError(f"Unsupported operator: {ast.unparse(node)}")
+        left, left_type = self.compile(node.left, depth)
+        right, right_type = self.compile(node.right, depth)
+        self.expect(left_type, NUMBER, operator)
+        self.expect(right_type, NUMBER, operator)
+        if operator == "/":
+            right = NullIf(right, Value(0.0, output_field=models.FloatField()))
+        return (
+            models.ExpressionWrapper(
+                models.expressions.CombinedExpression(left, operator, right), output_field=models.FloatField()
+            ),
+            NUMBER,
+        )
+
+    def compile_boolop(self, node, depth):
+        conditions = []
+        for value in node.values:
+            condition, condition_type = self.compile(value, depth)
+            self.expect(condition_type, BOOLEAN, "and" if isinstance(node.op, ast.And) else "or")
+            conditions.append(Q(condition))
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            combined = combined & condition if isinstance(node.op, ast.And) else combined | condition
+        return combined, BOOLEAN
+
+    def compile_compare(self, node, depth):
+        left, left_type = self.compile(node.left, depth)
+        conditions = []
+        for operator, comparator in zip(node.ops, node.comparators):
+            right, right_type = self.compile(comparator, depth)
+            if isinstance(operator, (ast.Is, ast.IsNot)) and isinstance(comparator, ast.Constant):
+                if comparator.value is not None:
+                    raise ExpressionError("is and is not only compare with None.")
+                condition = IsNull(left, True)
+                conditions.append(~Q(condition) if isinstance(operator, ast.IsNot) else Q(condition))
+            elif isinstance(operator, ast.NotEq):
+                self.expect(right_type, left_type, "!=")
+                conditions.append(~Q(Exact(left, right)))
+            elif type(operator) in COMPARISONS:
+                self.expect(right_type, left_type, ast.unparse(node))
+                conditions.append(Q(COMPARISONS[type(operator)](left, right)))
+            else:
+                raise ExpressionError(f"Unsupported comparison: {ast.unparse(node)}")
+            left, left_type = right, right_type
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            combined &= condition
+        return combined, BOOLEAN
+
+    def compile_call(self, node, depth):
+        name = node.func.id if isinstance(node.func, ast.Name) else None
+        if name not in FUNCTIONS or node.keywords:
+            raise ExpressionError(f"Unsupported function, use one of: {', '.join(FUNCTIONS)}.")
+        function, argument_types, result_type = FUNCTIONS[name]
+        if len(node.args) != len(argument_types):
+            raise ExpressionError(f"{name} takes {len(argument_types)} argument(s).")
+        arguments = []
+        first_type = None
+        for argument, expected in zip(node.args, argument_types):
+            expression, expression_type = self.compile(argument, depth)
+            first_type = first_type or expression_type
+            self.expect(expression_type, expected or first_type, name)
+            arguments.append(expression)
+        result_type = result_type or first_type
+        if result_type is None:
+            raise ExpressionError(f"The type of {ast.unparse(node)} cannot be inferred.")
+        return function(*arguments, output_field=OUTPUT_FIELDS[result_type]()), result_type
+
+    def expect(self, actual, expected, operator):
+        # None is the type of a null literal, which fits anywhere.
+        if actual is not None and expected is not None and actual != expected:
+            raise ExpressionError(f"{operator} expects {expected} operands, got {actual}.")
+
+
+def compile_expression(source: str, fields: dict):
+    """
+    Compile a computed field expression over `fields` (name to `DynamicModelField`).
+
+    Returns the Django expression, its result type and the names of the referenced fields, raises
+    `ExpressionError` for invalid expressions.
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression cannot be longer than {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as error:
+        raise ExpressionError(f"Invalid syntax: {error.msg}.")
+    compiler = ExpressionCompiler(fields)
+    expression, result_type = compiler.compile(tree)
+    if result_type is None:
+        raise ExpressionError("The type of the expression cannot be inferred.")
+    if isinstance(expression, Q):
+        expression = models.ExpressionWrapper(expression, output_field=models.BooleanField())
+    return expression, result_type, compiler.references
+
+
+def referencing_fields(field_name: str, fields: dict):
+    """
+    Return names of the computed fields among `fields` whose expressions refer to `field_name`.
+    """
+    names = []
+    for field in fields.values():
+        if field.is_computed and field_name in compile_expression(field.expression, fields)[2]:
+            names.append(field.name)
+    return names
@@ -1,25 +1,466 @@
-from django.db import models
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
+from django.core.exceptions import FieldError, ValidationError
+from django.db import connection, models
+from django.db.models import F, Q, prefetch_related_objects
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, Upper
 from rest_framework import serializers
+from tables.expressions import OUTPUT_FIELDS, compile_expression
 from tables.models import DynamicModel, DynamicModelField
+from tables.renderers import TabularRows
+from tables.sampling import sample_rows
+from tables.statements import check_prepared_statements
+
+JSONB_DATA_FIELD = "_data"
+SEARCH_FIELD_PREFIX = "_search_"
+UPDATED_SEQ_FIELD = "_updated_seq"
+UPDATED_AT_FIELD = "_updated_at"
+
+DynamicTable = namedtuple("DynamicTable", ["schema_version", "model", "serializer_class", "fields"])
+
+_dynamic_tables = {}
+
+
+def get_dynamic_table(dynamic_model: DynamicModel):
+    """
+    Return the generated model and row serializer of a dynamic model, built once per schema version.
+
+    Statements prepared for an older schema version are dropped from the connections of this thread.
+    """
+    check_prepared_statements(dynamic_model)
+    key = (dynamic_model.pk, dynamic_model.name)
+    table = _dynamic_tables.get(key)
+    if table is None or table.schema_version != dynamic_model.schema_version:
+        table = build_dynamic_table(dynamic_model)
+        _dynamic_tables[key] = table
+    return table
+
+
+def build_dynamic_table(dynamic_model: DynamicModel):
+    prefetch_related_objects([dynamic_model], "fields__target")
+    model = construct_dynamic_model(dynamic_model)
+    return DynamicTable(
+        dynamic_model.schema_version,
+        model,
+        construct_row_serializer(dynamic_model, model),
+        list(dynamic_model.fields.all()),
+    )
 
 
 def construct_dynamic_model(dynamic_model: DynamicModel):
     attrs = {"__module__": "tables.models"}
-    for field in dynamic_model.fields.all():
-        attrs[field.name] = construct_field(field)
+    fields = list(dynamic_model.fields.all())
+    indexes, constraints = [], []
+    if dynamic_model.storage_mode == DynamicModel.StorageMode.JSONB:
+        attrs[JSONB_DATA_FIELD] = models.JSONField(default=dict)
+        indexes += [construct_jsonb_index(dynamic_model, field) for field in fields if field.indexed]
+    else:
+        for field in fields:
+            attrs[field.name] = construct_computed_field(fields, field) if field.is_computed else construct_field(field)
+        natural_key = [field.name for field in fields if field.natural_key]
+        if natural_key:
+            constraints.append(models.UniqueConstraint(fields=natural_key, name=natural_key_name(dynamic_model)))
+    if dynamic_model.track_changes:
+        # Filled in by the change tracking trigger, see tables.changes.
+        attrs[UPDATED_SEQ_FIELD] = models.BigIntegerField(null=True, db_index=True)
+        attrs[UPDATED_AT_FIELD] = models.DateTimeField(null=True)
+    for field in fields:
+        if field.search == DynamicModelField.SearchMode.FULLTEXT:
+            attrs[search_field_name(field)] = construct_search_field(dynamic_model, field)
+        indexes += construct_search_indexes(dynamic_model, field)
+    attrs["Meta"] = type("Meta", (), {"indexes": indexes, "constraints": constraints})
 
-    return type(dynamic_model.name, (models.Model,), attrs)
+    model = type(dynamic_model.name, (models.Model,), attrs)
+    # References are declared by model name and resolved once the referenced model is registered. Referenced
+    # models are only built after this one is registered, so references in both directions resolve without
+    # recursing forever.
+    for field in fields:
+        if field.is_reference and not is_registered(field.target):
+            get_dynamic_table(field.target)
+    return model
 
 
-def construct_dynamic_serializer(model, fields):
+def is_registered(dynamic_model: DynamicModel):
+    try:
+        apps.get_registered_model(DynamicModel._meta.app_label, dynamic_model.name)
+    except LookupError:
+        return False
+    return True
+
+
+def construct_dynamic_serializer(model, fields, declared_fields=None):
     MetaClass = type("Meta", (), {"model": model, "fields": fields})
-    return type(f"DynamicSerializer", (serializers.ModelSerializer,), {"Meta": MetaClass})
+    return type(f"DynamicSerializer", (serializers.ModelSerializer,), {"Meta": MetaClass, **(declared_fields or {})})
+
+
+def construct_row_serializer(dynamic_model: DynamicModel, model):
+    if dynamic_model.storage_mode == DynamicModel.StorageMode.COLUMNS:
+        fields = dynamic_model.fields.all()
+        # Computed values are written by Postgres, so they are typed like other fields but read-only.
+        declared = {
+            field.name: construct_serializer_field(field, read_only=True) for field in fields if field.is_computed
+        }
+        # References are plain ids, checked against the referenced table in bulk by `check_references`.
+        declared.update({field.name: construct_serializer_field(field) for field in fields if field.is_reference})
+        return construct_dynamic_serializer(model, ["id", *[field.name for field in fields]], declared)
+
+    attrs = {"id": serializers.IntegerField(read_only=True)}
+    for field in dynamic_model.fields.all():
+        attrs[field.name] = construct_serializer_field(field, source=f"{JSONB_DATA_FIELD}.{field.storage_key}")
+    return type(f"DynamicSerializer", (serializers.Serializer,), attrs)
+
+
+def construct_rows_queryset(dynamic_model: DynamicModel, model, fields=None):
+    if dynamic_model.storage_mode == DynamicModel.StorageMode.COLUMNS:
+        return model.objects.all()
+    if fields is None:
+        fields = dynamic_model.fields.all()
+    return model.objects.alias(**{field.name: construct_jsonb_expression(field) for field in fields})
+
+
+ROW_FILTER_LOOKUPS = ("exact", "lt", "lte", "gt", "gte", "isnull", "icontains")
+ROW_RESERVED_PARAMS = ("ids", "search", "sample", "sample_method", "seed", "ordering", "limit", "offset", "expand")
+
+
+def row_fields(queryset):
+    """
+    Return the model fields of row values and the output fields of aliased values, by name.
+    """
+    fields = {
+        field.name: field
+        for field in queryset.model._meta.concrete_fields
+        if not isinstance(field, models.JSONField) and not field.name.startswith(SEARCH_FIELD_PREFIX)
+    }
+    fields.update(
+        {
+            name: expression.output_field
+            for name, expression in queryset.query.annotations.items()
+            if not name.startswith(SEARCH_FIELD_PREFIX)
+        }
+    )
+    return fields
+
+
+def filter_rows(queryset, query_params):
+    """
+    Filter rows of a dynamic model by query parameters in the `<field>` or `<field>__<lookup>` form.
+
+    Parameters which do not name a field of the model are left for other consumers of the query string.
+    """
+    filters = {}
+    fields = row_fields(queryset)
+    for param, value in query_params.items():
+        field_name, _, lookup = param.partition("__")
+        if field_name not in fields or param in ROW_RESERVED_PARAMS:
+            continue
+        lookup = lookup or "exact"
+        if lookup not in ROW_FILTER_LOOKUPS:
+            raise serializers.ValidationError(
+                {param: f"Unsupported lookup, use one of: {', '.join(ROW_FILTER_LOOKUPS)}."}
+            )
+        if lookup == "isnull" or isinstance(fields[field_name], models.BooleanField):
+            value = serializers.BooleanField().run_validation(value)
+        filters[f"{field_name}__{lookup}"] = value
+    try:
+        return queryset.filter(**filters)
+    except (ValueError, ValidationError, FieldError) as error:
+        raise serializers.ValidationError(f"Invalid filter value: {error}")
+
+
+def search_rows(queryset, dynamic_model: DynamicModel, fields, query: str):
+    """
+    Keep rows matching `query` in any searchable field, best matches first.
+
+    Full-text fields match the query in web search syntax against their generated `tsvector` column, trigram fields
+    match words similar to the query, both through their GIN indexes.
+    """
+    if not query.strip():
+        raise serializers.ValidationError({"search": "Search query cannot be blank."})
+    condition, rank, aliases = Q(), None, {}
+    search_query = SearchQuery(query, config=settings.TABLE_SEARCH_CONFIG, search_type="websearch")
+    for field in fields:
+        if field.search == DynamicModelField.SearchMode.FULLTEXT:
+            field_condition = Q(**{search_field_name(field): search_query})
+            field_rank = SearchRank(F(search_field_name(field)), search_query)
+        elif field.search == DynamicModelField.SearchMode.TRIGRAM:
+            alias = f"{SEARCH_FIELD_PREFIX}{field.storage_key}_trgm"
+            aliases[alias] = Upper(construct_text_expression(dynamic_model, field))
+            field_condition = Q(**{f"{alias}__trigram_word_similar": query.upper()})
+            field_rank = TrigramWordSimilarity(query.upper(), alias)
+        else:
+            continue
+        condition |= field_condition
+        rank = field_rank if rank is None else rank + field_rank
+    if rank is None:
+        raise serializers.ValidationError({"search": "This table has no searchable fields."})
+    return queryset.alias(**aliases, _search_rank=rank).filter(condition).order_by("-_search_rank", "pk")
+
+
+def sort_rows(queryset, ordering: str):
+    """
+    Order rows by a comma separated list of fields, each descending when prefixed with `-`, ties in id order.
+
+    Nulls sort last in both directions.
+    """
+    fields = row_fields(queryset)
+    order_by = []
+    for name in [part.strip() for part in ordering.split(",") if part.strip()]:
+        descending = name.startswith("-")
+        name = name.removeprefix("-")
+        if name not in fields:
+            raise serializers.ValidationError({"ordering": f"{name} is not a field of this model."})
+        order_by.append(F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_last=True))
+    if not order_by:
+        raise serializers.ValidationError({"ordering": "Ordering cannot be blank."})
+    return queryset.order_by(*order_by, "pk")
+
+
+def paginate_rows(queryset, query_params):
+    """
+    Slice rows with the `limit` and `offset` query parameters, unordered rows are paged in id order.
+    """
+    if "limit" not in query_params and "offset" not in query_params:
+        return queryset
+    offset = serializers.IntegerField(min_value=0).run_validation(query_params.get("offset", 0))
+    limit = query_params.get("limit")
+    if limit is not None:
+        limit = serializers.IntegerField(min_value=1).run_validation(limit)
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+    return queryset[offset : offset + limit if limit is not None else None]
+
+
+def query_rows(dynamic_model: DynamicModel, table: DynamicTable, query_params):
+    """
+    Return the rows of a dynamic model filtered, searched, sampled, sorted and paged by the query parameters of
+    a rows request.
+    """
+    queryset = filter_rows(construct_rows_queryset(dynamic_model, table.model, table.fields), query_params)
+    if "search" in query_params:
+        queryset = search_rows(queryset, dynamic_model, table.fields, query_params["search"])
+    if "sample" in query_params:
+        queryset = sample_rows(queryset, query_params)
+    if "ordering" in query_params:
+        queryset = sort_rows(queryset, query_params["ordering"])
+    return paginate_rows(queryset, query_params)
+
+
+def tabulate_rows(table: DynamicTable, rows, expand=()):
+    """
+    Return rows in the layout of the row serializer as column names and value tuples, for the tabular renderers.
+    """
+    columns = ["id", *[field.name for field in table.fields]]
+    if isinstance(rows, models.QuerySet) and not expand:
+        return TabularRows(columns, rows.values_list("id", *[F(name) for name in columns[1:]]))
+    # Rows looked up by id are already loaded and bounded by `TABLE_LOOKUP_MAX_IDS`, expanded rows are serialized
+    # to embed the referenced rows.
+    data = serialize_rows(table, rows, expand)
+    return TabularRows(columns, [tuple(row[column] for column in columns) for row in data])
+
+
+def serialize_rows(table: DynamicTable, rows, expand=()):
+    data = table.serializer_class(rows, many=True).data
+    return expand_rows(data, expand) if expand else data
+
+
+def parse_expand(table: DynamicTable, value: str):
+    """
+    Validate the comma separated reference fields of the `expand` query parameter.
+    """
+    references = {field.name: field for field in table.fields if field.is_reference}
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names:
+        raise serializers.ValidationError({"expand": "Expand cannot be blank."})
+    for name in names:
+        if name not in references:
+            raise serializers.ValidationError({"expand": f"{name} is not a reference field of this model."})
+    return [references[name] for name in dict.fromkeys(names)]
+
+
+def expand_rows(data: list, fields: list):
+    """
+    Replace the ids of reference fields in serialized rows with the referenced rows, or null when they are missing.
+
+    Referenced rows are serialized like in their own table and loaded with one primary key lookup per field,
+    whatever the number of rows. They are looked up in the current model of the referenced table, the model a
+    foreign key was built with can be older than the referenced table.
+    """
+    targets = DynamicModel.objects.in_bulk([field.target_id for field in fields])
+    for field in fields:
+        target = targets[field.target_id]
+        target_table = get_dynamic_table(target)
+        ids = sorted({row[field.name] for row in data if row[field.name] is not None})
+        found = target_table.serializer_class(lookup_rows(target, target_table, ids), many=True).data
+        found = {row["id"]: row for row in found}
+        for row in data:
+            row[field.name] = found.get(row[field.name])
+    return data
+
+
+def parse_row_ids(value):
+    """
+    Validate row ids given as a comma separated query parameter or a list.
+    """
+    if isinstance(value, str):
+        value = [part for part in value.split(",") if part.strip()]
+    field = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=settings.TABLE_LOOKUP_MAX_IDS
+    )
+    try:
+        return field.run_validation(value)
+    except serializers.ValidationError as error:
+        raise serializers.ValidationError({"ids": error.detail})
+
+
+def lookup_rows(dynamic_model: DynamicModel, table: DynamicTable, ids):
+    """
+    Return the rows with the given ids through primary key lookups, in the order asked for and without missing ids.
+    """
+    rows = construct_rows_queryset(dynamic_model, table.model, table.fields).in_bulk(ids)
+    return [rows[pk] for pk in dict.fromkeys(ids) if pk in rows]
+
+
+def check_references(model, fields: list, rows: list):
+    """
+    Return errors of validated rows referring to missing rows of other tables by row index, with one query per
+    reference field.
+    """
+    errors = {}
+    for field in fields:
+        if not field.is_reference:
+            continue
+        attname = model._meta.get_field(field.name).attname
+        ids = {row[attname] for row in rows if row.get(attname) is not None}
+        if not ids:
+            continue
+        # Only ids are read, so a referenced model older than its table still works.
+        related_model = model._meta.get_field(field.name).related_model
+        missing = ids - set(related_model._base_manager.filter(pk__in=ids).values_list("pk", flat=True))
+        for index, row in enumerate(rows):
+            if row.get(attname) in missing:
+                errors.setdefault(index, {})[field.name] = [f"No row with id {row[attname]} in {field.target.name}."]
+    return errors
+
+
+def check_row_references(table: DynamicTable, data: dict):
+    errors = check_references(table.model, table.fields, [data])
+    if errors:
+        raise serializers.ValidationError(errors[0])
+
+
+def update_row(instance, validated_data):
+    """
+    Save the partially validated data of a row, documents of jsonb tables are merged with the stored one.
+    """
+    for name, value in validated_data.items():
+        if name == JSONB_DATA_FIELD:
+            value = {**(getattr(instance, name) or {}), **value}
+        setattr(instance, name, value)
+    instance.save(update_fields=list(validated_data))
+    computed = [field.attname for field in instance._meta.concrete_fields if field.generated]
+    if computed:
+        instance.refresh_from_db(fields=computed)
+    return instance
 
 
 def construct_field(field: DynamicModelField):
     if field.type == DynamicModelField.DynamicModelFieldType.STRING:
-        return models.TextField(null=field.allow_null)
+        return models.TextField(null=field.allow_null, db_index=field.indexed)
     if field.type == DynamicModelField.DynamicModelFieldType.NUMBER:
-        return models.FloatField(null=field.allow_null)
+        return models.FloatField(null=field.allow_null, db_index=field.indexed)
     if field.type == DynamicModelField.DynamicModelFieldType.BOOLEAN:
-        return models.BooleanField(null=field.allow_null)
+        return models.BooleanField(null=field.allow_null, db_index=field.indexed)
+    if field.type == DynamicModelField.DynamicModelFieldType.REFERENCE:
+        # Indexed like every foreign key. Deletes are left to the database constraint, since models of
+        # referencing tables are not rebuilt when the referenced table changes.
+        return models.ForeignKey(
+            f"{DynamicModel._meta.app_label}.{field.target.name}",
+            on_delete=models.DO_NOTHING,
+            null=field.allow_null,
+            related_name="+",
+        )
+
+
+def construct_computed_field(fields: list, field: DynamicModelField):
+    expression, result_type, _ = compile_expression(field.expression, {other.name: other for other in fields})
+    return models.GeneratedField(
+        expression=expression,
+        output_field=OUTPUT_FIELDS[result_type](),
+        db_persist=True,
+        db_index=field.indexed,
+    )
+
+
+def construct_serializer_field(field: DynamicModelField, **kwargs):
+    kwargs.update(allow_null=field.allow_null, required=not field.allow_null)
+    if field.type == DynamicModelField.DynamicModelFieldType.STRING:
+        return serializers.CharField(**kwargs)
+    if field.type == DynamicModelField.DynamicModelFieldType.NUMBER:
+        return serializers.FloatField(**kwargs)
+    if field.type == DynamicModelField.DynamicModelFieldType.BOOLEAN:
+        return serializers.BooleanField(**kwargs)
+    if field.type == DynamicModelField.DynamicModelFieldType.REFERENCE:
+        return serializers.IntegerField(min_value=1, source=f"{field.name}_id", **kwargs)
+
+
+def construct_jsonb_expression(field: DynamicModelField):
+    value = KeyTextTransform(field.storage_key, JSONB_DATA_FIELD)
+    if field.type == DynamicModelField.DynamicModelFieldType.NUMBER:
+        return Cast(value, models.FloatField())
+    if field.type == DynamicModelField.DynamicModelFieldType.BOOLEAN:
+        return Cast(value, models.BooleanField())
+    return value
+
+
+def construct_jsonb_index(dynamic_model: DynamicModel, field: DynamicModelField):
+    return models.Index(construct_jsonb_expression(field), name=f"tables_{dynamic_model.name.lower()}_{field.pk}_idx")
+
+
+def construct_text_expression(dynamic_model: DynamicModel, field: DynamicModelField):
+    if dynamic_model.storage_mode == DynamicModel.StorageMode.JSONB:
+        return construct_jsonb_expression(field)
+    return F(field.name)
+
+
+def natural_key_name(dynamic_model: DynamicModel):
+    return f"tables_{dynamic_model.name.lower()}_natural_key"
+
+
+def search_field_name(field: DynamicModelField):
+    return f"{SEARCH_FIELD_PREFIX}{field.storage_key}"
+
+
+def construct_search_field(dynamic_model: DynamicModel, field: DynamicModelField):
+    return models.GeneratedField(
+        expression=SearchVector(construct_text_expression(dynamic_model, field), config=settings.TABLE_SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+
+def construct_search_indexes(dynamic_model: DynamicModel, field: DynamicModelField):
+    name = f"tables_{dynamic_model.name.lower()}_{field.pk}"
+    if field.search == DynamicModelField.SearchMode.FULLTEXT:
+        return [GinIndex(fields=[search_field_name(field)], name=f"{name}_fts")]
+    if field.search == DynamicModelField.SearchMode.TRIGRAM:
+        # Upper-cased like the `icontains` lookup, so the index also serves contains filters.
+        expression = Upper(construct_text_expression(dynamic_model, field))
+        return [GinIndex(OpClass(expression, name="gin_trgm_ops"), name=f"{name}_trgm")]
+    return []
+
+
+def trigram_available():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        return cursor.fetchone()[0]
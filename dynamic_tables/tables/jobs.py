@@ -0,0 +1,150 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from tables.cache import invalidate_rows_cache
+from tables.helpers import check_references, get_dynamic_table
+from tables.models import DynamicModel, Job
+
+logger = logging.getLogger(__name__)
+
+# First key of the advisory lock serializing job claims per dynamic model, the second key is the model id.
+JOB_CLAIM_LOCK = 30
+
+
+class JobError(Exception):
+    def __init__(self, message: str, details=None):
+        super().__init__(message)
+        self.details = details
+
+
+def enqueue_job(dynamic_model: DynamicModel, kind: str, payload: dict, total: int | None = None):
+    return Job.objects.create(dynamic_model=dynamic_model, kind=kind, payload=payload, total=total)
+
+
+def update_job_progress(job: Job, processed: int, total: int | None = None):
+    job.processed = processed
+    if total is not None:
+        job.total = total
+    job.heartbeat_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(processed=job.processed, total=job.total, heartbeat_at=job.heartbeat_at)
+
+
+def fail_abandoned_jobs(timeout: int):
+    """
+    Fail running jobs without a heartbeat for `timeout` seconds, their worker died or lost its connection.
+
+    Handlers commit their work in batches, so abandoned jobs are not run again. Returns the number of jobs failed.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=timeout)
+    return Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=Job.JobStatus.RUNNING,
+    ).update(status=Job.JobStatus.FAILED, error="Job was abandoned by its worker.", finished_at=now)
+
+
+def saturated_tables(per_table_limit: int):
+    return (
+        Job.objects.filter(status=Job.JobStatus.RUNNING)
+        .values("dynamic_model")
+        .annotate(running=Count("pk"))
+        .filter(running__gte=per_table_limit)
+        .values_list("dynamic_model", flat=True)
+    )
+
+
+def claim_job(per_table_limit: int):
+    """
+    Mark the oldest pending job whose table has a free worker slot as running and return it.
+
+    Pending rows locked by other workers are skipped, so concurrent workers never wait for each other. Abandoned
+    jobs are failed first, so they do not hold the slots of their tables.
+    """
+    fail_abandoned_jobs(settings.TABLE_JOB_TIMEOUT)
+    with transaction.atomic():
+        saturated = list(saturated_tables(per_table_limit))
+        while True:
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status=Job.JobStatus.PENDING)
+                .exclude(dynamic_model__in=saturated)
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return None
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s, %s::integer)", [JOB_CLAIM_LOCK, job.dynamic_model_id])
+            running = Job.objects.filter(dynamic_model_id=job.dynamic_model_id, status=Job.JobStatus.RUNNING).count()
+            if running < per_table_limit:
+                break
+            # Another worker took the last slot of the table meanwhile, jobs of other tables can still run.
+            saturated.append(job.dynamic_model_id)
+        job.status = Job.JobStatus.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "heartbeat_at"])
+    return job
+
+
+def run_job(job: Job):
+    job.result, job.error = None, ""
+    try:
+        job.result = JOB_HANDLERS[job.kind](job)
+        job.status = Job.JobStatus.SUCCEEDED
+    except JobError as error:
+        job.status, job.error, job.result = Job.JobStatus.FAILED, str(error), error.details
+    except Exception as error:
+        logger.exception("Job %s failed.", job.pk)
+        job.status, job.error = Job.JobStatus.FAILED, str(error)
+    job.finished_at = timezone.now()
+    # A job failed as abandoned meanwhile keeps that outcome.
+    fields = {name: getattr(job, name) for name in ["status", "result", "error", "finished_at"]}
+    if not Job.objects.filter(pk=job.pk, status=Job.JobStatus.RUNNING).update(**fields):
+        job.refresh_from_db()
+    return job
+
+
+def work(per_table_limit: int, poll_interval: float, burst: bool = False, stop_event=None):
+    """
+    Claim and run jobs until `stop_event` is set, or until no job can be claimed when `burst` is set.
+    """
+    while stop_event is None or not stop_event.is_set():
+        job = claim_job(per_table_limit)
+        if job is not None:
+            run_job(job)
+        elif burst:
+            return
+        else:
+            time.sleep(poll_interval)
+
+
+def run_import(job: Job):
+    table = get_dynamic_table(job.dynamic_model)
+    serializer = table.serializer_class(data=job.payload["rows"], many=True)
+    if not serializer.is_valid():
+        errors = {index: row_errors for index, row_errors in enumerate(serializer.errors) if row_errors}
+        raise JobError("Rows are invalid, nothing was imported.", {"rows": errors})
+    errors = check_references(table.model, table.fields, serializer.validated_data)
+    if errors:
+        raise JobError("Rows refer to missing rows, nothing was imported.", {"rows": errors})
+
+    instances = [table.model(**data) for data in serializer.validated_data]
+    update_job_progress(job, 0, len(instances))
+    batch_size = settings.TABLE_IMPORT_BATCH_SIZE
+    for start in range(0, len(instances), batch_size):
+        batch = instances[start : start + batch_size]
+        with transaction.atomic():
+            table.model.objects.bulk_create(batch)
+            invalidate_rows_cache(job.dynamic_model)
+        update_job_progress(job, start + len(batch))
+    return {"imported": len(instances)}
+
+
+JOB_HANDLERS = {
+    Job.JobKind.IMPORT: run_import,
+}
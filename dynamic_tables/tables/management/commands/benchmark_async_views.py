@@ -0,0 +1,121 @@
+import asyncio
+import io
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.urls import reverse
+from tables.helpers import get_dynamic_table
+from tables.models import DynamicModel
+
+CHUNK_SIZE = 8192
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the WSGI and ASGI handlers serving rows to many slow clients at once. "
+        "Clients read responses in chunks with a delay between them, which is what holds a WSGI worker thread. "
+        "The benchmark table is committed so worker threads can read it, and dropped at the end. "
+        "Every request in flight on the ASGI handler holds a database connection, keep --clients below the "
+        "max_connections of the server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Number of rows in the table.")
+        parser.add_argument("--clients", type=int, default=50, help="Number of concurrent clients.")
+        parser.add_argument("--requests", type=int, default=5, help="Number of requests made by each client.")
+        parser.add_argument("--threads", type=int, default=16, help="Number of WSGI worker threads.")
+        parser.add_argument("--delay", type=float, default=0.01, help="Seconds a client takes to read a chunk.")
+
+    def handle(self, *args, **options):
+        dynamic_model = DynamicModel.objects.create(name="BenchmarkAsync")
+        dynamic_model.fields.create(name="field_1", type="string")
+        dynamic_model.fields.create(name="field_2", type="number")
+        table = get_dynamic_table(dynamic_model)
+        try:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.create_model(table.model)
+            table.model.objects.bulk_create(
+                [table.model(field_1=f"Row {i}", field_2=i) for i in range(options["rows"])], batch_size=1000
+            )
+            sync_path = reverse("api:table-rows", args=(dynamic_model.pk,))
+            async_path = reverse("api:async-table-rows", args=(dynamic_model.pk,))
+            results = {
+                "wsgi sync view": self.benchmark_wsgi(sync_path, options),
+                "asgi sync view": self.benchmark_asgi(sync_path, options),
+                "asgi async view": self.benchmark_asgi(async_path, options),
+            }
+        finally:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.delete_model(table.model)
+            dynamic_model.delete()
+
+        total = options["clients"] * options["requests"]
+        self.stdout.write(f"{'handler':<20}{'time':>12}{'requests/s':>14}")
+        for name, elapsed in results.items():
+            self.stdout.write(f"{name:<20}{elapsed:>11.2f}s{total / elapsed:>14.1f}")
+
+    def benchmark_wsgi(self, path, options):
+        application = get_wsgi_application()
+
+        def client():
+            for _ in range(options["requests"]):
+                environ = {"PATH_INFO": path, "HTTP_HOST": "localhost", "wsgi.input": io.BytesIO()}
+                setup_testing_defaults(environ)
+                response = application(environ, lambda status, headers: None)
+                try:
+                    for chunk in response:
+                        time.sleep(options["delay"] * math.ceil(len(chunk) / CHUNK_SIZE))
+                finally:
+                    response.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options["threads"]) as executor:
+            for future in [executor.submit(client) for _ in range(options["clients"])]:
+                future.result()
+        return time.perf_counter() - start
+
+    def benchmark_asgi(self, path, options):
+        application = get_asgi_application()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"host", b"localhost")],
+            "server": ("localhost", 80),
+        }
+
+        async def client():
+            for _ in range(options["requests"]):
+                disconnected = asyncio.Event()
+                messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+
+                async def receive():
+                    message = next(messages, None)
+                    if message is None:
+                        await disconnected.wait()
+                        message = {"type": "http.disconnect"}
+                    return message
+
+                async def send(message):
+                    if message["type"] == "http.response.body":
+                        await asyncio.sleep(options["delay"] * math.ceil(len(message.get("body", b"")) / CHUNK_SIZE))
+
+                await application(dict(scope), receive, send)
+                disconnected.set()
+
+        async def clients():
+            await asyncio.gather(*[client() for _ in range(options["clients"])])
+
+        start = time.perf_counter()
+        asyncio.run(clients())
+        return time.perf_counter() - start
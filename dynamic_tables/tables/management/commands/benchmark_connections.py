@@ -0,0 +1,91 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from tables.admin import browse_rows
+from tables.helpers import construct_dynamic_model
+from tables.models import DynamicModel
+from tables.views import DynamicModelView
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure connection setup and the row insert, point read and keyset page paths with and without "
+        "server-side prepared statements. Everything runs in a transaction which is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Number of rows loaded into the table.")
+        parser.add_argument("--fields", type=int, default=10, help="Number of number fields in the table.")
+        parser.add_argument("--repeat", type=int, default=200, help="Number of times each operation is timed.")
+
+    def handle(self, *args, **options):
+        if not connection.settings_dict["OPTIONS"].get("server_side_binding"):
+            raise CommandError("Prepared statements need DJANGO_DATABASE_SERVER_SIDE_BINDING.")
+        self.factory = APIRequestFactory()
+        repeat = options["repeat"]
+
+        connect = self.timed(repeat, lambda i: (connection.close(), connection.ensure_connection()))
+        self.stdout.write(f"{'new connection':<20}{connect * 1000:>12.2f}ms")
+
+        results = {}
+        with override_settings(ROWS_CACHE_ENABLED=False), transaction.atomic():
+            pk = self.create_table(options)
+            # Warm up the generated model and the caches of the database before anything is timed.
+            self.benchmark(pk, {**options, "repeat": 20})
+            # 0 prepares every query on its first execution, None never prepares.
+            for mode, threshold in [("unprepared", None), ("prepared", 0)]:
+                connection.connection.prepare_threshold = threshold
+                results[mode] = self.benchmark(pk, options)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'operation':<20}" + "".join(f"{mode:>14}" for mode in results))
+        for operation in results["unprepared"]:
+            self.stdout.write(
+                f"{operation:<20}" + "".join(f"{results[mode][operation] * 1000:>12.3f}ms" for mode in results)
+            )
+
+    def call(self, method, action, data=None, **kwargs):
+        view = DynamicModelView.as_view({method: action})
+        if data is None:
+            request = getattr(self.factory, method)("/")
+        else:
+            request = getattr(self.factory, method)("/", data=json.dumps(data), content_type="application/json")
+        response = view(request, **kwargs)
+        response.render()
+        return response
+
+    def timed(self, repeat, function):
+        start = time.perf_counter()
+        for i in range(repeat):
+            function(i)
+        return (time.perf_counter() - start) / repeat
+
+    def create_table(self, options):
+        fields = [{"name": f"field_{i}", "type": "number", "indexed": i == 0} for i in range(options["fields"])]
+        pk = self.call("post", "create", data={"name": "BenchmarkConnections", "fields": fields}).data["id"]
+        Dynamic = construct_dynamic_model(DynamicModel.objects.get(pk=pk))
+        instances = [Dynamic(**{field["name"]: float(i) for field in fields}) for i in range(options["rows"])]
+        Dynamic.objects.bulk_create(instances, batch_size=1000)
+        return pk
+
+    def benchmark(self, pk, options):
+        repeat = options["repeat"]
+        row = {f"field_{i}": 1.0 for i in range(options["fields"])}
+        row_ids = list(construct_dynamic_model(DynamicModel.objects.get(pk=pk)).objects.values_list("pk", flat=True))
+        step = max(len(row_ids) // repeat, 1)
+        return {
+            "insert row": self.timed(repeat, lambda i: self.call("post", "row", data=row, pk=pk)),
+            "read row": self.timed(
+                repeat, lambda i: self.call("get", "row_detail", pk=pk, row_id=row_ids[i * step % len(row_ids)])
+            ),
+            "keyset page": self.timed(
+                repeat,
+                lambda i: browse_rows(
+                    DynamicModel.objects.get(pk=pk), {"after": str(row_ids[i * step % len(row_ids)])}
+                ),
+            ),
+        }
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+from tables import renderers
+from tables.helpers import construct_rows_queryset, get_dynamic_table, tabulate_rows
+from tables.models import DynamicModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare payload sizes and build plus encode times of the rows response formats. "
+        "Everything runs in a transaction which is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Number of rows loaded into each table.")
+        parser.add_argument("--fields", type=int, default=10, help="Number of fields of each type in each table.")
+        parser.add_argument("--repeat", type=int, default=5, help="Number of times each format is timed.")
+
+    def handle(self, *args, **options):
+        formats = {"json (serializer)": None, "json (orjson)": renderers.ORJSONRenderer}
+        formats["columnar"] = renderers.ColumnarJSONRenderer
+        formats["msgpack"] = renderers.MessagePackRenderer
+        if renderers.orjson is None:
+            del formats["json (orjson)"]
+        if renderers.msgpack is None:
+            del formats["msgpack"]
+
+        results = {}
+        with transaction.atomic():
+            for storage_mode in DynamicModel.StorageMode.values:
+                dynamic_model, table = self.create_table(storage_mode, options)
+                queryset = construct_rows_queryset(dynamic_model, table.model, table.fields)
+                for name, renderer_class in formats.items():
+                    results[(storage_mode, name)] = self.benchmark(table, queryset, renderer_class, options["repeat"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'storage mode':<14}{'format':<20}{'size':>12}{'time':>12}")
+        for (storage_mode, name), (size, elapsed) in results.items():
+            self.stdout.write(f"{storage_mode:<14}{name:<20}{size / 1024:>10.0f}KB{elapsed * 1000:>10.1f}ms")
+
+    def create_table(self, storage_mode, options):
+        dynamic_model = DynamicModel.objects.create(
+            name=f"Benchmark{storage_mode.capitalize()}", storage_mode=storage_mode
+        )
+        for i in range(options["fields"]):
+            dynamic_model.fields.create(name=f"string_{i}", type="string")
+            dynamic_model.fields.create(name=f"number_{i}", type="number")
+            dynamic_model.fields.create(name=f"boolean_{i}", type="boolean")
+        table = get_dynamic_table(dynamic_model)
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(table.model)
+        instances = []
+        for i in range(options["rows"]):
+            serializer = table.serializer_class(
+                data={
+                    field.name: {"string": f"Value {i}", "number": i / 3, "boolean": i % 2 == 0}[field.type]
+                    for field in table.fields
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            instances.append(table.model(**serializer.validated_data))
+        table.model.objects.bulk_create(instances, batch_size=1000)
+        return dynamic_model, table
+
+    def benchmark(self, table, queryset, renderer_class, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if renderer_class is None:
+                content = JSONRenderer().render(table.serializer_class(queryset.all(), many=True).data)
+            else:
+                content = renderer_class().render(tabulate_rows(table, queryset.all()))
+        return len(content), (time.perf_counter() - start) / repeat
@@ -0,0 +1,102 @@
+import json
+import time
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from tables.helpers import construct_dynamic_model, construct_row_serializer
+from tables.models import DynamicModel
+from tables.views import DynamicModelView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the columns and jsonb storage modes on schema edits, single-row inserts and reads. "
+        "Everything runs in a transaction which is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Number of rows loaded into each table.")
+        parser.add_argument("--fields", type=int, default=20, help="Number of number fields in each table.")
+        parser.add_argument("--repeat", type=int, default=10, help="Number of times each operation is timed.")
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        results = {}
+        with transaction.atomic():
+            for storage_mode in DynamicModel.StorageMode.values:
+                results[storage_mode] = self.benchmark(storage_mode, options)
+            transaction.set_rollback(True)
+
+        operations = list(results[DynamicModel.StorageMode.COLUMNS])
+        self.stdout.write(f"{'operation':<20}" + "".join(f"{mode:>14}" for mode in results))
+        for operation in operations:
+            self.stdout.write(
+                f"{operation:<20}" + "".join(f"{results[mode][operation] * 1000:>12.2f}ms" for mode in results)
+            )
+
+    def call(self, method, action, pk=None, data=None, query=None):
+        view = DynamicModelView.as_view({method: action})
+        path = f"/?{urlencode(query)}" if query else "/"
+        if data is None:
+            request = getattr(self.factory, method)(path)
+        else:
+            request = getattr(self.factory, method)(path, data=json.dumps(data), content_type="application/json")
+        response = view(request, pk=pk) if pk is not None else view(request)
+        response.render()
+        return response
+
+    def timed(self, repeat, function):
+        start = time.perf_counter()
+        for i in range(repeat):
+            function(i)
+        return (time.perf_counter() - start) / repeat
+
+    def benchmark(self, storage_mode, options):
+        fields = [{"name": f"field_{i}", "type": "number", "indexed": i == 0} for i in range(options["fields"])]
+        data = {"name": f"Benchmark{storage_mode.capitalize()}", "storage_mode": storage_mode, "fields": fields}
+        pk = self.call("post", "create", data=data).data["id"]
+        dynamic_model = DynamicModel.objects.get(pk=pk)
+
+        Dynamic = construct_dynamic_model(dynamic_model)
+        serializer_class = construct_row_serializer(dynamic_model, Dynamic)
+        instances = []
+        for i in range(options["rows"]):
+            serializer = serializer_class(data={field["name"]: float(i) for field in fields})
+            serializer.is_valid(raise_exception=True)
+            instances.append(Dynamic(**serializer.validated_data))
+        Dynamic.objects.bulk_create(instances, batch_size=1000)
+        row = {field["name"]: 1.0 for field in fields}
+
+        repeat = options["repeat"]
+        results = {
+            "insert row": self.timed(repeat, lambda i: self.call("post", "row", pk=pk, data=row)),
+            "add field": self.timed(
+                repeat,
+                lambda i: self.call(
+                    "put",
+                    "edit",
+                    pk=pk,
+                    data={"action": "create", "name": f"added_{i}", "type": "string", "allow_null": True},
+                ),
+            ),
+        }
+        added = list(dynamic_model.fields.filter(name__startswith="added_").values_list("pk", flat=True))
+        results["rename field"] = self.timed(
+            repeat,
+            lambda i: self.call(
+                "put",
+                "edit",
+                pk=pk,
+                data={"id": added[i], "action": "update", "name": f"renamed_{i}", "allow_null": True},
+            ),
+        )
+        results["remove field"] = self.timed(
+            repeat, lambda i: self.call("put", "edit", pk=pk, data={"id": added[i], "action": "delete"})
+        )
+        results["read all rows"] = self.timed(repeat, lambda i: self.call("get", "rows", pk=pk))
+        results["filtered read"] = self.timed(
+            repeat, lambda i: self.call("get", "rows", pk=pk, query={"field_0__gte": i, "field_0__lt": i + 10})
+        )
+        return results
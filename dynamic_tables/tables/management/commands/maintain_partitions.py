@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tables.models import DynamicModel
+from tables.partitioning import ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Create partitions ahead of time for every partitioned dynamic model."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=None, help="Number of range intervals to create ahead.")
+
+    def handle(self, *args, **options):
+        dynamic_models = DynamicModel.objects.exclude(partition_strategy=DynamicModel.PartitionStrategy.NONE)
+        for dynamic_model in dynamic_models.prefetch_related("fields"):
+            with transaction.atomic():
+                created = ensure_partitions(dynamic_model, ahead=options["ahead"])
+            for name in created:
+                self.stdout.write(f"{dynamic_model.name}: created partition {name}")
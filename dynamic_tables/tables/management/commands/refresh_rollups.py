@@ -0,0 +1,23 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from tables.models import Rollup
+from tables.rollups import refresh_rollup
+
+
+class Command(BaseCommand):
+    help = "Fold changes logged for rollups of dynamic models into their rollup tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=settings.TABLE_ROLLUP_REFRESH_INTERVAL)
+        parser.add_argument("--once", action="store_true", help="Refresh every rollup once and exit.")
+
+    def handle(self, *args, **options):
+        while True:
+            for rollup in Rollup.objects.select_related("dynamic_model"):
+                if not refresh_rollup(rollup):
+                    self.stdout.write(f"{rollup}: another refresh is running, skipped.")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
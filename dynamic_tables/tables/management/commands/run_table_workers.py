@@ -0,0 +1,58 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from tables.jobs import work
+
+
+def run_worker(per_table_limit, poll_interval, stop_event):
+    # The parent process decides when to stop, workers finish their current job first.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    work(per_table_limit, poll_interval, stop_event=stop_event)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Run a pool of worker processes executing background jobs of dynamic tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=settings.TABLE_JOB_WORKERS)
+        parser.add_argument(
+            "--per-table",
+            type=int,
+            default=settings.TABLE_JOB_CONCURRENCY_PER_TABLE,
+            help="Maximum number of jobs running at the same time for a single table.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=settings.TABLE_JOB_POLL_INTERVAL)
+        parser.add_argument(
+            "--burst", action="store_true", help="Run pending jobs in this process and exit when none is left."
+        )
+
+    def handle(self, *args, **options):
+        if options["burst"]:
+            work(options["per_table"], options["poll_interval"], burst=True)
+            return
+
+        context = multiprocessing.get_context("fork")
+        stop_event = context.Event()
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        workers = [
+            context.Process(target=run_worker, args=(options["per_table"], options["poll_interval"], stop_event))
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} table workers.")
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        for worker in workers:
+            worker.join()
+        self.stdout.write("Table workers stopped.")
@@ -0,0 +1,21 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Build generated models and row serializers of dynamic tables and report the time and memory it takes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode", default=None, help='"all", "none" or the number of most recently used tables to warm up.'
+        )
+
+    def handle(self, *args, **options):
+        report = apps.get_app_config("tables").warm_up(options["mode"])
+        if report is None:
+            self.stdout.write("Warm-up skipped.")
+            return
+        self.stdout.write(
+            f"Warmed up {report['tables']} dynamic models in {report['seconds'] * 1000:.1f} ms "
+            f"using {report['memory_bytes'] / 1024:.1f} KiB."
+        )
@@ -0,0 +1,50 @@
+"""
+Service counters of dynamic tables.
+
+Counters are kept in the default cache, which is local to each worker process unless a shared backend is configured,
+and an evicted counter starts again from 0. Gauges, like the number of requests waiting for admission, are kept in
+the memory of the process, so they are never evicted and cannot drift below zero.
+"""
+
+import threading
+from collections import Counter
+
+from django.core.cache import cache
+
+METRICS_KEY_PREFIX = "tables:metrics"
+
+gauges = Counter()
+gauges_lock = threading.Lock()
+
+
+def metric_key(dynamic_model_id: int, name: str):
+    return f"{METRICS_KEY_PREFIX}:{dynamic_model_id}:{name}"
+
+
+def request_metric(action: str):
+    return f"requests_{action}"
+
+
+def increment(dynamic_model_id: int, name: str, delta: int = 1):
+    key = metric_key(dynamic_model_id, name)
+    if cache.add(key, delta, timeout=None):
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def adjust_gauge(dynamic_model_id: int, name: str, delta: int):
+    key = metric_key(dynamic_model_id, name)
+    with gauges_lock:
+        gauges[key] += delta
+        return gauges[key]
+
+
+def get_metrics(dynamic_model_id: int, names: list[str]):
+    keys = {name: metric_key(dynamic_model_id, name) for name in names}
+    values = cache.get_many(list(keys.values()))
+    with gauges_lock:
+        values.update({key: gauges[key] for key in keys.values() if key in gauges})
+    return {name: values.get(key, 0) for name, key in keys.items()}
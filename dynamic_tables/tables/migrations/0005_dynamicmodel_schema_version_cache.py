@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0004_remove_dynamicmodelfield_allow_blank_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="cache_rows",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="cache_timeout",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="schema_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0005_dynamicmodel_schema_version_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="partition_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="partition_interval",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="partition_key",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="partition_strategy",
+            field=models.CharField(
+                choices=[("none", "None"), ("range", "Range"), ("hash", "Hash")],
+                default="none",
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0006_dynamicmodel_partitioning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="storage_mode",
+            field=models.CharField(
+                choices=[("columns", "Columns"), ("jsonb", "JSONB")],
+                default="columns",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodelfield",
+            name="indexed",
+            field=models.BooleanField(default=False),
+        ),
+    ]
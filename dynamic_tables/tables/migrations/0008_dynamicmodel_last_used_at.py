@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0007_storage_mode_and_indexed_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="last_used_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0009_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodelfield",
+            name="search",
+            field=models.CharField(
+                choices=[
+                    ("none", "None"),
+                    ("fulltext", "Full-text"),
+                    ("trigram", "Trigram"),
+                ],
+                default="none",
+                max_length=32,
+            ),
+        ),
+        # Trigram search is optional, so the extension is only installed where the server ships it.
+        migrations.RunSQL(
+            """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                END IF;
+            END
+            $$;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
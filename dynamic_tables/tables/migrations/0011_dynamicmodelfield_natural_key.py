@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0010_dynamicmodelfield_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodelfield",
+            name="natural_key",
+            field=models.BooleanField(default=False),
+        ),
+    ]
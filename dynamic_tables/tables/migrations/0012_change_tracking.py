@@ -0,0 +1,76 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0011_dynamicmodelfield_natural_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="track_changes",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name="RowTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_id", models.BigIntegerField()),
+                ("seq", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField()),
+                (
+                    "dynamic_model",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tombstones",
+                        to="tables.dynamicmodel",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["dynamic_model", "seq"],
+                        name="rowtombstone_model_seq_idx",
+                    )
+                ],
+            },
+        ),
+        # Row changes of tracked tables are numbered from one shared sequence. Writers hold the shared
+        # advisory lock (31, table id) until commit, see tables.changes.
+        migrations.RunSQL(
+            """
+            CREATE SEQUENCE tables_change_seq;
+            CREATE FUNCTION tables_track_changes() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_advisory_xact_lock_shared(31, TG_ARGV[0]::integer);
+                IF TG_OP = 'DELETE' THEN
+                    INSERT INTO tables_rowtombstone (dynamic_model_id, row_id, seq, deleted_at)
+                    VALUES (TG_ARGV[0]::bigint, OLD.id, nextval('tables_change_seq'), now());
+                    RETURN OLD;
+                END IF;
+                NEW._updated_seq := nextval('tables_change_seq');
+                NEW._updated_at := now();
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="""
+            DROP FUNCTION tables_track_changes();
+            DROP SEQUENCE tables_change_seq;
+            """,
+        ),
+    ]
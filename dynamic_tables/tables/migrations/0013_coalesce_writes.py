@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0012_change_tracking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="coalesce_window",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="coalesce_writes",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0013_coalesce_writes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodel",
+            name="concurrency_limits",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0014_concurrency_limits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodelfield",
+            name="expression",
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0015_dynamicmodelfield_expression"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dynamicmodelfield",
+            name="target",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="references",
+                to="tables.dynamicmodel",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dynamicmodelfield",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("string", "String"),
+                    ("boolean", "Boolean"),
+                    ("number", "Number"),
+                    ("reference", "Reference"),
+                ],
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:58
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tables", "0016_dynamicmodelfield_target"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Rollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=32,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                message="Only letters are allowed.", regex="^[a-zA-Z]+$"
+                            )
+                        ],
+                    ),
+                ),
+                ("group_by", models.JSONField(default=list)),
+                ("metrics", models.JSONField(default=list)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "dynamic_model",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="tables.dynamicmodel",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="rollup",
+            constraint=models.UniqueConstraint(
+                fields=("dynamic_model", "name"), name="unique_rollup_name"
+            ),
+        ),
+    ]
@@ -1,8 +1,22 @@
+from datetime import timedelta
+
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
+
+LAST_USED_RESOLUTION = timedelta(minutes=1)
 
 
 class DynamicModel(models.Model):
+    class PartitionStrategy(models.TextChoices):
+        NONE = "none", "None"
+        RANGE = "range", "Range"
+        HASH = "hash", "Hash"
+
+    class StorageMode(models.TextChoices):
+        COLUMNS = "columns", "Columns"
+        JSONB = "jsonb", "JSONB"
+
     name = models.CharField(
         max_length=32,
         unique=True,
@@ -13,16 +27,51 @@ class DynamicModel(models.Model):
             )
         ],
     )
+    schema_version = models.PositiveIntegerField(default=1)
+    storage_mode = models.CharField(max_length=32, choices=StorageMode.choices, default=StorageMode.COLUMNS)
+    cache_rows = models.BooleanField(default=False)
+    cache_timeout = models.PositiveIntegerField(null=True, blank=True)
+    partition_strategy = models.CharField(
+        max_length=32, choices=PartitionStrategy.choices, default=PartitionStrategy.NONE
+    )
+    partition_key = models.CharField(max_length=32, blank=True)
+    partition_interval = models.PositiveBigIntegerField(null=True, blank=True)
+    partition_count = models.PositiveIntegerField(null=True, blank=True)
+    track_changes = models.BooleanField(default=False)
+    coalesce_writes = models.BooleanField(default=False)
+    coalesce_window = models.PositiveIntegerField(null=True, blank=True)
+    concurrency_limits = models.JSONField(default=dict, blank=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.name}"
 
+    @property
+    def is_partitioned(self):
+        return self.partition_strategy != DynamicModel.PartitionStrategy.NONE
+
+    def mark_used(self):
+        now = timezone.now()
+        if self.last_used_at is None or now - self.last_used_at > LAST_USED_RESOLUTION:
+            DynamicModel.objects.filter(pk=self.pk).update(last_used_at=now)
+            self.last_used_at = now
+
+    def bump_schema_version(self):
+        DynamicModel.objects.filter(pk=self.pk).update(schema_version=models.F("schema_version") + 1)
+        self.refresh_from_db(fields=["schema_version"])
+
 
 class DynamicModelField(models.Model):
     class DynamicModelFieldType(models.TextChoices):
         STRING = "string", "String"
         BOOLEAN = "boolean", "Boolean"
         NUMBER = "number", "Number"
+        REFERENCE = "reference", "Reference"
+
+    class SearchMode(models.TextChoices):
+        NONE = "none", "None"
+        FULLTEXT = "fulltext", "Full-text"
+        TRIGRAM = "trigram", "Trigram"
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["dynamic_model", "name"], name="unique_dynamic_model_name")]
@@ -31,6 +80,97 @@ class DynamicModelField(models.Model):
     name = models.CharField(max_length=32)
     type = models.CharField(max_length=32, choices=DynamicModelFieldType.choices)
     allow_null = models.BooleanField(default=True)
+    indexed = models.BooleanField(default=False)
+    search = models.CharField(max_length=32, choices=SearchMode.choices, default=SearchMode.NONE)
+    natural_key = models.BooleanField(default=False)
+    expression = models.TextField(blank=True)
+    target = models.ForeignKey(
+        DynamicModel, on_delete=models.PROTECT, related_name="references", null=True, blank=True, default=None
+    )
 
     def __str__(self):
         return f"{self.dynamic_model.name} - {self.name} - {self.type}"
+
+    @property
+    def storage_key(self):
+        return f"f{self.pk}"
+
+    @property
+    def is_computed(self):
+        return bool(self.expression)
+
+    @property
+    def is_reference(self):
+        return self.type == DynamicModelField.DynamicModelFieldType.REFERENCE
+
+
+class Rollup(models.Model):
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["dynamic_model", "name"], name="unique_rollup_name")]
+
+    dynamic_model = models.ForeignKey(DynamicModel, on_delete=models.CASCADE, related_name="rollups")
+    name = models.CharField(
+        max_length=32,
+        validators=[
+            RegexValidator(
+                regex=r"^[a-zA-Z]+$",
+                message="Only letters are allowed.",
+            )
+        ],
+    )
+    # Fields are kept by id, so renaming them leaves the definition and the rollup table untouched.
+    group_by = models.JSONField(default=list)
+    metrics = models.JSONField(default=list)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.dynamic_model.name} - {self.name}"
+
+
+class Job(models.Model):
+    class JobKind(models.TextChoices):
+        IMPORT = "import", "Import"
+
+    class JobStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"], name="job_status_created_at_idx")]
+
+    dynamic_model = models.ForeignKey(DynamicModel, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=32, choices=JobKind.choices)
+    status = models.CharField(max_length=32, choices=JobStatus.choices, default=JobStatus.PENDING)
+    payload = models.JSONField(default=dict)
+    processed = models.PositiveBigIntegerField(default=0)
+    total = models.PositiveBigIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.dynamic_model.name} - {self.kind} - {self.status}"
+
+
+class RowTombstone(models.Model):
+    class Meta:
+        indexes = [models.Index(fields=["dynamic_model", "seq"], name="rowtombstone_model_seq_idx")]
+
+    dynamic_model = models.ForeignKey(DynamicModel, on_delete=models.CASCADE, related_name="tombstones")
+    row_id = models.BigIntegerField()
+    seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.dynamic_model.name} - {self.row_id}"
+
+
+# Generated models live in this app too, a table named like one of these models would take its database table.
+RESERVED_MODEL_NAMES = frozenset(
+    model._meta.model_name for model in (DynamicModel, DynamicModelField, Rollup, Job, RowTombstone)
+)
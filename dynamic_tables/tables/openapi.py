@@ -0,0 +1,222 @@
+"""
+OpenAPI documents of single dynamic tables, describing their row endpoints with the table's own fields.
+
+Documents are generated on first request for a schema version and kept in the default cache together with
+their ETag, so polling clients get 304 responses without a document being built.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from rest_framework.reverse import reverse
+from tables.helpers import ROW_FILTER_LOOKUPS
+from tables.models import DynamicModel, DynamicModelField
+
+OPENAPI_CACHE_KEY_PREFIX = "tables:openapi"
+
+SCHEMA_TYPES = {
+    DynamicModelField.DynamicModelFieldType.STRING: openapi.TYPE_STRING,
+    DynamicModelField.DynamicModelFieldType.NUMBER: openapi.TYPE_NUMBER,
+    DynamicModelField.DynamicModelFieldType.BOOLEAN: openapi.TYPE_BOOLEAN,
+    DynamicModelField.DynamicModelFieldType.REFERENCE: openapi.TYPE_INTEGER,
+}
+ERROR_RESPONSES = {
+    "400": openapi.Response("Bad Request: invalid input data, missing required fields or other client-side errors."),
+    "404": openapi.Response("No table or row with this id."),
+}
+
+
+def openapi_cache_key(dynamic_model: DynamicModel):
+    return f"{OPENAPI_CACHE_KEY_PREFIX}:{dynamic_model.pk}:{dynamic_model.schema_version}"
+
+
+def field_description(field: DynamicModelField):
+    if field.is_computed:
+        return f"Computed as `{field.expression}`."
+    if field.is_reference:
+        return f"Id of a row of {field.target.name}, the row itself with `expand`."
+    return None
+
+
+def field_schema(field: DynamicModelField):
+    return openapi.Schema(
+        type=SCHEMA_TYPES[field.type],
+        read_only=field.is_computed or None,
+        x_nullable=field.allow_null or None,
+        description=field_description(field),
+    )
+
+
+def row_schema(fields: list):
+    properties = {"id": openapi.Schema(type=openapi.TYPE_INTEGER, read_only=True)}
+    properties.update({field.name: field_schema(field) for field in fields})
+    return openapi.Schema(type=openapi.TYPE_OBJECT, properties=properties)
+
+
+def row_input_schema(fields: list, partial: bool = False):
+    writable = [field for field in fields if not field.is_computed]
+    required = [] if partial else [field.name for field in writable if not field.allow_null]
+    return openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={field.name: field_schema(field) for field in writable},
+        required=required or None,
+    )
+
+
+def ref(name: str):
+    return {"$ref": f"#/definitions/{name}"}
+
+
+def body(schema):
+    return openapi.Parameter("data", openapi.IN_BODY, required=True, schema=schema)
+
+
+def query(name: str, type: str, description: str):
+    return openapi.Parameter(name, openapi.IN_QUERY, type=type, description=description)
+
+
+def rows_parameters(fields: list):
+    lookups = ", ".join(ROW_FILTER_LOOKUPS)
+    parameters = [
+        query(field.name, SCHEMA_TYPES[field.type], f"Filter rows, also as `{field.name}__<lookup>` with {lookups}.")
+        for field in fields
+    ]
+    if any(field.search != DynamicModelField.SearchMode.NONE for field in fields):
+        parameters.append(query("search", openapi.TYPE_STRING, "Search query over the searchable fields."))
+    if any(field.is_reference for field in fields):
+        parameters.append(query("expand", openapi.TYPE_STRING, "Comma separated reference fields to embed."))
+    parameters += [
+        query("ids", openapi.TYPE_STRING, "Comma separated row ids, other parameters are ignored."),
+        query("sample", openapi.TYPE_STRING, "A percentage like `5%` or an approximate number of rows."),
+        query("sample_method", openapi.TYPE_STRING, "`system` or `bernoulli`."),
+        query("seed", openapi.TYPE_INTEGER, "Seed of a repeatable sample."),
+        query("ordering", openapi.TYPE_STRING, "Comma separated fields, `-` for descending."),
+        query("limit", openapi.TYPE_INTEGER, "Number of rows to return."),
+        query("offset", openapi.TYPE_INTEGER, "Number of rows to skip."),
+    ]
+    return parameters
+
+
+def build_openapi(dynamic_model: DynamicModel, fields: list):
+    """
+    Return the Swagger 2.0 document of the row endpoints of a dynamic model.
+    """
+    pk = dynamic_model.pk
+    name = dynamic_model.name
+    tags = [name]
+    row_list = openapi.Schema(type=openapi.TYPE_ARRAY, items=ref(f"{name}Row"))
+    paths = {
+        reverse("api:table-rows", (pk,)): openapi.PathItem(
+            get=openapi.Operation(
+                f"{name}_rows",
+                openapi.Responses({"200": openapi.Response("Rows of the table.", row_list), **ERROR_RESPONSES}),
+                parameters=rows_parameters(fields),
+                summary=f"Retrieve rows of {name}.",
+                tags=tags,
+            )
+        ),
+        reverse("api:table-lookup", (pk,)): openapi.PathItem(
+            post=openapi.Operation(
+                f"{name}_rows_lookup",
+                openapi.Responses({"200": openapi.Response("Rows found, in the order of the ids.", row_list)}),
+                parameters=[
+                    body(
+                        openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                "ids": openapi.Schema(
+                                    type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+                                )
+                            },
+                            required=["ids"],
+                        )
+                    )
+                ],
+                summary=f"Retrieve rows of {name} by id.",
+                tags=tags,
+            )
+        ),
+        reverse("api:table-row", (pk,)): openapi.PathItem(
+            post=openapi.Operation(
+                f"{name}_row_create",
+                openapi.Responses({"201": openapi.Response("The created row.", ref(f"{name}Row")), **ERROR_RESPONSES}),
+                parameters=[body(ref(f"{name}RowInput"))],
+                summary=f"Create a row of {name}.",
+                tags=tags,
+            )
+        ),
+        reverse("api:table-row-detail", (pk, 0)).replace("/0/", "/{row_id}/"): openapi.PathItem(
+            get=openapi.Operation(
+                f"{name}_row_read",
+                openapi.Responses({"200": openapi.Response("The row.", ref(f"{name}Row")), **ERROR_RESPONSES}),
+                summary=f"Retrieve a row of {name}.",
+                tags=tags,
+            ),
+            patch=openapi.Operation(
+                f"{name}_row_partial_update",
+                openapi.Responses({"200": openapi.Response("The updated row.", ref(f"{name}Row")), **ERROR_RESPONSES}),
+                parameters=[body(ref(f"{name}RowPatch"))],
+                summary=f"Update fields of a row of {name}.",
+                tags=tags,
+            ),
+            delete=openapi.Operation(
+                f"{name}_row_delete",
+                openapi.Responses({"204": openapi.Response("Row deleted."), **ERROR_RESPONSES}),
+                summary=f"Delete a row of {name}.",
+                tags=tags,
+            ),
+            parameters=[openapi.Parameter("row_id", openapi.IN_PATH, required=True, type=openapi.TYPE_INTEGER)],
+        ),
+    }
+    if any(field.natural_key for field in fields):
+        upsert = openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "rows": openapi.Schema(type=openapi.TYPE_ARRAY, items=ref(f"{name}RowInput")),
+                "update": openapi.Schema(
+                    type=openapi.TYPE_OBJECT, additional_properties=openapi.Schema(type=openapi.TYPE_STRING)
+                ),
+            },
+            required=["rows"],
+        )
+        paths[reverse("api:table-upsert", (pk,))] = openapi.PathItem(
+            post=openapi.Operation(
+                f"{name}_upsert",
+                openapi.Responses(
+                    {"200": openapi.Response("Numbers of inserted and updated rows."), **ERROR_RESPONSES}
+                ),
+                parameters=[body(upsert)],
+                summary=f"Insert or update rows of {name} by natural key.",
+                tags=tags,
+            )
+        )
+    return openapi.Swagger(
+        _prefix="/",
+        info=openapi.Info(title=f"Dynamic Tables API - {name}", default_version=f"v{dynamic_model.schema_version}"),
+        consumes=["application/json"],
+        produces=["application/json"],
+        paths=openapi.Paths(paths),
+        definitions={
+            f"{name}Row": row_schema(fields),
+            f"{name}RowInput": row_input_schema(fields),
+            f"{name}RowPatch": row_input_schema(fields, partial=True),
+        },
+    )
+
+
+def get_openapi(dynamic_model: DynamicModel):
+    """
+    Return the encoded OpenAPI document of a dynamic model and its ETag, built once per schema version.
+    """
+    key = openapi_cache_key(dynamic_model)
+    cached = cache.get(key)
+    if cached is None:
+        document = build_openapi(dynamic_model, list(dynamic_model.fields.select_related("target")))
+        content = OpenAPICodecJson(validators=[]).encode(document)
+        etag = f'"{dynamic_model.schema_version}-{hashlib.sha256(content).hexdigest()[:32]}"'
+        cached = (content, etag)
+        cache.set(key, cached, settings.API_SCHEMA_CACHE_TIMEOUT)
+    return cached
@@ -0,0 +1,129 @@
+import math
+
+from django.conf import settings
+from django.db import connection
+from tables.helpers import construct_dynamic_model
+from tables.models import DynamicModel
+from tables.rollups import log_detached_rows
+
+
+def create_partitioned_model(schema_editor, model, dynamic_model: DynamicModel):
+    quote_name = schema_editor.quote_name
+    key_field = model._meta.get_field(dynamic_model.partition_key)
+    method = "RANGE" if dynamic_model.partition_strategy == DynamicModel.PartitionStrategy.RANGE else "HASH"
+    table_sql = schema_editor.table_sql
+
+    def partitioned_table_sql(model):
+        sql, params = table_sql(model)
+        if not key_field.primary_key:
+            # Postgres requires every unique constraint of a partitioned table to include the partition key.
+            sql = sql.replace(" PRIMARY KEY", "", 1)
+            sql = f"{sql[:-1]}, PRIMARY KEY ({quote_name(model._meta.pk.column)}, {quote_name(key_field.column)}))"
+        return f"{sql} PARTITION BY {method} ({quote_name(key_field.column)})", params
+
+    schema_editor.table_sql = partitioned_table_sql
+    try:
+        schema_editor.create_model(model)
+    finally:
+        del schema_editor.table_sql
+
+
+def list_partitions(dynamic_model: DynamicModel):
+    table = construct_dynamic_model(dynamic_model)._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), greatest(c.reltuples, 0)::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        return [
+            {"name": name, "bound": bound, "is_default": bound == "DEFAULT", "estimated_rows": estimated_rows}
+            for name, bound, estimated_rows in cursor.fetchall()
+        ]
+
+
+def ensure_partitions(dynamic_model: DynamicModel, ahead: int | None = None):
+    """
+    Create the partitions a table needs now and `ahead` range intervals past its current maximum key.
+
+    Rows in the DEFAULT partition would make the creation of a range they belong to fail, so DEFAULT is detached
+    while ranges are added and its rows of each new range are moved into it. The table stays locked until the
+    transaction commits.
+
+    Returns the names of the partitions that were created.
+    """
+    Dynamic = construct_dynamic_model(dynamic_model)
+    table = Dynamic._meta.db_table
+    existing = {partition["name"] for partition in list_partitions(dynamic_model)}
+    quote_name = connection.ops.quote_name
+    statements = []
+    ranges = {}
+
+    if dynamic_model.partition_strategy == DynamicModel.PartitionStrategy.HASH:
+        for remainder in range(dynamic_model.partition_count):
+            statements.append(
+                (
+                    f"{table}_h{remainder}",
+                    f"FOR VALUES WITH (MODULUS {int(dynamic_model.partition_count)}, REMAINDER {remainder})",
+                )
+            )
+    else:
+        interval = dynamic_model.partition_interval
+        key_column = Dynamic._meta.get_field(dynamic_model.partition_key).column
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT max({quote_name(key_column)}) FROM {quote_name(table)}")
+            current = cursor.fetchone()[0] or 0
+        first = math.floor(current / interval)
+        if ahead is None:
+            ahead = settings.TABLE_PARTITIONS_AHEAD
+        for bucket in range(first, first + ahead + 1):
+            name = f"{table}_p{bucket}".replace("-", "m")
+            ranges[name] = (bucket * interval, (bucket + 1) * interval)
+            statements.append((name, f"FOR VALUES FROM ({ranges[name][0]}) TO ({ranges[name][1]})"))
+        statements.append((f"{table}_default", "DEFAULT"))
+
+    missing = [(name, bound) for name, bound in statements if name not in existing]
+    default = f"{table}_default" if f"{table}_default" in existing and missing else None
+    with connection.cursor() as cursor:
+        if default:
+            cursor.execute(f"ALTER TABLE {quote_name(table)} DETACH PARTITION {quote_name(default)}")
+        for name, bound in missing:
+            if not default:
+                cursor.execute(f"CREATE TABLE {quote_name(name)} PARTITION OF {quote_name(table)} {bound}")
+                continue
+            # Filled before it is attached, so the row triggers of the table do not see the moved rows. Generated
+            # columns must stay generated to be attached and are computed again from the moved values.
+            columns = ", ".join(
+                quote_name(field.column) for field in Dynamic._meta.concrete_fields if not field.generated
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote_name(name)} "
+                f"(LIKE {quote_name(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+            )
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {quote_name(default)} WHERE {quote_name(key_column)} >= %s "
+                f"AND {quote_name(key_column)} < %s RETURNING {columns}) "
+                f"INSERT INTO {quote_name(name)} ({columns}) SELECT {columns} FROM moved",
+                ranges[name],
+            )
+            cursor.execute(f"ALTER TABLE {quote_name(table)} ATTACH PARTITION {quote_name(name)} {bound}")
+        if default:
+            cursor.execute(f"ALTER TABLE {quote_name(table)} ATTACH PARTITION {quote_name(default)} DEFAULT")
+    return [name for name, bound in missing]
+
+
+def detach_partition(dynamic_model: DynamicModel, name: str, drop: bool = False):
+    table = construct_dynamic_model(dynamic_model)._meta.db_table
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote_name(table)} DETACH PARTITION {quote_name(name)}")
+    # The detach keeps writers out of the table until commit, the partition holds exactly the removed rows.
+    log_detached_rows(dynamic_model, name)
+    with connection.cursor() as cursor:
+        if drop:
+            cursor.execute(f"DROP TABLE {quote_name(name)}")
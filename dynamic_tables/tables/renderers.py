@@ -0,0 +1,97 @@
+"""
+Renderers for rows and aggregates, fed with the `values_list` tuples of a `TabularRows` instead of serialized rows.
+
+orjson and msgpack are optional, renderers backed by a missing package are left out of content negotiation.
+"""
+
+import json
+from collections import namedtuple
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+TabularRows = namedtuple("TabularRows", ["columns", "rows"])
+
+
+def to_columns(data: TabularRows):
+    rows = list(data.rows)
+    values = zip(*rows) if rows else [()] * len(data.columns)
+    return {"columns": data.columns, "data": dict(zip(data.columns, map(list, values)))}
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str, separators=(",", ":")).encode()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    The layout of the JSON renderer, one object per row, encoded with orjson.
+
+    Row objects are zipped from the tuples just before encoding, which measured faster than writing them as bytes.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    tabular = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, TabularRows):
+            data = [dict(zip(data.columns, row)) for row in data.rows]
+        return dumps(data)
+
+
+class ColumnarJSONRenderer(BaseRenderer):
+    """
+    Column names once and a list of values per column, `{"columns": [...], "data": {column: [values]}}`.
+    """
+
+    media_type = "application/vnd.tables.columnar+json"
+    format = "columnar"
+    charset = None
+    tabular = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(to_columns(data) if isinstance(data, TabularRows) else data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    The columnar layout encoded with MessagePack.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    tabular = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(to_columns(data) if isinstance(data, TabularRows) else data, default=str)
+
+
+def tabular_renderer_classes():
+    renderers = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+    if orjson is not None:
+        renderers.insert(0, ORJSONRenderer)
+    if msgpack is not None:
+        renderers.append(MessagePackRenderer)
+    return renderers
@@ -0,0 +1,143 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+# Seconds behind the primary, zero when everything received is replayed or the server is not a standby.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_use_replica = ContextVar("use_replica", default=False)
+_replica_health = {}
+
+
+def replica_read(view):
+    """
+    Mark a view or viewset action as read-only, so requests to it can be served by a replica.
+    """
+    view.replica_read = True
+    return view
+
+
+def is_pinned_to_primary(request):
+    """
+    Whether the client wrote recently and has to read its own writes from the primary.
+    """
+    return settings.TABLE_REPLICA_STICKY_COOKIE in request.COOKIES
+
+
+def reads_from_replica(request):
+    """
+    Whether reads of the request may be served by a replica, which can lag behind the primary.
+    """
+    return getattr(request, "use_replica", False)
+
+
+def replica_lag(alias: str):
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable.", alias, exc_info=True)
+        connections[alias].close()
+        return None
+
+
+def choose_replica():
+    """
+    Return the healthy replica with the lowest lag, or None when no replica is within the allowed lag.
+
+    Health is checked at most once per `TABLE_REPLICA_HEALTH_INTERVAL` for each replica and process.
+    """
+    now = time.monotonic()
+    candidates = []
+    for alias in settings.TABLE_DATABASE_REPLICAS:
+        checked_at, lag = _replica_health.get(alias, (None, None))
+        if checked_at is None or now - checked_at > settings.TABLE_REPLICA_HEALTH_INTERVAL:
+            lag = replica_lag(alias)
+            _replica_health[alias] = (now, lag)
+        if lag is not None and lag <= settings.TABLE_REPLICA_MAX_LAG:
+            candidates.append((lag, alias))
+    return min(candidates)[1] if candidates else None
+
+
+class ReplicaRouter:
+    """
+    Send reads of requests routed by `ReplicaRoutingMiddleware` to a replica and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return choose_replica()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica would otherwise be saved back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.TABLE_DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.TABLE_DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route requests to views marked with `replica_read` to replicas, unless the client wrote recently.
+
+    A successful write sets a cookie pinning the client to the primary for `TABLE_REPLICA_STICKY_SECONDS`,
+    reads sent with an unsafe method (e.g. lookups with a body) do not count as writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            # Reset by value, under ASGI the view is entered in another context than this call.
+            if reads_from_replica(request):
+                _use_replica.set(False)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and not getattr(request, "read_only", False)
+        ):
+            response.set_cookie(
+                settings.TABLE_REPLICA_STICKY_COOKIE, "1", max_age=settings.TABLE_REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.is_replica_read(request, view_func):
+            return None
+        request.read_only = True
+        if is_pinned_to_primary(request) or not settings.TABLE_DATABASE_REPLICAS:
+            return None
+        request.use_replica = True
+        _use_replica.set(True)
+        return None
+
+    def is_replica_read(self, request, view_func):
+        # Viewsets are dispatched through one function per route, the action is looked up by method.
+        actions = getattr(view_func, "actions", None)
+        if actions is not None and request.method.lower() in actions:
+            view_func = getattr(view_func.cls, actions[request.method.lower()], None)
+        return getattr(view_func, "replica_read", False)
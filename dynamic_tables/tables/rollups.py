@@ -0,0 +1,303 @@
+"""
+Rollups, aggregates of a dynamic model kept in a companion table for dashboards reading them too often for GROUP BY.
+
+Statement triggers append the per-group deltas of every write to a log table, which only takes inserts, so writers
+of the same group do not wait for each other. Refreshes fold the log into the rollup table: counts and sums are
+added, minimums and maximums widened, and groups which may have lost their minimum or maximum are recomputed from
+the table. Reads report how long the oldest change not folded yet has been waiting.
+
+Rows of detached partitions leave the table without firing the triggers, `log_detached_rows` logs them as
+removed. The group columns of the table are indexed for the recomputations, which adds the cost of one more index
+to every write of the table.
+"""
+
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+from tables.constants import AggregateFunctionE
+from tables.helpers import get_dynamic_table
+from tables.models import DynamicModel, Rollup
+
+# First key of the advisory lock taken while a rollup is refreshed, the second key is the rollup id.
+ROLLUP_LOCK = 32
+
+# Output name, rollup table column, table column it is computed from, type, and for minimums and maximums the
+# log column of the extreme of removed rows.
+RollupColumn = namedtuple("RollupColumn", ["name", "column", "source", "db_type", "removed"])
+
+
+class RollupLayout:
+    """
+    Columns of a rollup: group columns and metric columns named after field ids, and the table columns they
+    are computed from under their current names.
+    """
+
+    def __init__(self, rollup: Rollup, dynamic_model: DynamicModel):
+        table = get_dynamic_table(dynamic_model)
+        fields = {field.pk: field for field in table.fields}
+        quote_name = connection.ops.quote_name
+
+        def column(name: str, rollup_column: str, field_pk: int, removed: str | None = None):
+            model_field = table.model._meta.get_field(fields[field_pk].name)
+            return RollupColumn(
+                name,
+                quote_name(rollup_column),
+                quote_name(model_field.column),
+                model_field.db_type(connection),
+                quote_name(removed) if removed else None,
+            )
+
+        self.table = quote_name(f"tables_{dynamic_model.name.lower()}_rollup{rollup.pk}")
+        self.log_table = quote_name(f"tables_{dynamic_model.name.lower()}_rollup{rollup.pk}_log")
+        self.function = quote_name(f"tables_rollup{rollup.pk}_log")
+        self.source_table = quote_name(table.model._meta.db_table)
+        self.trigger_prefix = f"{table.model._meta.db_table}_rollup{rollup.pk}"
+        self.source_index = quote_name(f"{self.trigger_prefix}_source")
+        self.groups = [column(fields[pk].name, f"g{pk}", pk) for pk in rollup.group_by]
+        self.metrics = []
+        for function, pk in rollup.metrics:
+            if function == AggregateFunctionE.COUNT.value:
+                metric = RollupColumn(function, "rows", None, "bigint", None)
+            elif function == AggregateFunctionE.SUM.value:
+                metric = column(f"{function}_{fields[pk].name}", f"{function}{pk}", pk)
+            else:
+                metric = column(f"{function}_{fields[pk].name}", f"{function}{pk}", pk, f"removed_{function}{pk}")
+            self.metrics.append((function, metric))
+
+    def of(self, *functions):
+        return [metric for function, metric in self.metrics if function in functions]
+
+
+def create_rollup(rollup: Rollup):
+    """
+    Create the rollup and log tables of a rollup, the triggers maintaining them, and fill the rollup table.
+    """
+    layout = RollupLayout(rollup, rollup.dynamic_model)
+    groups = [f"{group.column} {group.db_type}" for group in layout.groups]
+    sums = [f"{metric.column} double precision NOT NULL DEFAULT 0" for metric in layout.of("sum")]
+    extremes = [f"{metric.column} {metric.db_type}" for metric in layout.of("min", "max")]
+    removed = [f"{metric.removed} {metric.db_type}" for metric in layout.of("min", "max")]
+    group_list = ", ".join(group.column for group in layout.groups)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {layout.table} "
+            f"({', '.join([*groups, 'rows bigint NOT NULL', *sums, *extremes, 'recompute boolean NOT NULL DEFAULT false'])})"
+        )
+        cursor.execute(
+            f"CREATE UNIQUE INDEX {connection.ops.quote_name(f'{layout.trigger_prefix}_groups')} "
+            f"ON {layout.table} ({group_list}) NULLS NOT DISTINCT"
+        )
+        cursor.execute(
+            f"CREATE TABLE {layout.log_table} "
+            f"({', '.join([*groups, 'rows bigint NOT NULL', *sums, *extremes, *removed, 'logged_at timestamptz NOT NULL DEFAULT now()'])})"
+        )
+        # Recomputing the extremes of a group looks its rows up in the table.
+        cursor.execute(f"CREATE INDEX {layout.source_index} ON {layout.source_table} ({source_groups(layout)})")
+    install_rollup_triggers(rollup, layout)
+    # Creating the triggers locks out writers until this transaction commits, so the rows counted here and the
+    # changes logged later do not overlap.
+    columns = [group.column for group in layout.groups] + ["rows"]
+    columns += [metric.column for metric in layout.of("sum") + layout.of("min", "max")]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {layout.table} ({', '.join(columns)}) "
+            f"SELECT {select_deltas(layout, 1)} FROM {layout.source_table} GROUP BY {source_groups(layout)}"
+        )
+    Rollup.objects.filter(pk=rollup.pk).update(refreshed_at=timezone.now())
+
+
+def source_groups(layout: RollupLayout):
+    return ", ".join(group.source for group in layout.groups)
+
+
+def select_deltas(layout: RollupLayout, sign: int):
+    """
+    Return the select list aggregating rows into deltas: groups, row count and sums signed, then the minimums
+    and maximums of the rows.
+    """
+    sign_sql = "-" if sign < 0 else ""
+    values = [source_groups(layout), f"{sign_sql}COUNT(*)"]
+    values += [f"{sign_sql}COALESCE(SUM({metric.source}), 0)" for metric in layout.of("sum")]
+    values += [f"{function.upper()}({metric.source})" for function, metric in layout.metrics if metric.removed]
+    return ", ".join(values)
+
+
+def log_removed_sql(layout: RollupLayout, source: str):
+    """
+    Return the statement logging the rows of `source` as removed from the table.
+    """
+    groups = [group.column for group in layout.groups]
+    sums = [metric.column for metric in layout.of("sum")]
+    removed = [metric.removed for metric in layout.of("min", "max")]
+    return (
+        f"INSERT INTO {layout.log_table} ({', '.join([*groups, 'rows', *sums, *removed])}) "
+        f"SELECT {select_deltas(layout, -1)} FROM {source} GROUP BY {source_groups(layout)}"
+    )
+
+
+def log_detached_rows(dynamic_model: DynamicModel, name: str):
+    """
+    Log the rows of a partition detached from a dynamic model's table as removed from its rollups.
+    """
+    for rollup in dynamic_model.rollups.all():
+        with connection.cursor() as cursor:
+            cursor.execute(log_removed_sql(RollupLayout(rollup, dynamic_model), connection.ops.quote_name(name)))
+
+
+def install_rollup_triggers(rollup: Rollup, layout: RollupLayout | None = None):
+    """
+    (Re)create the trigger function of a rollup, which refers to columns of the table by their current names.
+    """
+    layout = layout or RollupLayout(rollup, rollup.dynamic_model)
+    groups = [group.column for group in layout.groups]
+    sums = [metric.column for metric in layout.of("sum")]
+    extremes = [metric.column for metric in layout.of("min", "max")]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {layout.function}() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    {log_removed_sql(layout, "old_rows")};
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO {layout.log_table} ({', '.join([*groups, 'rows', *sums, *extremes])})
+                    SELECT {select_deltas(layout, 1)} FROM new_rows GROUP BY {source_groups(layout)};
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+        # Transition tables can only be declared by triggers of a single event.
+        for event, transitions in [
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        ]:
+            cursor.execute(
+                f"CREATE OR REPLACE TRIGGER {quote_name(f'{layout.trigger_prefix}_{event.lower()}')} "
+                f"AFTER {event} ON {layout.source_table} REFERENCING {transitions} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {layout.function}()"
+            )
+
+
+def sync_rollups(dynamic_model: DynamicModel):
+    """
+    Update the triggers of a dynamic model's rollups after a schema change.
+    """
+    for rollup in dynamic_model.rollups.all():
+        install_rollup_triggers(rollup)
+
+
+def drop_rollup(rollup: Rollup):
+    layout = RollupLayout(rollup, rollup.dynamic_model)
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for event in ("insert", "update", "delete"):
+            cursor.execute(
+                f"DROP TRIGGER IF EXISTS {quote_name(f'{layout.trigger_prefix}_{event}')} ON {layout.source_table}"
+            )
+        cursor.execute(f"DROP FUNCTION IF EXISTS {layout.function}()")
+        cursor.execute(f"DROP INDEX IF EXISTS {layout.source_index}")
+        cursor.execute(f"DROP TABLE IF EXISTS {layout.table}, {layout.log_table}")
+    rollup.delete()
+
+
+def refresh_rollup(rollup: Rollup):
+    """
+    Fold the logged changes into the rollup table. Returns False when another refresh of the rollup is running.
+    """
+    layout = RollupLayout(rollup, rollup.dynamic_model)
+    groups = [group.column for group in layout.groups]
+    sums = [metric.column for metric in layout.of("sum")]
+    extremes = layout.of("min", "max")
+    merged = ["SUM(rows) AS rows", *[f"SUM({column}) AS {column}" for column in sums]]
+    updates = [
+        "rows = rollup.rows + EXCLUDED.rows",
+        *[f"{column} = rollup.{column} + EXCLUDED.{column}" for column in sums],
+    ]
+    # A group recomputes an extreme when a removed value reaches it, LEAST and GREATEST skip nulls.
+    recompute = []
+    for function, metric in layout.metrics:
+        if metric.removed is None:
+            continue
+        aggregate, combine, compare = ("MIN", "LEAST", "<=") if function == "min" else ("MAX", "GREATEST", ">=")
+        merged += [
+            f"{aggregate}({metric.column}) AS {metric.column}",
+            f"{aggregate}({metric.removed}) AS {metric.removed}",
+        ]
+        updates.append(f"{metric.column} = {combine}(rollup.{metric.column}, EXCLUDED.{metric.column})")
+        recompute.append(
+            f"COALESCE(m.{metric.removed} {compare} {combine}(r.{metric.column}, m.{metric.column}), false)"
+        )
+    updates.append("recompute = rollup.recompute OR EXCLUDED.recompute")
+    columns = [*groups, "rows", *sums, *[metric.column for metric in extremes]]
+    same_group = " AND ".join(f"r.{column} IS NOT DISTINCT FROM m.{column}" for column in groups)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", [ROLLUP_LOCK, rollup.pk])
+        if not cursor.fetchone()[0]:
+            return False
+        cursor.execute(
+            f"""
+            WITH logged AS (DELETE FROM {layout.log_table} RETURNING *),
+            merged AS (SELECT {', '.join([*groups, *merged])} FROM logged GROUP BY {', '.join(groups)})
+            INSERT INTO {layout.table} AS rollup ({', '.join([*columns, 'recompute'])})
+            SELECT {', '.join(f'm.{column}' for column in columns)}, {' OR '.join(recompute) or 'false'}
+            FROM merged AS m LEFT JOIN {layout.table} AS r ON {same_group}
+            ON CONFLICT ({', '.join(groups)}) DO UPDATE SET {', '.join(updates)}
+            """
+        )
+        cursor.execute(f"DELETE FROM {layout.table} WHERE rows <= 0")
+        if extremes:
+            # Nulls are matched with OR rather than IS NOT DISTINCT FROM, which keeps the lookups indexable.
+            condition = " AND ".join(
+                f"(t.{group.source} = r.{group.column} OR (t.{group.source} IS NULL AND r.{group.column} IS NULL))"
+                for group in layout.groups
+            )
+            values = [f"{function.upper()}(t.{metric.source})" for function, metric in layout.metrics if metric.removed]
+            cursor.execute(
+                f"UPDATE {layout.table} AS r SET ({', '.join([metric.column for metric in extremes] + ['recompute'])}) = "
+                f"(SELECT {', '.join([*values, 'false'])} FROM {layout.source_table} AS t WHERE {condition}) "
+                "WHERE r.recompute"
+            )
+        rollup.refreshed_at = timezone.now()
+        Rollup.objects.filter(pk=rollup.pk).update(refreshed_at=rollup.refreshed_at)
+    return True
+
+
+def rollup_lag(layout: RollupLayout):
+    """
+    Return the seconds the oldest change not folded into the rollup has been waiting, 0 when there is none.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXTRACT(EPOCH FROM clock_timestamp() - MIN(logged_at)) FROM {layout.log_table}")
+        lag = cursor.fetchone()[0]
+    return float(lag) if lag is not None else 0.0
+
+
+def read_rollup(rollup: Rollup, max_lag: float | None = None):
+    """
+    Return the groups of a rollup with their metrics, named like in the aggregate endpoint, and its staleness.
+
+    With `max_lag`, a rollup lagging further behind is refreshed first.
+    """
+    layout = RollupLayout(rollup, rollup.dynamic_model)
+    lag = rollup_lag(layout)
+    if max_lag is not None and lag > max_lag and refresh_rollup(rollup):
+        lag = rollup_lag(layout)
+    columns = [*layout.groups, *[metric for _, metric in layout.metrics]]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {', '.join(column.column for column in columns)} FROM {layout.table} "
+            f"ORDER BY {', '.join(group.column for group in layout.groups)}"
+        )
+        rows = cursor.fetchall()
+    return {
+        "groups": [dict(zip([column.name for column in columns], row)) for row in rows],
+        "refreshed_at": rollup.refreshed_at,
+        "lag_seconds": lag,
+    }
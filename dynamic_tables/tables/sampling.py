@@ -0,0 +1,104 @@
+import math
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+from rest_framework import serializers
+from tables.constants import SampleMethodE
+
+Sample = namedtuple("Sample", ["percent", "rows", "method", "seed"])
+
+
+def validate_param(name: str, field, value):
+    try:
+        return field.run_validation(value)
+    except serializers.ValidationError as error:
+        raise serializers.ValidationError({name: error.detail})
+
+
+def parse_sample(query_params):
+    """
+    Validate the `sample`, `sample_method` and `seed` query parameters of a rows request.
+
+    `sample` is a percentage of the table (`5%`) or an approximate number of rows (`500`).
+    """
+    value = query_params["sample"].strip()
+    percent, rows = None, None
+    if value.endswith("%"):
+        percent = validate_param("sample", serializers.FloatField(min_value=0, max_value=100), value[:-1])
+        if percent == 0:
+            raise serializers.ValidationError({"sample": "Sample percentage must be greater than 0."})
+    else:
+        field = serializers.IntegerField(min_value=1, max_value=settings.TABLE_SAMPLE_MAX_ROWS)
+        rows = validate_param("sample", field, value)
+    method = validate_param(
+        "sample_method",
+        serializers.ChoiceField(choices=SampleMethodE.choices()),
+        query_params.get("sample_method", SampleMethodE.SYSTEM.value),
+    )
+    seed = query_params.get("seed")
+    if seed is not None:
+        seed = validate_param("seed", serializers.IntegerField(min_value=-(2**31), max_value=2**31 - 1), seed)
+    return Sample(percent, rows, method, seed)
+
+
+def is_random_sample(query_params):
+    return "sample" in query_params and "seed" not in query_params
+
+
+def estimate_rows(model):
+    """
+    Return the planner's estimate of the rows in a table, partitions included, without scanning it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {connection.ops.quote_name(model._meta.db_table)}")
+        return cursor.fetchone()[0][0]["Plan"]["Plan Rows"]
+
+
+def count_rows(model, limit: int):
+    """
+    Count the rows of a table up to `limit`, reading no more than that many rows.
+    """
+    db_table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {db_table} LIMIT %s) AS rows", [limit])
+        return cursor.fetchone()[0]
+
+
+def filter_ids(queryset, sql: str, params: list):
+    # An array of ids is computed once and matched through the primary key index, where an IN subquery can be
+    # planned as a hash join over a scan of the whole table.
+    column = f"{connection.ops.quote_name(queryset.model._meta.db_table)}.{connection.ops.quote_name('id')}"
+    return queryset.filter(RawSQL(f"{column} = ANY(ARRAY({sql}))", params, output_field=models.BooleanField()))
+
+
+def sample_rows(queryset, query_params):
+    """
+    Keep a random sample of rows, read with `TABLESAMPLE` so the cost follows the sample rather than the table.
+
+    `system` samples whole pages and is the cheapest, `bernoulli` samples single rows from every page. Row
+    count samples are approximate: the percentage is derived from the planner's row estimate and the sample is
+    capped at the requested count. With a `seed` the same sample is returned until the table changes. Tables
+    of at most `TABLE_SAMPLE_MIN_ROWS` rows are previewed with their first rows instead.
+    """
+    sample = parse_sample(query_params)
+    db_table = connection.ops.quote_name(queryset.model._meta.db_table)
+    count = count_rows(queryset.model, settings.TABLE_SAMPLE_MIN_ROWS + 1)
+    if count <= settings.TABLE_SAMPLE_MIN_ROWS:
+        limit = sample.rows if sample.rows is not None else math.ceil(count * sample.percent / 100)
+        return filter_ids(queryset, f"SELECT id FROM {db_table} ORDER BY id LIMIT %s", [limit])
+
+    if sample.rows is not None:
+        percent = min(100.0, sample.rows * 100 / max(estimate_rows(queryset.model), count))
+    else:
+        percent = sample.percent
+    sql = f"SELECT id FROM {db_table} TABLESAMPLE {sample.method.upper()} (%s)"
+    params = [percent]
+    if sample.seed is not None:
+        sql += " REPEATABLE (%s)"
+        params.append(sample.seed)
+    if sample.rows is not None:
+        sql += " LIMIT %s"
+        params.append(sample.rows)
+    return filter_ids(queryset, sql, params)
@@ -1,12 +1,62 @@
+from django.conf import settings
 from rest_framework import serializers
-from tables.constants import ActionTypeE
-from tables.models import DynamicModel, DynamicModelField
+from tables.constants import ActionTypeE, AggregateFunctionE, EndpointClassE, PartitionActionTypeE, UpsertRuleE
+from tables.expressions import ExpressionError, compile_expression, referencing_fields
+from tables.helpers import trigram_available
+from tables.models import RESERVED_MODEL_NAMES, DynamicModel, DynamicModelField, Job, Rollup
+
+# Averages are left out, they cannot be maintained without a count of non-null values per field.
+ROLLUP_FUNCTIONS = (AggregateFunctionE.SUM.value, AggregateFunctionE.MIN.value, AggregateFunctionE.MAX.value)
+
+
+def validate_search(field_type: str, search: str | None):
+    if search in (None, DynamicModelField.SearchMode.NONE):
+        return
+    if field_type != DynamicModelField.DynamicModelFieldType.STRING:
+        raise serializers.ValidationError("Search is only available for string fields.")
+    if search == DynamicModelField.SearchMode.TRIGRAM and not trigram_available():
+        raise serializers.ValidationError("Trigram search requires the pg_trgm extension.")
+
+
+def validate_reference(field_type: str, target: DynamicModel | None, expression: str | None = None):
+    if field_type != DynamicModelField.DynamicModelFieldType.REFERENCE:
+        if target is not None:
+            raise serializers.ValidationError("Only reference fields can have a target table.")
+        return
+    if target is None:
+        raise serializers.ValidationError("Reference fields require a target table.")
+    if target.is_partitioned:
+        # Ids are only unique per partition, so there is no unique key for a foreign key to refer to.
+        raise serializers.ValidationError("Partitioned tables cannot be referenced.")
+    if expression:
+        raise serializers.ValidationError("Reference fields cannot be computed.")
+
+
+def validate_computed(field: DynamicModelField, fields: dict):
+    """
+    Check a computed field against the other fields of its model, which its expression may refer to.
+    """
+    if not field.allow_null:
+        raise serializers.ValidationError("Computed fields must allow null.")
+    if field.search != DynamicModelField.SearchMode.NONE or field.natural_key:
+        raise serializers.ValidationError("Computed fields cannot be searchable or part of the natural key.")
+    try:
+        _, result_type, _ = compile_expression(field.expression, fields)
+    except ExpressionError as error:
+        raise serializers.ValidationError(f"Invalid expression of {field.name}: {error}")
+    if result_type != field.type:
+        raise serializers.ValidationError(f"Expression of {field.name} gives {result_type} values, not {field.type}.")
 
 
 class DynamicModelFieldSerializer(serializers.ModelSerializer):
     class Meta:
         model = DynamicModelField
-        fields = ("id", "name", "type", "allow_null")
+        fields = ("id", "name", "type", "allow_null", "indexed", "search", "natural_key", "expression", "target")
+
+    def validate(self, attrs):
+        validate_search(attrs["type"], attrs.get("search"))
+        validate_reference(attrs["type"], attrs.get("target"), attrs.get("expression"))
+        return attrs
 
 
 class DynamicModelFieldAlterationSerializer(serializers.Serializer):
@@ -14,6 +64,10 @@ class DynamicModelFieldAlterationSerializer(serializers.Serializer):
     name = serializers.CharField(required=False)
     type = serializers.ChoiceField(choices=DynamicModelField.DynamicModelFieldType.choices, required=False)
     allow_null = serializers.BooleanField(required=False)
+    indexed = serializers.BooleanField(required=False)
+    search = serializers.ChoiceField(choices=DynamicModelField.SearchMode.choices, required=False)
+    expression = serializers.CharField(required=False)
+    target = serializers.PrimaryKeyRelatedField(queryset=DynamicModel.objects.all(), required=False)
     action = serializers.ChoiceField(required=True, choices=ActionTypeE.choices())
 
     def validate(self, attrs):
@@ -35,20 +89,103 @@ class DynamicModelFieldAlterationSerializer(serializers.Serializer):
             and not dynamic_model_instance.fields.filter(pk=attrs.get("id")).exists()
         ):
             raise serializers.ValidationError("Field with this id does not exists for this model.")
+        if (
+            attrs["action"] in [ActionTypeE.UPDATE.value, ActionTypeE.DELETE.value]
+            and dynamic_model_instance.is_partitioned
+            and dynamic_model_instance.fields.filter(
+                pk=attrs.get("id"), name=dynamic_model_instance.partition_key
+            ).exists()
+        ):
+            raise serializers.ValidationError("Partition key field cannot be modified.")
+        if (
+            attrs["action"] in [ActionTypeE.UPDATE.value, ActionTypeE.DELETE.value]
+            and dynamic_model_instance.fields.filter(pk=attrs.get("id"), natural_key=True).exists()
+        ):
+            raise serializers.ValidationError("Natural key field cannot be modified.")
         if (
             attrs["action"] in [ActionTypeE.CREATE.value, ActionTypeE.UPDATE.value]
             and DynamicModelField.objects.filter(dynamic_model=dynamic_model_instance, name=attrs.get("name")).exists()
         ):
             raise serializers.ValidationError("Field with this name already exists in this model.")
+        if attrs["action"] == ActionTypeE.CREATE.value:
+            validate_search(attrs["type"], attrs.get("search"))
+        elif attrs["action"] == ActionTypeE.UPDATE.value:
+            validate_search(dynamic_model_instance.fields.get(pk=attrs["id"]).type, attrs.get("search"))
+        self.validate_computed(dynamic_model_instance, attrs)
+        self.validate_reference(dynamic_model_instance, attrs)
         return attrs
 
+    def validate_reference(self, dynamic_model_instance: DynamicModel, attrs):
+        if attrs["action"] != ActionTypeE.CREATE.value:
+            if attrs.get("target") is not None:
+                raise serializers.ValidationError("Target of a reference field cannot be updated.")
+            return
+        validate_reference(attrs["type"], attrs.get("target"), attrs.get("expression"))
+        if attrs.get("target") is not None and dynamic_model_instance.storage_mode == DynamicModel.StorageMode.JSONB:
+            raise serializers.ValidationError("Reference fields are only available in columns storage mode.")
+
+    def validate_computed(self, dynamic_model_instance: DynamicModel, attrs):
+        fields = {field.name: field for field in dynamic_model_instance.fields.all()}
+        if attrs["action"] == ActionTypeE.CREATE.value:
+            if attrs.get("expression") is None:
+                return
+            if dynamic_model_instance.storage_mode == DynamicModel.StorageMode.JSONB:
+                raise serializers.ValidationError("Computed fields are only available in columns storage mode.")
+            field = DynamicModelField(**{name: value for name, value in attrs.items() if name != "action"})
+            validate_computed(field, {**fields, field.name: field})
+            return
+        if attrs.get("expression") is not None:
+            raise serializers.ValidationError(
+                "Expression of a computed field cannot be updated, delete and create the field again."
+            )
+        field = dynamic_model_instance.fields.get(pk=attrs["id"])
+        if (
+            field.is_computed
+            and attrs.get("search", DynamicModelField.SearchMode.NONE) != DynamicModelField.SearchMode.NONE
+        ):
+            raise serializers.ValidationError("Computed fields cannot be searchable or part of the natural key.")
+        if attrs["action"] == ActionTypeE.DELETE.value or attrs.get("name", field.name) != field.name:
+            names = referencing_fields(field.name, fields)
+            if names:
+                raise serializers.ValidationError(
+                    f"Field is used by computed fields {', '.join(names)}, which have to be deleted first."
+                )
+        if attrs["action"] == ActionTypeE.DELETE.value:
+            names = [
+                rollup.name
+                for rollup in dynamic_model_instance.rollups.all()
+                if field.pk in rollup.group_by or any(pk == field.pk for _, pk in rollup.metrics)
+            ]
+            if names:
+                raise serializers.ValidationError(
+                    f"Field is used by rollups {', '.join(names)}, which have to be deleted first."
+                )
+
 
 class DynamicModelSerializer(serializers.ModelSerializer):
     fields = DynamicModelFieldSerializer(many=True)
+    concurrency_limits = serializers.DictField(child=serializers.IntegerField(min_value=0), required=False)
 
     class Meta:
         model = DynamicModel
-        fields = ("id", "name", "fields")
+        fields = (
+            "id",
+            "name",
+            "fields",
+            "schema_version",
+            "storage_mode",
+            "cache_rows",
+            "cache_timeout",
+            "partition_strategy",
+            "partition_key",
+            "partition_interval",
+            "partition_count",
+            "track_changes",
+            "coalesce_writes",
+            "coalesce_window",
+            "concurrency_limits",
+        )
+        read_only_fields = ("schema_version",)
 
     def create(self, validated_data):
         fields_data = validated_data.pop("fields", [])
@@ -61,4 +198,201 @@ class DynamicModelSerializer(serializers.ModelSerializer):
         names = [field["name"] for field in attrs["fields"]]
         if len(names) != len(set(names)):
             raise serializers.ValidationError("Field names must be unique.")
+        self.validate_partitioning(attrs)
+        self.validate_natural_key(attrs)
+        self.validate_computed_fields(attrs)
+        if attrs.get("storage_mode") == DynamicModel.StorageMode.JSONB and any(
+            field.get("target") is not None for field in attrs["fields"]
+        ):
+            raise serializers.ValidationError("Reference fields are only available in columns storage mode.")
         return attrs
+
+    def validate_name(self, name):
+        if name.lower() in RESERVED_MODEL_NAMES:
+            raise serializers.ValidationError("This name is reserved.")
+        return name
+
+    def validate_concurrency_limits(self, limits):
+        for endpoint_class in limits:
+            if endpoint_class not in EndpointClassE._value2member_map_:
+                raise serializers.ValidationError(f"{endpoint_class} is not an endpoint class.")
+        return limits
+
+    def validate_partitioning(self, attrs):
+        strategy = attrs.get("partition_strategy", DynamicModel.PartitionStrategy.NONE)
+        key = attrs.get("partition_key", "")
+        if strategy == DynamicModel.PartitionStrategy.NONE:
+            if key or attrs.get("partition_interval") or attrs.get("partition_count"):
+                raise serializers.ValidationError("Partition options require a partition strategy.")
+            return
+        if not key:
+            raise serializers.ValidationError("Partition key is required for partitioned tables.")
+        fields = {field["name"]: field for field in attrs["fields"]}
+        if key != "id" and attrs.get("storage_mode") == DynamicModel.StorageMode.JSONB:
+            raise serializers.ValidationError("Only id can be the partition key in jsonb storage mode.")
+        if key != "id":
+            if key not in fields:
+                raise serializers.ValidationError("Partition key must be id or one of the table fields.")
+            if fields[key].get("allow_null", True):
+                raise serializers.ValidationError("Partition key field cannot allow null.")
+        if strategy == DynamicModel.PartitionStrategy.RANGE:
+            if key != "id" and fields[key]["type"] != DynamicModelField.DynamicModelFieldType.NUMBER:
+                raise serializers.ValidationError("Range partition key must be id or a number field.")
+            if not attrs.get("partition_interval"):
+                raise serializers.ValidationError("Partition interval is required for range partitioning.")
+        if strategy == DynamicModel.PartitionStrategy.HASH and not attrs.get("partition_count"):
+            raise serializers.ValidationError("Partition count is required for hash partitioning.")
+
+    def validate_natural_key(self, attrs):
+        key = [field for field in attrs["fields"] if field.get("natural_key")]
+        if not key:
+            return
+        if attrs.get("storage_mode") == DynamicModel.StorageMode.JSONB:
+            raise serializers.ValidationError("Natural keys are only available in columns storage mode.")
+        if any(field.get("allow_null", True) for field in key):
+            raise serializers.ValidationError("Natural key fields cannot allow null.")
+        if attrs.get("partition_strategy", DynamicModel.PartitionStrategy.NONE) != DynamicModel.PartitionStrategy.NONE:
+            if attrs["partition_key"] not in [field["name"] for field in key]:
+                raise serializers.ValidationError("Natural key must include the partition key.")
+
+    def validate_computed_fields(self, attrs):
+        fields = {field["name"]: DynamicModelField(**field) for field in attrs["fields"]}
+        computed = [field for field in fields.values() if field.is_computed]
+        if not computed:
+            return
+        if attrs.get("storage_mode") == DynamicModel.StorageMode.JSONB:
+            raise serializers.ValidationError("Computed fields are only available in columns storage mode.")
+        for field in computed:
+            validate_computed(field, fields)
+
+
+class RollupSerializer(serializers.ModelSerializer):
+    group_by = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    metrics = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+
+    class Meta:
+        model = Rollup
+        fields = ("id", "name", "group_by", "metrics", "refreshed_at")
+        read_only_fields = ("refreshed_at",)
+        # Unique per dynamic model, which is not part of the input.
+        validators = []
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        names = {field.pk: field.name for field in instance.dynamic_model.fields.all()}
+        data["group_by"] = [names[pk] for pk in instance.group_by]
+        data["metrics"] = [function if pk is None else f"{function}:{names[pk]}" for function, pk in instance.metrics]
+        return data
+
+    def validate_name(self, name):
+        if self.context["instance"].rollups.filter(name=name).exists():
+            raise serializers.ValidationError("Rollup with this name already exists for this model.")
+        return name
+
+    def validate(self, attrs):
+        # Fields are stored by id, metrics as [function, field id] pairs with a null id for count.
+        dynamic_model = self.context["instance"]
+        if dynamic_model.storage_mode == DynamicModel.StorageMode.JSONB:
+            raise serializers.ValidationError("Rollups are only available in columns storage mode.")
+        fields = {field.name: field for field in dynamic_model.fields.all()}
+        for name in attrs["group_by"]:
+            if name not in fields:
+                raise serializers.ValidationError({"group_by": f"{name} is not a field of this model."})
+        if len(set(attrs["group_by"])) != len(attrs["group_by"]):
+            raise serializers.ValidationError({"group_by": "Group fields must be unique."})
+        metrics = []
+        for metric in attrs["metrics"]:
+            if metric == AggregateFunctionE.COUNT.value:
+                metrics.append([metric, None])
+                continue
+            function, _, name = metric.partition(":")
+            if function not in ROLLUP_FUNCTIONS or name not in fields:
+                raise serializers.ValidationError(
+                    {"metrics": f"{metric} is not count or <{'|'.join(ROLLUP_FUNCTIONS)}>:<field> of this model."}
+                )
+            field_type = fields[name].type
+            if (
+                function == AggregateFunctionE.SUM.value
+                and field_type != DynamicModelField.DynamicModelFieldType.NUMBER
+            ):
+                raise serializers.ValidationError({"metrics": f"{function} requires a number field."})
+            if field_type == DynamicModelField.DynamicModelFieldType.BOOLEAN:
+                raise serializers.ValidationError({"metrics": f"{function} is not available for boolean fields."})
+            metrics.append([function, fields[name].pk])
+        if len({tuple(metric) for metric in metrics}) != len(metrics):
+            raise serializers.ValidationError({"metrics": "Metrics must be unique."})
+        attrs["group_by"] = [fields[name].pk for name in attrs["group_by"]]
+        attrs["metrics"] = metrics
+        return attrs
+
+
+class PartitionAlterationSerializer(serializers.Serializer):
+    name = serializers.CharField(required=True)
+    action = serializers.ChoiceField(required=True, choices=PartitionActionTypeE.choices())
+
+    def validate_name(self, value):
+        partitions = self.context["partitions"]
+        if not any(partition["name"] == value and not partition["is_default"] for partition in partitions):
+            raise serializers.ValidationError("Partition with this name does not exist for this model.")
+        return value
+
+    def validate(self, attrs):
+        if self.context["instance"].partition_strategy != DynamicModel.PartitionStrategy.RANGE:
+            raise serializers.ValidationError("Only range partitions can be detached or dropped.")
+        return attrs
+
+
+class DynamicModelCloneSerializer(serializers.ModelSerializer):
+    filters = serializers.DictField(child=serializers.CharField(), required=False)
+
+    class Meta:
+        model = DynamicModel
+        fields = ("name", "filters")
+
+
+class RowsImportSerializer(serializers.Serializer):
+    rows = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+
+class RowsLookupSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+    def validate_ids(self, ids):
+        if len(ids) > settings.TABLE_LOOKUP_MAX_IDS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.TABLE_LOOKUP_MAX_IDS} elements."
+            )
+        return ids
+
+
+class RowsUpsertSerializer(serializers.Serializer):
+    rows = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    update = serializers.DictField(child=serializers.ChoiceField(choices=UpsertRuleE.choices()), required=False)
+
+    def validate(self, attrs):
+        fields = {field.name: field for field in self.context["instance"].fields.all()}
+        if not any(field.natural_key for field in fields.values()):
+            raise serializers.ValidationError("This model has no natural key.")
+        for name in attrs.get("update", {}):
+            if name not in fields or fields[name].natural_key or fields[name].is_computed:
+                raise serializers.ValidationError({"update": f"{name} is not a non-key field of this model."})
+        return attrs
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = (
+            "id",
+            "dynamic_model",
+            "kind",
+            "status",
+            "processed",
+            "total",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "heartbeat_at",
+            "finished_at",
+        )
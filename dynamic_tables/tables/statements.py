@@ -0,0 +1,51 @@
+"""
+Server-side prepared statements of the generated per-table SQL.
+
+With server-side binding psycopg prepares a query once it ran `prepare_threshold` times on a connection and keeps
+up to `TABLE_PREPARED_STATEMENTS_MAX` of them per connection, keyed by the SQL text. Every connection records the
+schema version of each table it served, when a table is used with a newer version the statements of that
+connection are deallocated, the generated SQL of older versions is never run again.
+"""
+
+import psycopg
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from tables.models import DynamicModel
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    `connection_created` receiver sizing the prepared statement cache of new psycopg connections.
+
+    The cache is cleared through a private attribute, a psycopg version without it is refused rather than leaving
+    statements of outdated schema versions prepared.
+    """
+    if connection.vendor == "postgresql" and hasattr(connection.connection, "prepared_max"):
+        if not callable(getattr(getattr(connection.connection, "_prepared", None), "clear", None)):
+            raise ImproperlyConfigured(
+                f"psycopg {psycopg.__version__} has no prepared statement cache to clear on schema changes."
+            )
+        connection.connection.prepared_max = settings.TABLE_PREPARED_STATEMENTS_MAX
+
+
+def clear_prepared_statements(connection):
+    """
+    Deallocate all statements prepared on an open connection, before its next query.
+    """
+    # psycopg has no public API for this, it is what the connection does itself after a DROP or ROLLBACK. A
+    # DEALLOCATE ALL of our own would leave psycopg executing statements by names that no longer exist.
+    connection.connection._prepared.clear()
+
+
+def check_prepared_statements(dynamic_model: DynamicModel):
+    """
+    Drop the prepared statements of connections that served an older schema version of a dynamic model.
+    """
+    for connection in connections.all():
+        # Kept across reconnects, a new connection has nothing to clear so an outdated entry costs nothing.
+        versions = connection.__dict__.setdefault("table_schema_versions", {})
+        version = versions.get(dynamic_model.pk)
+        if version is not None and version != dynamic_model.schema_version and connection.connection is not None:
+            clear_prepared_statements(connection)
+        versions[dynamic_model.pk] = dynamic_model.schema_version
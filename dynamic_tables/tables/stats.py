@@ -0,0 +1,173 @@
+"""
+Storage and usage statistics of dynamic tables, read from the catalog and the cumulative statistics views.
+
+Partitions are summed into their table and partition indexes into the index they were created from. Statistics
+are kept in the default cache for `TABLE_STATS_CACHE_TIMEOUT` seconds, they only change as fast as autovacuum and
+the statistics collector update them anyway.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from tables.models import DynamicModel
+
+STATS_CACHE_KEY_PREFIX = "tables:stats"
+
+# Columns of TABLE_STATS_SQL after the id, counters of tables without statistics yet are 0.
+TABLE_STATS_COLUMNS = [
+    "estimated_rows",
+    "partitions",
+    "heap_bytes",
+    "index_bytes",
+    "toast_bytes",
+    "total_bytes",
+    "live_rows",
+    "dead_rows",
+    "modified_since_analyze",
+    "seq_scans",
+    "seq_rows_read",
+    "index_scans",
+    "inserted",
+    "updated",
+    "hot_updated",
+    "deleted",
+    "last_vacuum",
+    "last_analyze",
+]
+
+# pg_partition_tree lists nothing for tables which are not partitioned, the table itself is added to it.
+TABLE_STATS_SQL = """
+    SELECT
+        d.id,
+        sum(greatest(c.reltuples, 0))::bigint,
+        count(*) FILTER (WHERE t.level > 0),
+        sum(pg_relation_size(c.oid))::bigint,
+        sum(pg_indexes_size(c.oid))::bigint,
+        sum(coalesce(pg_total_relation_size(nullif(c.reltoastrelid, 0)), 0))::bigint,
+        sum(pg_total_relation_size(c.oid))::bigint,
+        coalesce(sum(s.n_live_tup), 0)::bigint,
+        coalesce(sum(s.n_dead_tup), 0)::bigint,
+        coalesce(sum(s.n_mod_since_analyze), 0)::bigint,
+        coalesce(sum(s.seq_scan), 0)::bigint,
+        coalesce(sum(s.seq_tup_read), 0)::bigint,
+        coalesce(sum(s.idx_scan), 0)::bigint,
+        coalesce(sum(s.n_tup_ins), 0)::bigint,
+        coalesce(sum(s.n_tup_upd), 0)::bigint,
+        coalesce(sum(s.n_tup_hot_upd), 0)::bigint,
+        coalesce(sum(s.n_tup_del), 0)::bigint,
+        max(greatest(s.last_vacuum, s.last_autovacuum)),
+        max(greatest(s.last_analyze, s.last_autoanalyze))
+    FROM unnest(%s::bigint[], %s::text[]) AS d(id, name)
+    CROSS JOIN LATERAL (
+        SELECT to_regclass(d.name) AS relid, 0 AS level
+        UNION
+        SELECT relid, level FROM pg_partition_tree(to_regclass(d.name))
+    ) AS t
+    JOIN pg_class c ON c.oid = t.relid
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    GROUP BY d.id
+"""
+
+# `last_idx_scan` is only tracked from PostgreSQL 16 on.
+INDEX_STATS_SQL = """
+    SELECT
+        coalesce(pg_partition_root(i.indexrelid), i.indexrelid)::regclass::text AS name,
+        bool_or(i.indisprimary),
+        bool_or(i.indisunique),
+        sum(pg_relation_size(i.indexrelid))::bigint,
+        sum(s.idx_scan)::bigint,
+        sum(s.idx_tup_read)::bigint,
+        sum(s.idx_tup_fetch)::bigint,
+        {last_scan}
+    FROM (SELECT to_regclass(%s) AS relid) AS d
+    CROSS JOIN LATERAL (SELECT d.relid UNION SELECT relid FROM pg_partition_tree(d.relid)) AS t
+    JOIN pg_class c ON c.oid = t.relid
+    JOIN pg_index i ON i.indrelid = c.oid
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+    WHERE c.relkind <> 'p'
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+
+def stats_cache_key(dynamic_model_id=None):
+    return f"{STATS_CACHE_KEY_PREFIX}:{'all' if dynamic_model_id is None else dynamic_model_id}"
+
+
+def table_name(dynamic_model: DynamicModel):
+    # The default table name Django gives the generated model, without building it.
+    return f"tables_{dynamic_model.name.lower()}"
+
+
+def query_table_stats(dynamic_models: list):
+    """
+    Return the storage and usage statistics of the tables of dynamic models by their ids, in one query.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TABLE_STATS_SQL,
+            [[dynamic_model.pk for dynamic_model in dynamic_models], [table_name(model) for model in dynamic_models]],
+        )
+        rows = cursor.fetchall()
+    stats = {}
+    for pk, *values in rows:
+        table = stats[pk] = dict(zip(TABLE_STATS_COLUMNS, values))
+        tuples = table["live_rows"] + table["dead_rows"]
+        table["dead_ratio"] = round(table["dead_rows"] / tuples, 4) if tuples else 0
+    return stats
+
+
+def query_index_stats(dynamic_model: DynamicModel):
+    """
+    Return size and usage of the indexes of a dynamic model's table. Indexes that were never scanned and do not
+    enforce uniqueness are marked unused.
+    """
+    last_scan = "max(s.last_idx_scan)" if connection.pg_version >= 160000 else "NULL::timestamptz"
+    with connection.cursor() as cursor:
+        cursor.execute(INDEX_STATS_SQL.format(last_scan=last_scan), [table_name(dynamic_model)])
+        return [
+            {
+                "name": name,
+                "primary": primary,
+                "unique": unique,
+                "bytes": size,
+                "scans": scans or 0,
+                "rows_read": rows_read or 0,
+                "rows_fetched": rows_fetched or 0,
+                "last_scan": last_scan,
+                "unused": not scans and not unique,
+            }
+            for name, primary, unique, size, scans, rows_read, rows_fetched, last_scan in cursor.fetchall()
+        ]
+
+
+def get_table_stats(dynamic_model: DynamicModel):
+    """
+    Return the statistics of a dynamic model's table with its indexes.
+    """
+    key = stats_cache_key(dynamic_model.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = query_table_stats([dynamic_model]).get(dynamic_model.pk, {})
+        stats["indexes"] = query_index_stats(dynamic_model)
+        cache.set(key, stats, settings.TABLE_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def get_tables_summary():
+    """
+    Return the statistics of all dynamic tables without their indexes, largest first.
+    """
+    key = stats_cache_key()
+    summary = cache.get(key)
+    if summary is None:
+        dynamic_models = list(DynamicModel.objects.all())
+        stats = query_table_stats(dynamic_models)
+        summary = [
+            {"id": dynamic_model.pk, "name": dynamic_model.name, "storage_mode": dynamic_model.storage_mode}
+            | stats.get(dynamic_model.pk, {})
+            for dynamic_model in dynamic_models
+        ]
+        summary.sort(key=lambda table: (-table.get("total_bytes", 0), table["id"]))
+        cache.set(key, summary, settings.TABLE_STATS_CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,19 @@
+import json
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from tables.models import DynamicModel
+
+
+class DynamicTableMixin:
+    """
+    Create dynamic tables through the API in test cases.
+    """
+
+    def post_table(self, data):
+        return self.client.post(reverse("api:table-list"), data=json.dumps(data), content_type="application/json")
+
+    def create_table(self, data):
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.json())
+        return DynamicModel.objects.get(pk=response.json()["id"])
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse as django_reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from tables.tests.mixins import DynamicTableMixin
+
+
+@override_settings(TABLE_ADMIN_PAGE_SIZE=10, TABLE_ADMIN_MAX_COLUMNS=2)
+class RowsAdminTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        data = {
+            "name": "Readings",
+            "fields": [
+                {"name": "sensor", "type": "string", "indexed": True},
+                {"name": "value", "type": "number"},
+                {"name": "note", "type": "string"},
+            ],
+        }
+        self.url = django_reverse("admin:tables_dynamicmodel_rows", args=[self.post_table(data).json()["id"]])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO tables_readings (sensor, value, note) "
+                "SELECT 's' || (i % 2), i, 'n' FROM generate_series(1, 25) AS i"
+            )
+        user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+    def test_keyset_pages(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(1, 11)))
+        self.assertEqual(response.context["columns"], ["sensor", "value"])
+        self.assertEqual(response.context["hidden_columns"], ["note"])
+        self.assertIsNone(response.context["previous_id"])
+        next_id = response.context["next_id"]
+
+        response = self.client.get(self.url, {"after": next_id})
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(11, 21)))
+        response = self.client.get(self.url, {"after": response.context["next_id"]})
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(21, 26)))
+        self.assertIsNone(response.context["next_id"])
+
+        response = self.client.get(self.url, {"before": response.context["previous_id"]})
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(11, 21)))
+        response = self.client.get(self.url, {"before": response.context["previous_id"]})
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(1, 11)))
+        self.assertIsNone(response.context["previous_id"])
+
+    def test_filters_and_columns(self):
+        response = self.client.get(self.url, {"sensor": "s1", "value": "1", "columns": "note,value"})
+        self.assertEqual(response.context["filters"], {"sensor": "s1"})
+        self.assertEqual(response.context["columns"], ["note", "value"])
+        self.assertEqual([row[2] for row in response.context["rows"]], list(range(1, 20, 2)))
+        self.assertContains(response, "?sensor=s1&amp;value=1&amp;columns=note%2Cvalue&amp;after=")
+
+        response = self.client.get(self.url, {"after": "x"})
+        self.assertEqual(len(response.context["rows"]), 10)
+        self.assertContains(response, "Invalid filters")
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_302_FOUND)
@@ -0,0 +1,130 @@
+import json
+import threading
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables import metrics
+from tables.admission import slot_base
+from tables.tests.mixins import DynamicTableMixin
+
+
+@override_settings(
+    TABLE_CONCURRENCY_LIMITS={"read": 2, "bulk_write": 1, "schema": 1, "export": 1},
+    TABLE_ADMISSION_TIMEOUT=0.2,
+    TABLE_ADMISSION_POLL_INTERVAL=0.01,
+)
+class AdmissionTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        data = {"name": "Limited", "fields": [{"name": "field_1", "type": "string"}]}
+        self.dynamic_model = self.create_table(data)
+        # Slots are session locks, held by another connection as another worker would.
+        self.other = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.other.ensure_connection()
+
+    def tearDown(self):
+        self.other.close()
+
+    def _hold_slots(self, endpoint_class, count):
+        for slot in range(count):
+            key = slot_base(self.dynamic_model.pk, endpoint_class) + slot
+            self.other.connection.execute("SELECT pg_advisory_lock(%s)", [key])
+
+    def _release_slots(self):
+        self.other.connection.execute("SELECT pg_advisory_unlock_all()")
+
+    def _metrics(self):
+        return self.client.get(reverse("api:table-metrics", (self.dynamic_model.pk,))).json()
+
+    def test_requests_over_limit_are_rejected(self):
+        url = reverse("api:table-rows", (self.dynamic_model.pk,))
+        self._hold_slots("read", 1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self._hold_slots("read", 2)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertIn("Too many concurrent read requests", response.json()["detail"])
+        # Other endpoint classes and tables are not affected.
+        response = self.client.post(
+            reverse("api:table-upsert", (self.dynamic_model.pk,)), {"rows": [{}]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        values = self._metrics()
+        self.assertEqual(values["admission_read_rejected"], 1)
+        self.assertEqual(values["admission_read_queued"], 0)
+
+    def test_waiting_request_is_admitted(self):
+        self._hold_slots("schema", 1)
+        url = reverse("api:table-edit", (self.dynamic_model.pk,))
+        data = {"action": "create", "name": "field_2", "type": "number", "allow_null": True}
+        # The other request finishes while this one waits.
+        release = threading.Timer(0.05, self._release_slots)
+        release.start()
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        release.join()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        values = self._metrics()
+        self.assertEqual(values["admission_schema_waits"], 1)
+        self.assertGreater(values["admission_schema_wait_ms"], 0)
+        self.assertEqual(values["admission_schema_queued"], 0)
+
+    @override_settings(TABLE_ADMISSION_MAX_QUEUE=1)
+    def test_full_queue_rejects_immediately(self):
+        self._hold_slots("bulk_write", 1)
+        # Another request of this process is waiting.
+        metrics.adjust_gauge(self.dynamic_model.pk, "admission_bulk_write_queued", 1)
+        try:
+            response = self.client.post(reverse("api:table-clone", (self.dynamic_model.pk,)), {"name": "Copy"})
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self._metrics()["admission_bulk_write_rejected"], 1)
+            self.assertEqual(self._metrics()["admission_bulk_write_queued"], 1)
+        finally:
+            metrics.adjust_gauge(self.dynamic_model.pk, "admission_bulk_write_queued", -1)
+
+    def test_queue_survives_cache_eviction(self):
+        metrics.adjust_gauge(self.dynamic_model.pk, "admission_read_queued", 1)
+        cache.clear()
+        self.assertEqual(self._metrics()["admission_read_queued"], 1)
+        metrics.adjust_gauge(self.dynamic_model.pk, "admission_read_queued", -1)
+        self.assertEqual(self._metrics()["admission_read_queued"], 0)
+
+    def test_table_limits_override_settings(self):
+        self._hold_slots("read", 2)
+        self.dynamic_model.concurrency_limits = {"read": 3}
+        self.dynamic_model.save()
+        url = reverse("api:table-rows", (self.dynamic_model.pk,))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.dynamic_model.concurrency_limits = {"read": 0}
+        self.dynamic_model.save()
+        self._hold_slots("read", 3)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    async def test_export_over_limit(self):
+        self._hold_slots("export", 1)
+        response = await self.async_client.get(reverse("api:async-table-export", (self.dynamic_model.pk,)))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+
+    async def test_async_rows_over_limit(self):
+        self._hold_slots("read", 2)
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.dynamic_model.pk,)))
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = await self.async_client.post(
+            reverse("api:async-table-row", (self.dynamic_model.pk,)), data={}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self._release_slots()
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.dynamic_model.pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_limits(self):
+        data = {"name": "Invalid", "fields": [], "concurrency_limits": {"writes": 1}}
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("concurrency_limits", response.json())
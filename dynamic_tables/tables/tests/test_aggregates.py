@@ -0,0 +1,54 @@
+import json
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.tests.mixins import DynamicTableMixin
+
+
+class AggregatesTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, name, storage_mode):
+        data = {
+            "name": name,
+            "storage_mode": storage_mode,
+            "fields": [
+                {"name": "category", "type": "string"},
+                {"name": "active", "type": "boolean"},
+                {"name": "amount", "type": "number"},
+            ],
+        }
+        pk = self.post_table(data).json()["id"]
+        for category, amount in [("a", 1), ("a", 3), ("b", 5), ("b", "")]:
+            self.client.post(reverse("api:table-row", (pk,)), {"category": category, "active": True, "amount": amount})
+        return pk
+
+    def test_group_by_and_metrics(self):
+        for name, storage_mode in [("Columns", "columns"), ("Document", "jsonb")]:
+            with self.subTest(storage_mode=storage_mode):
+                url = reverse("api:table-aggregate", (self._create_table(name, storage_mode),))
+                response = self.client.get(url, {"group_by": "category", "metrics": "count,sum:amount,max:amount"})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    response.json(),
+                    [
+                        {"category": "a", "count": 2, "sum_amount": 4.0, "max_amount": 3.0},
+                        {"category": "b", "count": 2, "sum_amount": 5.0, "max_amount": 5.0},
+                    ],
+                )
+                response = self.client.get(url, {"metrics": "avg:amount", "category": "a", "format": "columnar"})
+                self.assertEqual(
+                    json.loads(response.content), {"columns": ["avg_amount"], "data": {"avg_amount": [2.0]}}
+                )
+                self.assertEqual(self.client.get(url).json(), [{"count": 4}])
+
+    def test_invalid_metrics(self):
+        url = reverse("api:table-aggregate", (self._create_table("Columns", "columns"),))
+        for params in [
+            {"group_by": "missing"},
+            {"metrics": "sum:category"},
+            {"metrics": "median:amount"},
+            {"metrics": "max:active"},
+            {"metrics": ","},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
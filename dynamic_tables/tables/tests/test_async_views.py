@@ -0,0 +1,71 @@
+import json
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from tables.tests.mixins import DynamicTableMixin
+
+
+class AsyncViewsTestCase(DynamicTableMixin, TestCase):
+    def setUp(self):
+        data = {
+            "name": "Async",
+            "fields": [
+                {"name": "field_1", "type": "string", "allow_null": False},
+                {"name": "field_2", "type": "number"},
+            ],
+        }
+        self.pk = self.create_table(data).pk
+
+    async def _add_row(self, **data):
+        return await self.async_client.post(
+            reverse("api:async-table-row", (self.pk,)), data=json.dumps(data), content_type="application/json"
+        )
+
+    async def test_create_and_list_rows(self):
+        response = await self._add_row(field_1="A", field_2=1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {"id": response.json()["id"], "field_1": "A", "field_2": 1.0})
+        await self._add_row(field_1="B", field_2=2)
+
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["field_1"] for row in response.json()], ["A", "B"])
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.pk,)), {"field_2__gt": 1})
+        self.assertEqual([row["field_1"] for row in response.json()], ["B"])
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.pk,)), {"limit": 1, "offset": 1})
+        self.assertEqual([row["field_1"] for row in response.json()], ["B"])
+
+    async def test_invalid_row(self):
+        response = await self._add_row(field_2="abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"field_1", "field_2"})
+        response = await self.async_client.post(
+            reverse("api:async-table-row", (self.pk,)), data="{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_export(self):
+        for value in "ABC":
+            await self._add_row(field_1=value)
+        response = await self.async_client.get(reverse("api:async-table-export", (self.pk,)), {"field_1__lte": "B"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([json.loads(line)["field_1"] for line in content.splitlines()], ["A", "B"])
+
+    async def test_sample_rows(self):
+        for value in "ABC":
+            await self._add_row(field_1=value)
+        url = reverse("api:async-table-rows", (self.pk,))
+        response = await self.async_client.get(url, {"sample": "2"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["field_1"] for row in response.json()], ["A", "B"])
+        response = await self.async_client.get(reverse("api:async-table-export", (self.pk,)), {"sample": "50%"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_missing_table(self):
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.pk + 1,)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.async_client.get(reverse("api:async-table-rows", (self.pk,)), {"limit": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,86 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.cache import ROWS_CACHE_METRICS, rows_cache
+from tables.checks import check_rows_cache
+from tables.helpers import construct_dynamic_model
+from tables.models import DynamicModel, DynamicModelField
+
+
+@override_settings(ROWS_CACHE_ENABLED=True)
+class RowsCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        rows_cache().clear()
+        self.dynamic_model = DynamicModel.objects.create(name="CachedModel", cache_rows=True)
+        self.field = DynamicModelField.objects.create(
+            dynamic_model=self.dynamic_model, name="field_1", type=DynamicModelField.DynamicModelFieldType.STRING.value
+        )
+        self.CustomModel = construct_dynamic_model(self.dynamic_model)
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(self.CustomModel)
+        self.urls = {
+            "rows": reverse("api:table-rows", (self.dynamic_model.pk,)),
+            "row": reverse("api:table-row", (self.dynamic_model.pk,)),
+            "edit": reverse("api:table-edit", (self.dynamic_model.pk,)),
+            "metrics": reverse("api:table-metrics", (self.dynamic_model.pk,)),
+        }
+
+    def test_second_read_is_served_from_cache(self):
+        self.CustomModel.objects.create(field_1="Test1")
+        response = self.client.get(self.urls["rows"])
+        self.assertEqual(response["X-Cache"], "MISS")
+        cached_response = self.client.get(self.urls["rows"])
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response["X-Cache"], "HIT")
+        self.assertEqual(json.loads(cached_response.content), response.json())
+        metrics = self.client.get(self.urls["metrics"]).json()
+        self.assertEqual(
+            {name: metrics[name] for name in ROWS_CACHE_METRICS}, {"rows_cache_hits": 1, "rows_cache_misses": 1}
+        )
+
+    def test_query_parameters_are_normalized(self):
+        self.client.get(self.urls["rows"] + "?b=2&a=1")
+        response = self.client.get(self.urls["rows"] + "?a=1&b=2")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_row_write_invalidates_cache(self):
+        self.client.get(self.urls["rows"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.urls["row"], {"field_1": "Test1"})
+        # Read as another client, the writer itself is pinned to the primary and bypasses the cache.
+        self.client.cookies.clear()
+        response = self.client.get(self.urls["rows"])
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()), 1)
+
+    def test_edit_invalidates_cache(self):
+        self.client.get(self.urls["rows"])
+        data = {"id": self.field.id, "action": "update", "name": "renamed", "allow_null": True}
+        response = self.client.put(self.urls["edit"], data)
+        self.assertEqual(response.json()["schema_version"], 2)
+        self.client.cookies.clear()
+        response = self.client.get(self.urls["rows"])
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_table_without_caching_is_not_cached(self):
+        DynamicModel.objects.filter(pk=self.dynamic_model.pk).update(cache_rows=False)
+        self.client.get(self.urls["rows"])
+        response = self.client.get(self.urls["rows"])
+        self.assertFalse(response.has_header("X-Cache"))
+
+    @override_settings(ROWS_CACHE_MAX_ENTRY_SIZE=1)
+    def test_response_over_size_limit_is_not_cached(self):
+        self.client.get(self.urls["rows"])
+        response = self.client.get(self.urls["rows"])
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_local_memory_cache_is_reported(self):
+        self.assertEqual([warning.id for warning in check_rows_cache(None)], ["tables.W001"])
+        with override_settings(ROWS_CACHE_ENABLED=False):
+            self.assertEqual(check_rows_cache(None), [])
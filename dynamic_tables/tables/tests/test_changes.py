@@ -0,0 +1,89 @@
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.helpers import get_dynamic_table
+from tables.tests.mixins import DynamicTableMixin
+
+
+class ChangesTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, **options):
+        data = {
+            "name": "Tracked",
+            "track_changes": True,
+            "fields": [
+                {"name": "field_1", "type": "string", "allow_null": False},
+                {"name": "field_2", "type": "number"},
+            ],
+            **options,
+        }
+        return self.create_table(data)
+
+    def _add_row(self, dynamic_model, value):
+        return self.client.post(reverse("api:table-row", (dynamic_model.pk,)), {"field_1": value, "field_2": 1}).json()
+
+    def _changes(self, dynamic_model, **params):
+        return self.client.get(reverse("api:table-changes", (dynamic_model.pk,)), params)
+
+    def test_changes_since_cursor(self):
+        for options in [
+            {},
+            {"storage_mode": "jsonb"},
+            {"partition_strategy": "hash", "partition_key": "id", "partition_count": 2},
+        ]:
+            with self.subTest(options=options):
+                dynamic_model = self._create_table(**options)
+                first, second = self._add_row(dynamic_model, "A"), self._add_row(dynamic_model, "B")
+
+                response = self._changes(dynamic_model)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.json()["upserted"], [first, second])
+                self.assertEqual(response.json()["deleted"], [])
+                self.assertFalse(response.json()["has_more"])
+                cursor = response.json()["cursor"]
+                self.assertEqual(self._changes(dynamic_model, since=cursor).json()["upserted"], [])
+
+                Model = get_dynamic_table(dynamic_model).model
+                row = Model.objects.get(pk=second["id"])
+                row.save()
+                Model.objects.filter(pk=first["id"]).delete()
+                response = self._changes(dynamic_model, since=cursor)
+                self.assertEqual(response.json()["upserted"], [second])
+                self.assertEqual(response.json()["deleted"], [first["id"]])
+
+                dynamic_model.delete()
+                with connection.cursor() as cursor:
+                    cursor.execute("DROP TABLE tables_tracked")
+
+    def test_changes_paging(self):
+        dynamic_model = self._create_table()
+        rows = [self._add_row(dynamic_model, value) for value in "ABC"]
+        response = self._changes(dynamic_model, limit=2)
+        self.assertEqual(response.json()["upserted"], rows[:2])
+        self.assertTrue(response.json()["has_more"])
+        response = self._changes(dynamic_model, limit=2, since=response.json()["cursor"])
+        self.assertEqual(response.json()["upserted"], rows[2:])
+        self.assertFalse(response.json()["has_more"])
+
+    def test_sequence_column_is_indexed(self):
+        self._create_table()
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "tables_tracked")
+        self.assertTrue(any(c["index"] and c["columns"] == ["_updated_seq"] for c in constraints.values()))
+
+    def test_changes_require_tracking(self):
+        dynamic_model = self._create_table(track_changes=False)
+        response = self._changes(dynamic_model)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()[0], "Change tracking is not enabled for this model.")
+        response = self._changes(self._create_table(name="Other"), since="abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_in_tracked_table(self):
+        fields = [{"name": "field_1", "type": "string", "allow_null": False, "search": "fulltext"}]
+        dynamic_model = self._create_table(fields=fields)
+        for value in ["quick fox", "lazy dog"]:
+            self.client.post(reverse("api:table-row", (dynamic_model.pk,)), {"field_1": value})
+        response = self.client.get(reverse("api:table-rows", (dynamic_model.pk,)), {"search": "fox"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["field_1"] for row in response.json()], ["quick fox"])
@@ -0,0 +1,90 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.models import DynamicModel
+from tables.tests.mixins import DynamicTableMixin
+
+
+class CloneTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, storage_mode="columns", **options):
+        data = {
+            "name": "Source",
+            "storage_mode": storage_mode,
+            "fields": [
+                {"name": "field_1", "type": "string", "allow_null": False, "indexed": True},
+                {"name": "field_2", "type": "number", "allow_null": False},
+            ],
+            **options,
+        }
+        pk = self.post_table(data).json()["id"]
+        for i in range(5):
+            self.client.post(reverse("api:table-row", (pk,)), {"field_1": f"Test{i}", "field_2": i})
+        return pk
+
+    def _clone(self, pk, data):
+        return self.client.post(
+            reverse("api:table-clone", (pk,)), data=json.dumps(data), content_type="application/json"
+        )
+
+    def _rows(self, pk):
+        return sorted(self.client.get(reverse("api:table-rows", (pk,))).json(), key=lambda row: row["id"])
+
+    def test_clone_copies_rows_inside_database(self):
+        pk = self._create_table()
+        with CaptureQueriesContext(connection) as queries:
+            response = self._clone(pk, {"name": "Copy"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["copied_rows"], 5)
+        self.assertTrue(
+            any(
+                query["sql"].startswith("INSERT INTO") and "SELECT" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+        clone_pk = response.json()["id"]
+        self.assertEqual(self._rows(clone_pk), self._rows(pk))
+        self.assertEqual(
+            list(DynamicModel.objects.get(pk=clone_pk).fields.values_list("name", "type", "allow_null", "indexed")),
+            list(DynamicModel.objects.get(pk=pk).fields.values_list("name", "type", "allow_null", "indexed")),
+        )
+
+        response = self.client.post(reverse("api:table-row", (clone_pk,)), {"field_1": "New", "field_2": 9})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["id"], 6)
+
+    def test_clone_with_filters(self):
+        pk = self._create_table()
+        response = self._clone(pk, {"name": "Copy", "filters": {"field_2__gte": "3"}})
+        self.assertEqual(response.json()["copied_rows"], 2)
+        self.assertEqual([row["field_1"] for row in self._rows(response.json()["id"])], ["Test3", "Test4"])
+
+    def test_clone_jsonb_table(self):
+        pk = self._create_table("jsonb")
+        field = DynamicModel.objects.get(pk=pk).fields.get(name="field_2")
+        self.client.put(
+            reverse("api:table-edit", (pk,)),
+            {"id": field.pk, "action": "update", "name": "renamed", "allow_null": True},
+        )
+        response = self._clone(pk, {"name": "Copy", "filters": {"renamed__lt": "2"}})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._rows(response.json()["id"]), self._rows(pk)[:2])
+
+    def test_clone_partitioned_table(self):
+        pk = self._create_table(partition_strategy="hash", partition_key="field_2", partition_count=2)
+        response = self._clone(pk, {"name": "Copy"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["partition_strategy"], "none")
+        self.assertEqual(self._rows(response.json()["id"]), self._rows(pk))
+
+    def test_clone_name_validation(self):
+        pk = self._create_table()
+        response = self._clone(pk, {"name": "Source"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["name"][0], "dynamic model with this name already exists.")
+        response = self._clone(pk, {"name": "..."})
+        self.assertEqual(response.json()["name"][0], "Only letters are allowed.")
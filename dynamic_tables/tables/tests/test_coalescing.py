@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import IntegrityError, connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from tables.coalescing import coalescer
+from tables.helpers import get_dynamic_table
+from tables.tests.mixins import DynamicTableMixin
+
+TABLE = {
+    "name": "Coalesced",
+    "coalesce_writes": True,
+    "coalesce_window": 2000,
+    "fields": [
+        {"name": "code", "type": "string", "allow_null": False, "natural_key": True},
+        {"name": "qty", "type": "number"},
+    ],
+}
+
+
+@override_settings(TABLE_COALESCE_MAX_ROWS=3)
+class CoalescingTestCase(DynamicTableMixin, APITransactionTestCase):
+    # Grouped rows are committed by the leader's connection, which other threads only see outside a test transaction.
+
+    def setUp(self):
+        self.dynamic_model = self.create_table(TABLE)
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS tables_coalesced")
+
+    def _concurrently(self, function, arguments):
+        def call(argument):
+            try:
+                return function(argument)
+            except Exception as error:
+                return error
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(len(arguments)) as executor:
+            return list(executor.map(call, arguments))
+
+    def test_rows_are_committed_together(self):
+        def post(code):
+            return APIClient().post(reverse("api:table-row", (self.dynamic_model.pk,)), {"code": code, "qty": 1})
+
+        start = time.monotonic()
+        responses = self._concurrently(post, ["a", "b", "c"])
+        # The group is full before the window ends.
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_201_CREATED] * 3)
+        self.assertEqual([response.json()["code"] for response in responses], ["a", "b", "c"])
+        self.assertEqual(len({response.json()["id"] for response in responses}), 3)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(DISTINCT xmin::text) FROM tables_coalesced")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_failing_row_does_not_fail_group(self):
+        model = get_dynamic_table(self.dynamic_model).model
+        results = self._concurrently(
+            lambda code: coalescer.insert(self.dynamic_model, model, {"code": code, "qty": 1}), ["a", "a", "b"]
+        )
+        self.assertEqual(sum(isinstance(result, IntegrityError) for result in results), 1)
+        self.assertEqual(sorted(row.code for row in results if isinstance(row, model)), ["a", "b"])
+        self.assertEqual(model.objects.count(), 2)
+
+    @override_settings(TABLE_COALESCE_MAX_ROWS=100)
+    def test_window_ends_group(self):
+        self.dynamic_model.coalesce_window = 50
+        model = get_dynamic_table(self.dynamic_model).model
+        results = self._concurrently(
+            lambda code: coalescer.insert(self.dynamic_model, model, {"code": code, "qty": 1}), ["a", "b"]
+        )
+        self.assertTrue(all(isinstance(result, model) for result in results))
+        self.assertEqual(coalescer.groups, {})
+
+
+class CoalescingInTransactionTestCase(DynamicTableMixin, APITestCase):
+    def test_writes_in_transaction_are_not_delayed(self):
+        dynamic_model = self.create_table(TABLE)
+        start = time.monotonic()
+        response = self.client.post(reverse("api:table-row", (dynamic_model.pk,)), {"code": "a", "qty": 1})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLess(time.monotonic() - start, 1)
@@ -0,0 +1,160 @@
+import json
+
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.expressions import ExpressionError, compile_expression
+from tables.models import DynamicModelField
+from tables.tests.mixins import DynamicTableMixin
+
+
+class ExpressionsTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, fields, **options):
+        data = {"name": "Orders", "fields": fields, **options}
+        return self.post_table(data)
+
+    def _create_orders(self):
+        fields = [
+            {"name": "price", "type": "number"},
+            {"name": "quantity", "type": "number"},
+            {"name": "code", "type": "string"},
+            {"name": "total", "type": "number", "expression": "price * quantity", "indexed": True},
+            {"name": "label", "type": "string", "expression": "upper(concat(coalesce(code, 'none'), '!'))"},
+            {"name": "large", "type": "boolean", "expression": "price * quantity >= 100 and not code is None"},
+        ]
+        return self.create_table({"name": "Orders", "fields": fields})
+
+    def test_computed_values(self):
+        dynamic_model = self._create_orders()
+        url = reverse("api:table-row", (dynamic_model.pk,))
+        response = self.client.post(url, {"price": 20, "quantity": 6, "code": "a1", "total": 1})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["total"], 120)
+        self.assertEqual(response.json()["label"], "A1!")
+        self.assertTrue(response.json()["large"])
+        self.client.post(url, {"price": 5, "quantity": 2})
+        self.client.post(url, {"price": 7})
+
+        rows_url = reverse("api:table-rows", (dynamic_model.pk,))
+        rows = self.client.get(rows_url, {"ordering": "-total"}).json()
+        self.assertEqual([row["total"] for row in rows], [120, 10, None])
+        self.assertEqual([row["label"] for row in rows], ["A1!", "NONE!", "NONE!"])
+        self.assertEqual([row["large"] for row in rows], [True, False, False])
+        rows = self.client.get(rows_url, {"total__lt": 100}).json()
+        self.assertEqual([row["price"] for row in rows], [5])
+
+        row_url = reverse("api:table-row-detail", (dynamic_model.pk, rows[0]["id"]))
+        response = self.client.patch(row_url, {"quantity": 30}, format="json")
+        self.assertEqual(response.json()["total"], 150)
+
+        # Computed columns are stored and indexed.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT attgenerated FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'total'",
+                ["tables_orders"],
+            )
+            self.assertEqual(cursor.fetchone()[0], "s")
+            cursor.execute("SELECT indexdef FROM pg_indexes WHERE tablename = 'tables_orders'")
+            self.assertTrue(any("(total)" in row[0] for row in cursor.fetchall()))
+
+    def test_edit_computed_fields(self):
+        dynamic_model = self._create_orders()
+        self.client.post(reverse("api:table-row", (dynamic_model.pk,)), {"price": 3, "quantity": 4})
+        url = reverse("api:table-edit", (dynamic_model.pk,))
+        data = {"action": "create", "name": "half", "type": "number", "allow_null": True, "expression": "total / 2"}
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("computed fields cannot refer to each other", response.json()["non_field_errors"][0])
+
+        data["expression"] = "price / (quantity - 4)"
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = self.client.get(reverse("api:table-rows", (dynamic_model.pk,))).json()
+        # Division by zero gives null.
+        self.assertIsNone(rows[0]["half"])
+
+        price = dynamic_model.fields.get(name="price")
+        for data in [
+            {"action": "delete", "id": price.pk},
+            {"action": "update", "id": price.pk, "name": "cost", "allow_null": True},
+        ]:
+            response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("used by computed fields", response.json()["non_field_errors"][0])
+
+        half = dynamic_model.fields.get(name="half")
+        data = {"action": "update", "id": half.pk, "allow_null": True, "expression": "price"}
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = {"action": "update", "id": half.pk, "name": "ratio", "allow_null": True, "indexed": True}
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = {"action": "delete", "id": half.pk}
+        response = self.client.put(url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ratio", self.client.get(reverse("api:table-rows", (dynamic_model.pk,))).json()[0])
+
+    def test_invalid_computed_fields(self):
+        base = [{"name": "price", "type": "number"}, {"name": "code", "type": "string"}]
+        for field, error in [
+            ({"type": "number", "expression": "price +"}, "Invalid syntax"),
+            ({"type": "number", "expression": "price + code"}, "+ expects number operands, got string"),
+            ({"type": "string", "expression": "price * 2"}, "gives number values, not string"),
+            ({"type": "number", "expression": "missing * 2"}, "missing is not a field of this model"),
+            ({"type": "number", "expression": "__import__('os')"}, "Unsupported function"),
+            ({"type": "number", "expression": "price ** 2"}, "Unsupported operator"),
+            ({"type": "number", "expression": "price", "allow_null": False}, "must allow null"),
+            ({"type": "string", "expression": "code", "search": "fulltext"}, "cannot be searchable"),
+        ]:
+            with self.subTest(expression=field["expression"]):
+                response = self._create_table([*base, {"name": "computed", **field}])
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(error, response.json()["non_field_errors"][0])
+
+        response = self._create_table(
+            [*base, {"name": "computed", "type": "number", "expression": "price"}], storage_mode="jsonb"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upsert_skips_computed_fields(self):
+        fields = [
+            {"name": "code", "type": "string", "allow_null": False, "natural_key": True},
+            {"name": "price", "type": "number"},
+            {"name": "double", "type": "number", "expression": "price * 2"},
+        ]
+        dynamic_model = self.create_table({"name": "Orders", "fields": fields})
+        url = reverse("api:table-upsert", (dynamic_model.pk,))
+        rows = [{"code": "a", "price": 1, "double": 5}, {"code": "b", "price": 2}]
+        self.assertEqual(self.client.post(url, {"rows": rows}, format="json").status_code, status.HTTP_200_OK)
+        self.client.post(url, {"rows": [{"code": "a", "price": 4}]}, format="json")
+        rows = self.client.get(reverse("api:table-rows", (dynamic_model.pk,)), {"ordering": "code"}).json()
+        self.assertEqual([row["double"] for row in rows], [8, 4])
+        response = self.client.post(url, {"rows": [{"code": "a"}], "update": {"double": "keep"}}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering(self):
+        dynamic_model = self._create_orders()
+        url = reverse("api:table-rows", (dynamic_model.pk,))
+        for price, code in [(1, "b"), (2, "a"), (3, "b")]:
+            self.client.post(reverse("api:table-row", (dynamic_model.pk,)), {"price": price, "code": code})
+        rows = self.client.get(url, {"ordering": "code,-price", "limit": 2}).json()
+        self.assertEqual([row["price"] for row in rows], [2, 3])
+        for ordering in ["unknown", "_search_rank", ","]:
+            response = self.client.get(url, {"ordering": ordering})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ordering", response.json())
+
+    def test_compile_expression(self):
+        fields = {
+            "a": DynamicModelField(name="a", type="number"),
+            "s": DynamicModelField(name="s", type="string"),
+            "c": DynamicModelField(name="c", type="number", expression="a"),
+        }
+        self.assertEqual(compile_expression("abs(-a) + length(s)", fields)[1:], ("number", {"a", "s"}))
+        self.assertEqual(compile_expression("a > 1 or s != 'x'", fields)[1], "boolean")
+        self.assertEqual(compile_expression("concat(trim(s), lower(s))", fields)[1], "string")
+        for source in ["c + 1", "None", "round(a, 2)", "a.real", "[a]", "a if a else 1", "1 < s", "x" * 1001]:
+            with self.subTest(source=source[:20]):
+                with self.assertRaises(ExpressionError):
+                    compile_expression(source, fields)
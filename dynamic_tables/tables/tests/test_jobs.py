@@ -0,0 +1,117 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.jobs import claim_job, enqueue_job, run_job
+from tables.models import Job
+from tables.tests.mixins import DynamicTableMixin
+
+
+class JobsTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, name):
+        data = {
+            "name": name,
+            "fields": [
+                {"name": "field_1", "type": "string", "allow_null": False},
+                {"name": "field_2", "type": "number"},
+            ],
+        }
+        return self.create_table(data)
+
+    def _import(self, dynamic_model, rows):
+        return self.client.post(
+            reverse("api:table-import", (dynamic_model.pk,)),
+            data=json.dumps({"rows": rows}),
+            content_type="application/json",
+        )
+
+    @override_settings(TABLE_IMPORT_BATCH_SIZE=2)
+    def test_import_runs_in_background(self):
+        dynamic_model = self._create_table("Imported")
+        response = self._import(dynamic_model, [{"field_1": f"Test{i}", "field_2": i} for i in range(5)])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_url = reverse("api:job-detail", (response.json()["id"],))
+        self.assertTrue(response["Location"].endswith(job_url))
+        self.assertEqual(response.json()["status"], "pending")
+        self.assertEqual(len(self.client.get(reverse("api:table-rows", (dynamic_model.pk,))).json()), 0)
+
+        call_command("run_table_workers", burst=True)
+
+        job = self.client.get(job_url).json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual((job["processed"], job["total"]), (5, 5))
+        self.assertEqual(job["result"], {"imported": 5})
+        self.assertEqual(len(self.client.get(reverse("api:table-rows", (dynamic_model.pk,))).json()), 5)
+
+    def test_import_with_invalid_rows_fails(self):
+        dynamic_model = self._create_table("Imported")
+        response = self._import(dynamic_model, [{"field_1": "Test"}, {"field_2": "Test"}])
+        call_command("run_table_workers", burst=True)
+
+        job = self.client.get(reverse("api:job-detail", (response.json()["id"],))).json()
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "Rows are invalid, nothing was imported.")
+        self.assertEqual(list(job["result"]["rows"]), ["1"])
+        self.assertEqual(len(self.client.get(reverse("api:table-rows", (dynamic_model.pk,))).json()), 0)
+
+    def test_import_requires_rows(self):
+        dynamic_model = self._create_table("Imported")
+        response = self._import(dynamic_model, [])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_claim_respects_per_table_limit(self):
+        busy = self._create_table("Busy")
+        idle = self._create_table("Idle")
+        running = enqueue_job(busy, Job.JobKind.IMPORT, {"rows": []})
+        Job.objects.filter(pk=running.pk).update(status=Job.JobStatus.RUNNING)
+        enqueue_job(busy, Job.JobKind.IMPORT, {"rows": []})
+        idle_job = enqueue_job(idle, Job.JobKind.IMPORT, {"rows": []})
+
+        claimed = claim_job(per_table_limit=1)
+        self.assertEqual(claimed.pk, idle_job.pk)
+        self.assertEqual(claimed.status, Job.JobStatus.RUNNING)
+        self.assertIsNone(claim_job(per_table_limit=1))
+        self.assertIsNotNone(claim_job(per_table_limit=2))
+
+    @override_settings(TABLE_JOB_TIMEOUT=60)
+    def test_abandoned_jobs_are_failed(self):
+        dynamic_model = self._create_table("Busy")
+        abandoned = enqueue_job(dynamic_model, Job.JobKind.IMPORT, {"rows": []})
+        alive = enqueue_job(self._create_table("Other"), Job.JobKind.IMPORT, {"rows": []})
+        heartbeat_at = timezone.now() - timedelta(seconds=120)
+        Job.objects.filter(pk=abandoned.pk).update(status=Job.JobStatus.RUNNING, heartbeat_at=heartbeat_at)
+        Job.objects.filter(pk=alive.pk).update(status=Job.JobStatus.RUNNING, heartbeat_at=timezone.now())
+        pending = enqueue_job(dynamic_model, Job.JobKind.IMPORT, {"rows": []})
+
+        self.assertEqual(claim_job(per_table_limit=1).pk, pending.pk)
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, Job.JobStatus.FAILED)
+        self.assertEqual(abandoned.error, "Job was abandoned by its worker.")
+        self.assertIsNotNone(abandoned.finished_at)
+        alive.refresh_from_db()
+        self.assertEqual(alive.status, Job.JobStatus.RUNNING)
+
+    def test_claim_skips_tables_saturated_meanwhile(self):
+        busy = self._create_table("Busy")
+        running = enqueue_job(busy, Job.JobKind.IMPORT, {"rows": []})
+        Job.objects.filter(pk=running.pk).update(status=Job.JobStatus.RUNNING)
+        enqueue_job(busy, Job.JobKind.IMPORT, {"rows": []})
+        idle_job = enqueue_job(self._create_table("Idle"), Job.JobKind.IMPORT, {"rows": []})
+        # The running job of the busy table was claimed after the saturated tables were looked up.
+        with mock.patch("tables.jobs.saturated_tables", return_value=[]):
+            self.assertEqual(claim_job(per_table_limit=1).pk, idle_job.pk)
+
+    def test_abandoned_job_stays_failed(self):
+        job = enqueue_job(self._create_table("Imported"), Job.JobKind.IMPORT, {"rows": [{"field_1": "Test"}]})
+        job = claim_job(per_table_limit=1)
+        Job.objects.filter(pk=job.pk).update(status=Job.JobStatus.FAILED, error="Job was abandoned by its worker.")
+        job = run_job(job)
+        self.assertEqual(job.status, Job.JobStatus.FAILED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.JobStatus.FAILED, "Job was abandoned by its worker."))
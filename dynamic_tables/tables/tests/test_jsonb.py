@@ -0,0 +1,129 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.models import DynamicModel
+from tables.tests.mixins import DynamicTableMixin
+
+
+class JSONBStorageModeTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, name, storage_mode, **options):
+        data = {
+            "name": name,
+            "storage_mode": storage_mode,
+            "fields": [
+                {"name": "field_1", "type": "string", "allow_null": False},
+                {"name": "field_2", "type": "boolean"},
+                {"name": "field_3", "type": "number", "indexed": True},
+            ],
+            **options,
+        }
+        return self.create_table(data).pk
+
+    def _add_rows(self, pk):
+        for i in range(3):
+            response = self.client.post(
+                reverse("api:table-row", (pk,)), {"field_1": f"Test{i}", "field_2": i % 2 == 0, "field_3": i}
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Empty", "field_3": ""})
+
+    def _index_names(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_rows_match_columns_mode(self):
+        columns_pk = self._create_table("Columns", "columns")
+        jsonb_pk = self._create_table("Documents", "jsonb")
+        self._add_rows(columns_pk)
+        self._add_rows(jsonb_pk)
+
+        for params in [
+            {},
+            {"field_3__gte": 1},
+            {"field_2": "true"},
+            {"field_1__icontains": "test"},
+            {"field_3__isnull": "true"},
+        ]:
+            columns_rows = self.client.get(reverse("api:table-rows", (columns_pk,)), params).json()
+            jsonb_rows = self.client.get(reverse("api:table-rows", (jsonb_pk,)), params).json()
+            self.assertEqual(
+                sorted(columns_rows, key=lambda row: row["id"]), sorted(jsonb_rows, key=lambda row: row["id"])
+            )
+
+    def test_row_detail_matches_columns_mode(self):
+        results = {}
+        for name, storage_mode in [("Columns", "columns"), ("Document", "jsonb")]:
+            pk = self._create_table(name, storage_mode)
+            self._add_rows(pk)
+            url = reverse("api:table-row-detail", (pk, 2))
+            results[storage_mode] = [
+                self.client.patch(url, {"field_3": 10}, format="json").json(),
+                self.client.get(reverse("api:table-rows", (pk,)), {"ids": "3,2"}).json(),
+                self.client.delete(url).status_code,
+                self.client.get(url).status_code,
+            ]
+        self.assertEqual(results["jsonb"], results["columns"])
+        self.assertEqual(results["jsonb"][0], {"id": 2, "field_1": "Test1", "field_2": False, "field_3": 10.0})
+
+    def test_row_validation_matches_columns_mode(self):
+        pk = self._create_table("Documents", "jsonb")
+        response = self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_3": "Test"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["field_3"][0], "A valid number is required.")
+        response = self.client.post(reverse("api:table-row", (pk,)), {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["field_1"][0], "This field is required.")
+
+    def test_field_changes_do_not_alter_table(self):
+        pk = self._create_table("Documents", "jsonb")
+        self._add_rows(pk)
+        field_1 = DynamicModel.objects.get(pk=pk).fields.get(name="field_1")
+        field_2 = DynamicModel.objects.get(pk=pk).fields.get(name="field_2")
+        url = reverse("api:table-edit", (pk,))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.put(url, {"action": "create", "name": "field_4", "type": "string", "allow_null": True})
+            self.client.put(url, {"id": field_1.pk, "action": "update", "name": "renamed", "allow_null": True})
+            self.client.put(url, {"id": field_2.pk, "action": "delete"})
+        self.assertFalse(any("ALTER TABLE" in query["sql"] for query in queries.captured_queries))
+
+        rows = self.client.get(reverse("api:table-rows", (pk,))).json()
+        self.assertEqual(rows[0], {"id": rows[0]["id"], "renamed": "Test0", "field_3": 0.0, "field_4": None})
+
+    def test_typed_expression_index_is_used(self):
+        pk = self._create_table("Documents", "jsonb")
+        field_3 = DynamicModel.objects.get(pk=pk).fields.get(name="field_3")
+        index_name = f"tables_documents_{field_3.pk}_idx"
+        self.assertIn(index_name, self._index_names("tables_documents"))
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(
+                """EXPLAIN SELECT id FROM tables_documents WHERE ("_data" ->> %s)::double precision > 1""",
+                [field_3.storage_key],
+            )
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn(index_name, plan)
+
+        self.client.put(
+            reverse("api:table-edit", (pk,)),
+            {"id": field_3.pk, "action": "update", "indexed": False, "allow_null": True},
+        )
+        self.assertNotIn(index_name, self._index_names("tables_documents"))
+
+    def test_jsonb_partition_key_must_be_id(self):
+        data = {
+            "name": "Documents",
+            "storage_mode": "jsonb",
+            "fields": [{"name": "field_1", "type": "number", "allow_null": False}],
+            "partition_strategy": "hash",
+            "partition_key": "field_1",
+            "partition_count": 2,
+        }
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["non_field_errors"][0], "Only id can be the partition key in jsonb storage mode."
+        )
@@ -0,0 +1,82 @@
+import json
+
+from django.core.cache import cache
+from django.urls import reverse as django_reverse
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.tests.mixins import DynamicTableMixin
+
+
+class OpenAPITestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        data = {
+            "name": "Products",
+            "fields": [
+                {"name": "code", "type": "string", "allow_null": False, "natural_key": True},
+                {"name": "price", "type": "number"},
+                {"name": "available", "type": "boolean"},
+                {"name": "gross", "type": "number", "expression": "price * 1.2"},
+            ],
+        }
+        self.dynamic_model = self.create_table(data)
+        self.url = reverse("api:table-schema", (self.dynamic_model.pk,))
+
+    def test_table_schema(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        document = response.json()
+        self.assertEqual(document["swagger"], "2.0")
+        self.assertEqual(document["info"]["version"], "v1")
+        row = document["definitions"]["ProductsRow"]["properties"]
+        self.assertEqual(row["price"], {"type": "number", "x-nullable": True})
+        self.assertEqual(row["available"]["type"], "boolean")
+        self.assertTrue(row["gross"]["readOnly"])
+        row_input = document["definitions"]["ProductsRowInput"]
+        self.assertEqual(row_input["required"], ["code"])
+        self.assertNotIn("gross", row_input["properties"])
+        self.assertNotIn("required", document["definitions"]["ProductsRowPatch"])
+
+        pk = self.dynamic_model.pk
+        paths = document["paths"]
+        self.assertEqual(
+            set(paths),
+            {
+                f"/api/table/{pk}/rows/",
+                f"/api/table/{pk}/rows/lookup/",
+                f"/api/table/{pk}/row/",
+                f"/api/table/{pk}/row/{{row_id}}/",
+                f"/api/table/{pk}/upsert/",
+            },
+        )
+        parameters = [parameter["name"] for parameter in paths[f"/api/table/{pk}/rows/"]["get"]["parameters"]]
+        self.assertIn("price", parameters)
+        self.assertNotIn("search", parameters)
+        body = paths[f"/api/table/{pk}/row/"]["post"]["parameters"][0]
+        self.assertEqual(body["schema"], {"$ref": "#/definitions/ProductsRowInput"})
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"1-'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        data = {"action": "create", "name": "stock", "type": "number", "allow_null": True}
+        self.client.put(
+            reverse("api:table-edit", (self.dynamic_model.pk,)), data=json.dumps(data), content_type="application/json"
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("stock", response.json()["definitions"]["ProductsRow"]["properties"])
+
+    def test_api_schema_is_cached(self):
+        url = django_reverse("schema-json", kwargs={"format": ".json"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("max-age=", response["Cache-Control"])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,154 @@
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.models import DynamicModel
+from tables.tests.mixins import DynamicTableMixin
+
+
+class PartitioningTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, **options):
+        data = {
+            "name": "Partitioned",
+            "fields": [
+                {"name": "field_1", "type": "string"},
+                {"name": "field_2", "type": "number", "allow_null": False},
+            ],
+            **options,
+        }
+        return self.post_table(data)
+
+    def _partition_names(self, pk):
+        response = self.client.get(reverse("api:table-partitions", (pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [partition["name"] for partition in response.json()]
+
+    def test_create_range_partitioned_by_id(self):
+        response = self._create_table(partition_strategy="range", partition_key="id", partition_interval=10)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        names = self._partition_names(response.json()["id"])
+        self.assertEqual(len(names), 6)
+        self.assertIn("tables_partitioned_p0", names)
+        self.assertIn("tables_partitioned_p4", names)
+        self.assertIn("tables_partitioned_default", names)
+
+    def test_rows_are_routed_and_pruned(self):
+        pk = self._create_table(partition_strategy="range", partition_key="field_2", partition_interval=10).json()["id"]
+        for value in [1, 15, 25]:
+            response = self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_2": value})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(reverse("api:table-rows", (pk,)), {"field_2__gte": 10, "field_2__lt": 20})
+        self.assertEqual([row["field_2"] for row in response.json()], [15.0])
+
+        Partitioned = apps.get_model("tables", "Partitioned")
+        plan = Partitioned.objects.filter(field_2__gte=10, field_2__lt=20).explain()
+        self.assertIn("tables_partitioned_p1", plan)
+        self.assertNotIn("tables_partitioned_p0", plan)
+        self.assertNotIn("tables_partitioned_p2", plan)
+
+    def test_create_hash_partitioned(self):
+        response = self._create_table(partition_strategy="hash", partition_key="field_2", partition_count=4)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pk = response.json()["id"]
+        self.assertEqual(len(self._partition_names(pk)), 4)
+        response = self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_2": 3})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.client.get(reverse("api:table-rows", (pk,))).json()), 1)
+
+    def test_partition_key_validation(self):
+        cases = [
+            (
+                {"partition_strategy": "range", "partition_interval": 10},
+                "Partition key is required for partitioned tables.",
+            ),
+            ({"partition_key": "id"}, "Partition options require a partition strategy."),
+            (
+                {"partition_strategy": "range", "partition_key": "missing", "partition_interval": 10},
+                "Partition key must be id or one of the table fields.",
+            ),
+            (
+                {"partition_strategy": "hash", "partition_key": "field_1", "partition_count": 2},
+                "Partition key field cannot allow null.",
+            ),
+            (
+                {"partition_strategy": "range", "partition_key": "id"},
+                "Partition interval is required for range partitioning.",
+            ),
+            (
+                {"partition_strategy": "hash", "partition_key": "id"},
+                "Partition count is required for hash partitioning.",
+            ),
+        ]
+        for options, message in cases:
+            response = self._create_table(**options)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json()["non_field_errors"][0], message)
+
+    def test_partition_key_field_cannot_be_modified(self):
+        pk = self._create_table(partition_strategy="range", partition_key="field_2", partition_interval=10).json()["id"]
+        field = DynamicModel.objects.get(pk=pk).fields.get(name="field_2")
+        response = self.client.put(reverse("api:table-edit", (pk,)), {"id": field.pk, "action": "delete"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["non_field_errors"][0], "Partition key field cannot be modified.")
+
+    def test_detach_and_drop_partitions(self):
+        pk = self._create_table(partition_strategy="range", partition_key="id", partition_interval=10).json()["id"]
+        url = reverse("api:table-partitions", (pk,))
+        response = self.client.post(url, {"action": "detach", "name": "tables_partitioned_p0"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("tables_partitioned_p0", [partition["name"] for partition in response.json()])
+        response = self.client.post(url, {"action": "drop", "name": "tables_partitioned_p1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("tables_partitioned_p1", [partition["name"] for partition in response.json()])
+
+        response = self.client.post(url, {"action": "drop", "name": "tables_partitioned_default"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["name"][0], "Partition with this name does not exist for this model.")
+
+    def test_maintain_partitions_creates_partitions_ahead(self):
+        pk = self._create_table(partition_strategy="range", partition_key="field_2", partition_interval=10).json()["id"]
+        self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_2": 42})
+        out = StringIO()
+        call_command("maintain_partitions", stdout=out)
+        self.assertIn("tables_partitioned_p8", out.getvalue())
+        self.assertIn("tables_partitioned_p8", self._partition_names(pk))
+
+    def test_maintain_partitions_moves_rows_out_of_default(self):
+        pk = self._create_table(partition_strategy="range", partition_key="field_2", partition_interval=10).json()["id"]
+        for value in [42, 75, 123, 128]:
+            self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_2": value})
+        call_command("maintain_partitions", "--ahead", "1", stdout=StringIO())
+        self.assertIn("tables_partitioned_p13", self._partition_names(pk))
+
+        Partitioned = apps.get_model("tables", "Partitioned")
+        self.assertEqual(Partitioned.objects.count(), 4)
+        self.assertEqual(Partitioned.objects.filter(field_2__gte=120, field_2__lt=130).count(), 2)
+        self.assertNotIn("tables_partitioned_default", Partitioned.objects.filter(field_2=123).explain())
+        self.assertIn("tables_partitioned_default", Partitioned.objects.filter(field_2=75).explain())
+        response = self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test", "field_2": 125})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_maintain_partitions_moves_rows_with_generated_columns(self):
+        fields = [
+            {"name": "field_1", "type": "string", "search": "fulltext"},
+            {"name": "field_2", "type": "number", "allow_null": False},
+            {"name": "double", "type": "number", "expression": "field_2 * 2"},
+        ]
+        pk = self._create_table(
+            fields=fields, partition_strategy="range", partition_key="field_2", partition_interval=10
+        ).json()["id"]
+        for value in [42, 123]:
+            self.client.post(reverse("api:table-row", (pk,)), {"field_1": f"Quick fox {value}", "field_2": value})
+        call_command("maintain_partitions", "--ahead", "1", stdout=StringIO())
+        self.assertIn("tables_partitioned_p12", self._partition_names(pk))
+
+        response = self.client.get(reverse("api:table-rows", (pk,)), {"search": "fox", "field_2": 123})
+        self.assertEqual([(row["field_2"], row["double"]) for row in response.json()], [(123.0, 246.0)])
+
+    def test_partitions_of_regular_table(self):
+        pk = self._create_table().json()["id"]
+        response = self.client.get(reverse("api:table-partitions", (pk,)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
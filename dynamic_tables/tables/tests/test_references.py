@@ -0,0 +1,147 @@
+import json
+
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables import helpers
+from tables.tests.mixins import DynamicTableMixin
+
+
+class ReferenceTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        self.customers = self.create_table(
+            {"name": "Customers", "fields": [{"name": "name", "type": "string", "allow_null": False}]}
+        )
+        self.orders = self.create_table(
+            {
+                "name": "Orders",
+                "fields": [
+                    {"name": "total", "type": "number"},
+                    {"name": "customer", "type": "reference", "target": self.customers.pk},
+                ],
+            }
+        )
+        self.customer_ids = [self._create_row(self.customers, {"name": name})["id"] for name in ("Ann", "Bob")]
+
+    def _create_row(self, dynamic_model, data):
+        return self.client.post(
+            reverse("api:table-row", (dynamic_model.pk,)), data=json.dumps(data), content_type="application/json"
+        ).json()
+
+    def test_foreign_key(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "tables_orders")
+        foreign_keys = [c for c in constraints.values() if c["foreign_key"]]
+        self.assertEqual([c["foreign_key"] for c in foreign_keys], [("tables_customers", "id")])
+        self.assertTrue(any(c["index"] and c["columns"] == ["customer_id"] for c in constraints.values()))
+
+    def test_expand(self):
+        ann, bob = self.customer_ids
+        for index in range(6):
+            self._create_row(self.orders, {"total": index, "customer": [ann, bob, None][index % 3]})
+        url = reverse("api:table-rows", (self.orders.pk,))
+        self.assertEqual(self.client.get(url).json()[0]["customer"], ann)
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get(url, {"expand": "customer", "ordering": "total"}).json()
+        self.assertEqual(rows[0]["customer"], {"id": ann, "name": "Ann"})
+        self.assertEqual(rows[1]["customer"], {"id": bob, "name": "Bob"})
+        self.assertIsNone(rows[2]["customer"])
+        self.assertEqual(len([query for query in queries if '"tables_customers"' in query["sql"]]), 1)
+
+        response = self.client.get(url, {"expand": "customer", "ids": rows[1]["id"], "format": "columnar"})
+        self.assertEqual(response.json()["data"]["customer"], [{"id": bob, "name": "Bob"}])
+        response = self.client.get(url, {"customer": bob})
+        self.assertEqual([row["total"] for row in response.json()], [1, 4])
+        self.assertEqual(self.client.get(url, {"expand": "total"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_references(self):
+        response = self._create_row(self.orders, {"total": 1, "customer": 999})
+        self.assertEqual(response, {"customer": ["No row with id 999 in Customers."]})
+        ann, _ = self.customer_ids
+        row = self._create_row(self.orders, {"total": 1, "customer": ann})
+        url = reverse("api:table-row-detail", (self.orders.pk, row["id"]))
+        response = self.client.patch(url, data={"customer": 999}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.delete(reverse("api:table-row-detail", (self.customers.pk, ann)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.delete(url)
+        response = self.client.delete(reverse("api:table-row-detail", (self.customers.pk, ann)))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_upsert(self):
+        data = {
+            "name": "Invoices",
+            "fields": [
+                {"name": "number", "type": "string", "allow_null": False, "natural_key": True},
+                {"name": "customer", "type": "reference", "target": self.customers.pk},
+            ],
+        }
+        invoices = self.create_table(data)
+        url = reverse("api:table-upsert", (invoices.pk,))
+        ann, bob = self.customer_ids
+        rows = [{"number": "1", "customer": ann}, {"number": "2", "customer": 999}]
+        response = self.client.post(url, data={"rows": rows}, format="json")
+        self.assertEqual(response.json(), {"rows": {"1": {"customer": ["No row with id 999 in Customers."]}}})
+        rows[1]["customer"] = bob
+        self.assertEqual(
+            self.client.post(url, data={"rows": rows}, format="json").json(), {"inserted": 2, "updated": 0}
+        )
+        rows = self.client.get(reverse("api:table-rows", (invoices.pk,)), {"ordering": "number"}).json()
+        self.assertEqual([row["customer"] for row in rows], [ann, bob])
+
+    def test_cycle(self):
+        data = {"action": "create", "name": "last_order", "type": "reference", "target": self.orders.pk}
+        data["allow_null"] = True
+        response = self.client.put(
+            reverse("api:table-edit", (self.customers.pk,)), data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        ann, _ = self.customer_ids
+        order = self._create_row(self.orders, {"total": 5, "customer": ann})
+        url = reverse("api:table-row-detail", (self.customers.pk, ann))
+        self.client.patch(url, data={"last_order": order["id"]}, format="json")
+
+        # A fresh process builds the models in whatever order they are first used.
+        for name in ("orders", "customers"):
+            del apps.all_models["tables"][name]
+        apps.clear_cache()
+        helpers._dynamic_tables.clear()
+        url = reverse("api:table-rows", (self.orders.pk,))
+        rows = self.client.get(url, {"expand": "customer"}).json()
+        self.assertEqual(rows[0]["customer"], {"id": ann, "name": "Ann", "last_order": order["id"]})
+        url = reverse("api:table-rows", (self.customers.pk,))
+        rows = self.client.get(url, {"expand": "last_order", "ordering": "name"}).json()
+        self.assertEqual(rows[0]["last_order"], {"id": order["id"], "total": 5, "customer": ann})
+
+    def test_invalid_references(self):
+        for field, error in [
+            ({"name": "customer", "type": "reference"}, "Reference fields require a target table."),
+            ({"name": "customer", "type": "number", "target": self.customers.pk}, "Only reference fields"),
+            (
+                {"name": "customer", "type": "reference", "target": self.customers.pk, "expression": "1"},
+                "Reference fields cannot be computed.",
+            ),
+        ]:
+            with self.subTest(field=field):
+                data = {"name": "Invalid", "fields": [field]}
+                response = self.post_table(data)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(error, json.dumps(response.json()))
+
+        data = {
+            "name": "Documents",
+            "storage_mode": "jsonb",
+            "fields": [{"name": "customer", "type": "reference", "target": self.customers.pk}],
+        }
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = {"name": "score", "type": "number", "expression": "customer * 2", "action": "create", "allow_null": True}
+        response = self.client.put(
+            reverse("api:table-edit", (self.orders.pk,)), data=json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
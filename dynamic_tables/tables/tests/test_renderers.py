@@ -0,0 +1,60 @@
+import json
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables import renderers
+from tables.renderers import ColumnarJSONRenderer, TabularRows, to_columns
+from tables.tests.mixins import DynamicTableMixin
+
+
+class RenderersTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, name, storage_mode):
+        data = {
+            "name": name,
+            "storage_mode": storage_mode,
+            "fields": [
+                {"name": "field_1", "type": "string"},
+                {"name": "field_2", "type": "boolean"},
+                {"name": "field_3", "type": "number"},
+            ],
+        }
+        pk = self.post_table(data).json()["id"]
+        for i in range(3):
+            self.client.post(reverse("api:table-row", (pk,)), {"field_1": f"Test{i}", "field_2": i == 0, "field_3": i})
+        self.client.post(reverse("api:table-row", (pk,)), {})
+        return pk
+
+    def test_formats_match_rows(self):
+        for name, storage_mode in [("Columns", "columns"), ("Document", "jsonb")]:
+            with self.subTest(storage_mode=storage_mode):
+                url = reverse("api:table-rows", (self._create_table(name, storage_mode),))
+                rows = self.client.get(url, {"limit": 3, "offset": 1}).json()
+                self.assertEqual(len(rows), 3)
+
+                response = self.client.get(url, {"limit": 3, "offset": 1}, HTTP_ACCEPT=ColumnarJSONRenderer.media_type)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response["Content-Type"], ColumnarJSONRenderer.media_type)
+                columnar = json.loads(response.content)
+                self.assertEqual(columnar["columns"], ["id", "field_1", "field_2", "field_3"])
+                self.assertEqual([dict(zip(columnar["columns"], row)) for row in zip(*columnar["data"].values())], rows)
+
+                ids = f"{rows[1]['id']},{rows[0]['id']}"
+                response = self.client.get(url, {"ids": ids, "format": "columnar"})
+                self.assertEqual(json.loads(response.content)["data"]["id"], [rows[1]["id"], rows[0]["id"]])
+
+                if renderers.msgpack is None:
+                    continue
+                response = self.client.get(url, {"limit": 3, "offset": 1}, HTTP_ACCEPT="application/msgpack")
+                self.assertEqual(renderers.msgpack.unpackb(response.content), columnar)
+
+    def test_errors_in_negotiated_format(self):
+        url = reverse("api:table-rows", (self._create_table("Columns", "columns"),))
+        response = self.client.get(url, {"field_3__gt": "x", "format": "columnar"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Invalid filter value", json.loads(response.content)[0])
+
+    def test_empty_rows(self):
+        self.assertEqual(
+            to_columns(TabularRows(["id", "a"], [])), {"columns": ["id", "a"], "data": {"id": [], "a": []}}
+        )
@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, APITransactionTestCase
+from tables import replicas
+from tables.cache import rows_cache
+from tables.models import DynamicModel
+from tables.replicas import ReplicaRouter, choose_replica
+from tables.tests.mixins import DynamicTableMixin
+
+
+@override_settings(TABLE_DATABASE_REPLICAS=["replica_a", "replica_b"], TABLE_REPLICA_MAX_LAG=5)
+class ChooseReplicaTestCase(TestCase):
+    def setUp(self):
+        replicas._replica_health.clear()
+
+    def test_lowest_lag_within_limit(self):
+        with mock.patch("tables.replicas.replica_lag", side_effect={"replica_a": 3.0, "replica_b": 1.0}.get):
+            self.assertEqual(choose_replica(), "replica_b")
+        replicas._replica_health.clear()
+        with mock.patch("tables.replicas.replica_lag", side_effect={"replica_a": 3.0, "replica_b": 9.0}.get):
+            self.assertEqual(choose_replica(), "replica_a")
+        replicas._replica_health.clear()
+        with mock.patch("tables.replicas.replica_lag", side_effect={"replica_a": None, "replica_b": 9.0}.get):
+            self.assertIsNone(choose_replica())
+
+    @override_settings(TABLE_REPLICA_HEALTH_INTERVAL=60)
+    def test_health_is_cached(self):
+        with mock.patch("tables.replicas.replica_lag", return_value=0.0) as replica_lag:
+            choose_replica()
+            choose_replica()
+        self.assertEqual(replica_lag.call_count, 2)
+
+    def test_router_sends_writes_to_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_write(DynamicModel), "default")
+        self.assertEqual(router.db_for_read(DynamicModel), "default")
+        self.assertFalse(router.allow_migrate("replica_a", "tables"))
+        self.assertIsNone(router.allow_migrate("default", "tables"))
+
+
+@override_settings(TABLE_DATABASE_REPLICAS=["replica_a"])
+class ReplicaRoutingMiddlewareTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        data = {"name": "Replicated", "fields": [{"name": "field_1", "type": "string"}]}
+        self.pk = self.post_table(data).json()["id"]
+        self.client.cookies.clear()
+
+    def test_reads_go_to_replica(self):
+        with mock.patch("tables.replicas.choose_replica", return_value="default") as choose:
+            response = self.client.get(reverse("api:table-rows", (self.pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(choose.called)
+
+    def test_writes_pin_client_to_primary(self):
+        with mock.patch("tables.replicas.choose_replica", return_value="default") as choose:
+            response = self.client.post(reverse("api:table-row", (self.pk,)), {"field_1": "Test"})
+            self.assertEqual(response.cookies[settings.TABLE_REPLICA_STICKY_COOKIE]["max-age"], 10)
+            self.client.get(reverse("api:table-rows", (self.pk,)))
+            self.client.get(reverse("api:table-changes", (self.pk,)))
+        self.assertFalse(choose.called)
+
+    def test_lookups_do_not_pin_client(self):
+        with mock.patch("tables.replicas.choose_replica", return_value="default") as choose:
+            response = self.client.post(reverse("api:table-lookup", (self.pk,)), {"ids": [1]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(settings.TABLE_REPLICA_STICKY_COOKIE, response.cookies)
+        self.assertTrue(choose.called)
+
+    def test_unmarked_reads_stay_on_primary(self):
+        with mock.patch("tables.replicas.choose_replica", return_value="default") as choose:
+            self.client.get(reverse("api:table-partitions", (self.pk,)))
+        self.assertFalse(choose.called)
+
+
+@override_settings(TABLE_DATABASE_REPLICAS=["replica_a"], ROWS_CACHE_ENABLED=True)
+class ReplicaRowsCacheTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        rows_cache().clear()
+        data = {"name": "Replicated", "cache_rows": True, "fields": [{"name": "field_1", "type": "string"}]}
+        self.pk = self.post_table(data).json()["id"]
+        self.client.cookies.clear()
+
+    def _get_rows(self):
+        with mock.patch("tables.replicas.choose_replica", return_value="default"):
+            return self.client.get(reverse("api:table-rows", (self.pk,)))
+
+    def _cache_metrics(self):
+        return self.client.get(reverse("api:table-metrics", (self.pk,))).json()
+
+    def test_replica_reads_are_not_cached(self):
+        self._get_rows()
+        self._get_rows()
+        self.assertEqual(self._cache_metrics()["rows_cache_misses"], 2)
+        self.assertEqual(self._cache_metrics()["rows_cache_hits"], 0)
+
+    def test_pinned_clients_bypass_cache(self):
+        with override_settings(TABLE_DATABASE_REPLICAS=[]):
+            self.assertEqual(self.client.get(reverse("api:table-rows", (self.pk,))).json(), [])
+        # Not invalidated, as if the cached entry had been read from a lagging replica.
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO tables_replicated (field_1) VALUES ('Test')")
+        self.client.cookies[settings.TABLE_REPLICA_STICKY_COOKIE] = "1"
+        self.assertEqual(len(self._get_rows().json()), 1)
+        self.assertEqual(self._cache_metrics()["rows_cache_hits"], 0)
+
+
+class ReplicaAliasTestCase(DynamicTableMixin, APITransactionTestCase):
+    # Replicas mirror the test database through their own connection, so the rows have to be committed.
+    databases = "__all__"
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS tables_replicated")
+
+    def test_rows_from_configured_replica(self):
+        if not settings.TABLE_DATABASE_REPLICAS:
+            self.skipTest("No replica is configured")
+        data = {"name": "Replicated", "fields": [{"name": "field_1", "type": "string"}]}
+        pk = self.post_table(data).json()["id"]
+        self.client.post(reverse("api:table-row", (pk,)), {"field_1": "Test"})
+        self.client.cookies.clear()
+        replicas._replica_health.clear()
+        with CaptureQueriesContext(connections[settings.TABLE_DATABASE_REPLICAS[0]]) as queries:
+            response = self.client.get(reverse("api:table-rows", (pk,)))
+        self.assertEqual([row["field_1"] for row in response.json()], ["Test"])
+        self.assertTrue(any('FROM "tables_replicated"' in query["sql"] for query in queries.captured_queries))
@@ -0,0 +1,142 @@
+import json
+
+from django.core.management import call_command
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.tests.mixins import DynamicTableMixin
+
+
+class RollupTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        data = {
+            "name": "Sales",
+            "fields": [
+                {"name": "region", "type": "string"},
+                {"name": "amount", "type": "number"},
+            ],
+        }
+        self.dynamic_model = self.create_table(data)
+        for region, amount in [("north", 1), ("north", 4), ("south", 10), (None, 7)]:
+            self._create_row({"region": region, "amount": amount})
+        data = {
+            "name": "ByRegion",
+            "group_by": ["region"],
+            "metrics": ["count", "sum:amount", "min:amount", "max:amount"],
+        }
+        self.response = self.client.post(self._url("table-rollups"), data=data, format="json")
+        self.url = reverse("api:table-rollup-detail", (self.dynamic_model.pk, "ByRegion"))
+
+    def _url(self, name):
+        return reverse(f"api:{name}", (self.dynamic_model.pk,))
+
+    def _create_row(self, data):
+        return self.client.post(self._url("table-row"), data=data, format="json").json()
+
+    def _aggregate(self):
+        params = {"group_by": "region", "metrics": "count,sum:amount,min:amount,max:amount"}
+        groups = self.client.get(self._url("table-aggregate"), params).json()
+        return sorted(groups, key=lambda group: (group["region"] is None, group["region"] or ""))
+
+    def test_create_and_read(self):
+        self.assertEqual(self.response.status_code, status.HTTP_201_CREATED, self.response.json())
+        self.assertEqual(self.response.json()["group_by"], ["region"])
+        self.assertEqual(self.response.json()["metrics"], ["count", "sum:amount", "min:amount", "max:amount"])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["groups"], self._aggregate())
+        self.assertEqual(response.json()["lag_seconds"], 0)
+        self.assertEqual(
+            [rollup["name"] for rollup in self.client.get(self._url("table-rollups")).json()], ["ByRegion"]
+        )
+
+    def test_refresh(self):
+        rows = self.client.get(self._url("table-rows"), {"ordering": "amount"}).json()
+        self._create_row({"region": "south", "amount": 2})
+        self._create_row({"region": "east", "amount": 3})
+        # Remove the minimum of north and move the maximum of south to another group.
+        self.client.delete(reverse("api:table-row-detail", (self.dynamic_model.pk, rows[0]["id"])))
+        self.client.patch(
+            reverse("api:table-row-detail", (self.dynamic_model.pk, rows[3]["id"])), {"region": "east"}, format="json"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE tables_sales SET amount = amount + 1 WHERE region = 'south'")
+
+        response = self.client.get(self.url).json()
+        self.assertEqual(len(response["groups"]), 3)
+        self.assertGreater(response["lag_seconds"], 0)
+        call_command("refresh_rollups", "--once")
+        response = self.client.get(self.url).json()
+        self.assertEqual(response["groups"], self._aggregate())
+        self.assertEqual(response["lag_seconds"], 0)
+
+        self.client.delete(reverse("api:table-row-detail", (self.dynamic_model.pk, rows[1]["id"])))
+        response = self.client.get(self.url, {"max_lag": 0}).json()
+        self.assertEqual(response["groups"], self._aggregate())
+        self.assertNotIn("north", [group["region"] for group in response["groups"]])
+
+    def test_schema_changes(self):
+        field = self.dynamic_model.fields.get(name="region")
+        edit_url = reverse("api:table-edit", (self.dynamic_model.pk,))
+        data = {"action": "update", "id": field.pk, "name": "area", "allow_null": True}
+        response = self.client.put(edit_url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        self._create_row({"area": "north", "amount": 5})
+        response = self.client.get(self.url, {"max_lag": 0}).json()
+        self.assertIn(
+            {"area": "north", "count": 3, "sum_amount": 10, "min_amount": 1, "max_amount": 5}, response["groups"]
+        )
+        self.assertEqual(self.client.get(self._url("table-rollups")).json()[0]["group_by"], ["area"])
+
+        data = {"action": "delete", "id": field.pk}
+        response = self.client.put(edit_url, data=json.dumps(data), content_type="application/json")
+        self.assertIn("Field is used by rollups ByRegion", json.dumps(response.json()))
+        self.assertEqual(self.client.delete(self.url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("tables_sales_rollup", " ".join(connection.introspection.table_names()))
+        response = self.client.put(edit_url, data=json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_rollups(self):
+        for data in [
+            {"name": "ByRegion", "group_by": ["region"], "metrics": ["count"]},
+            {"name": "Other", "group_by": ["missing"], "metrics": ["count"]},
+            {"name": "Other", "group_by": [], "metrics": ["count"]},
+            {"name": "Other", "group_by": ["region"], "metrics": ["sum:region"]},
+            {"name": "Other", "group_by": ["region"], "metrics": ["avg:amount"]},
+            {"name": "Other", "group_by": ["region"], "metrics": ["count", "count"]},
+        ]:
+            with self.subTest(data=data):
+                response = self.client.post(self._url("table-rollups"), data=data, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detached_partitions(self):
+        data = {
+            "name": "PartitionedSales",
+            "fields": [{"name": "region", "type": "string"}, {"name": "amount", "type": "number", "allow_null": False}],
+            "partition_strategy": "range",
+            "partition_key": "amount",
+            "partition_interval": 10,
+        }
+        self.dynamic_model = self.create_table(data)
+        for region, amount in [("north", 1), ("north", 14), ("south", 5), ("south", 12), ("south", 25)]:
+            self._create_row({"region": region, "amount": amount})
+        data = {"name": "ByRegion", "group_by": ["region"], "metrics": ["count", "sum:amount", "max:amount"]}
+        response = self.client.post(self._url("table-rollups"), data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, "tables_partitionedsales")
+        self.assertIn(["region"], [index["columns"] for index in indexes.values()])
+
+        url = reverse("api:table-partitions", (self.dynamic_model.pk,))
+        self.client.post(url, {"action": "detach", "name": "tables_partitionedsales_p1"})
+        self.client.post(url, {"action": "drop", "name": "tables_partitionedsales_p2"})
+        url = reverse("api:table-rollup-detail", (self.dynamic_model.pk, "ByRegion"))
+        self.assertEqual(
+            self.client.get(url, {"max_lag": 0}).json()["groups"],
+            [
+                {"region": "north", "count": 1, "sum_amount": 1, "max_amount": 1},
+                {"region": "south", "count": 1, "sum_amount": 5, "max_amount": 5},
+            ],
+        )
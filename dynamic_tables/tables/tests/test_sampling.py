@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.cache import rows_cache
+from tables.tests.mixins import DynamicTableMixin
+
+
+@override_settings(TABLE_SAMPLE_MIN_ROWS=100)
+class SamplingTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        rows_cache().clear()
+
+    def _create_table(self, name, rows, **options):
+        data = {"name": name, "fields": [{"name": "value", "type": "number"}], **options}
+        dynamic_model = self.create_table(data)
+        with connection.cursor() as cursor:
+            table = f"tables_{name.lower()}"
+            cursor.execute(f"INSERT INTO {table} (value) SELECT i FROM generate_series(1, %s) AS i", [rows])
+            cursor.execute(f"ANALYZE {table}")
+        return reverse("api:table-rows", (dynamic_model.pk,))
+
+    def test_percent_sample(self):
+        url = self._create_table("Large", 5000)
+        rows = self.client.get(url, {"sample": "10%", "sample_method": "bernoulli", "seed": 7}).json()
+        self.assertTrue(300 < len(rows) < 700)
+        again = self.client.get(url, {"sample": "10%", "sample_method": "bernoulli", "seed": 7}).json()
+        self.assertEqual(rows, again)
+        other = self.client.get(url, {"sample": "10%", "sample_method": "bernoulli", "seed": 8}).json()
+        self.assertNotEqual(rows, other)
+
+        rows = self.client.get(url, {"sample": "20%", "seed": 1, "value__lte": 2500}).json()
+        self.assertTrue(all(row["value"] <= 2500 for row in rows))
+
+    def test_row_count_sample(self):
+        url = self._create_table("Large", 5000)
+        params = {"sample": "200", "sample_method": "bernoulli", "seed": 3, "ordering": "-value"}
+        rows = self.client.get(url, params).json()
+        self.assertTrue(100 < len(rows) <= 200)
+        self.assertEqual([row["value"] for row in rows], sorted((row["value"] for row in rows), reverse=True))
+        self.assertNotEqual(rows[-1]["value"], 5000 - len(rows) + 1)
+        self.assertEqual(
+            len(self.client.get(url, {"sample": "100", "sample_method": "bernoulli", "limit": 10}).json()), 10
+        )
+
+    def test_small_table_preview(self):
+        url = self._create_table("Small", 50)
+        rows = self.client.get(url, {"sample": "5"}).json()
+        self.assertEqual([row["value"] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(len(self.client.get(url, {"sample": "10%"}).json()), 5)
+
+    @override_settings(ROWS_CACHE_ENABLED=True)
+    def test_random_samples_are_not_cached(self):
+        url = self._create_table("Cached", 50, cache_rows=True)
+        self.client.cookies.clear()
+        self.client.get(url, {"sample": "5"})
+        self.assertNotIn("X-Cache", self.client.get(url, {"sample": "5"}))
+        self.client.get(url, {"sample": "5", "seed": 1})
+        self.assertEqual(self.client.get(url, {"sample": "5", "seed": 1})["X-Cache"], "HIT")
+
+    def test_invalid_samples(self):
+        url = self._create_table("Invalid", 10)
+        for params, error in [
+            ({"sample": "0%"}, "sample"),
+            ({"sample": "101%"}, "sample"),
+            ({"sample": "0"}, "sample"),
+            ({"sample": "1000001"}, "sample"),
+            ({"sample": "x"}, "sample"),
+            ({"sample": "5", "sample_method": "random"}, "sample_method"),
+            ({"sample": "5", "seed": "x"}, "seed"),
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(error, response.json())
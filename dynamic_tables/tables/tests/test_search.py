@@ -0,0 +1,143 @@
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.helpers import trigram_available
+from tables.models import DynamicModel
+from tables.tests.mixins import DynamicTableMixin
+
+TEXTS = [
+    "The quick brown fox",
+    "A lazy dog sleeps",
+    "Quick thinking and quick acting",
+    "Nothing to see here",
+]
+
+
+class SearchTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, storage_mode="columns", search="fulltext"):
+        data = {
+            "name": "Searched",
+            "storage_mode": storage_mode,
+            "fields": [
+                {"name": "title", "type": "string", "search": search},
+                {"name": "score", "type": "number"},
+            ],
+        }
+        pk = self.create_table(data).pk
+        for i, text in enumerate(TEXTS):
+            self.client.post(reverse("api:table-row", (pk,)), {"title": text, "score": i})
+        return pk
+
+    def _search(self, pk, **params):
+        return self.client.get(reverse("api:table-rows", (pk,)), params)
+
+    def _field(self, pk, name="title"):
+        return DynamicModel.objects.get(pk=pk).fields.get(name=name)
+
+    def _index_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'tables_searched'")
+            return {row[0] for row in cursor.fetchall()}
+
+    def _columns(self):
+        with connection.cursor() as cursor:
+            return {column.name for column in connection.introspection.get_table_description(cursor, "tables_searched")}
+
+    def test_fulltext_search_ranks_matches(self):
+        pk = self._create_table()
+        field = self._field(pk)
+        self.assertIn(f"_search_f{field.pk}", self._columns())
+        self.assertIn(f"tables_searched_{field.pk}_fts", self._index_names())
+
+        response = self._search(pk, search="quick")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["title"] for row in response.json()], [TEXTS[2], TEXTS[0]])
+        self.assertEqual(set(response.json()[0]), {"id", "title", "score"})
+
+        response = self._search(pk, search="quick -fox", score__gte="0")
+        self.assertEqual([row["title"] for row in response.json()], [TEXTS[2]])
+
+    def test_fulltext_search_in_jsonb_mode(self):
+        pk = self._create_table("jsonb")
+        response = self._search(pk, search="dog")
+        self.assertEqual([row["title"] for row in response.json()], [TEXTS[1]])
+
+    def test_search_requires_searchable_fields(self):
+        pk = self._create_table(search="none")
+        response = self._search(pk, search="quick")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["search"], "This table has no searchable fields.")
+
+    def test_rows_paging(self):
+        pk = self._create_table()
+        response = self._search(pk, limit="2", offset="1")
+        self.assertEqual([row["score"] for row in response.json()], [1, 2])
+        response = self._search(pk, search="quick", limit="1", offset="1")
+        self.assertEqual([row["title"] for row in response.json()], [TEXTS[0]])
+        response = self._search(pk, limit="0")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_edit_enables_and_disables_search(self):
+        pk = self._create_table(search="none")
+        field = self._field(pk)
+        data = {"id": field.pk, "action": "update", "allow_null": True, "search": "fulltext"}
+        response = self.client.put(reverse("api:table-edit", (pk,)), data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(f"tables_searched_{field.pk}_fts", self._index_names())
+        self.assertEqual(len(self._search(pk, search="dog").json()), 1)
+
+        data = {"id": field.pk, "action": "update", "name": "heading", "allow_null": True}
+        self.client.put(reverse("api:table-edit", (pk,)), data)
+        self.assertEqual(len(self._search(pk, search="dog").json()), 1)
+
+        data = {"id": field.pk, "action": "update", "allow_null": True, "search": "none"}
+        self.client.put(reverse("api:table-edit", (pk,)), data)
+        self.assertNotIn(f"_search_f{field.pk}", self._columns())
+        self.assertNotIn(f"tables_searched_{field.pk}_fts", self._index_names())
+
+    def test_delete_searchable_field(self):
+        for storage_mode in ["columns", "jsonb"]:
+            with self.subTest(storage_mode=storage_mode):
+                pk = self._create_table(storage_mode)
+                field = self._field(pk)
+                response = self.client.put(reverse("api:table-edit", (pk,)), {"id": field.pk, "action": "delete"})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn(f"_search_f{field.pk}", self._columns())
+                self.assertEqual(len(self._search(pk).json()), len(TEXTS))
+                DynamicModel.objects.filter(pk=pk).delete()
+                with connection.cursor() as cursor:
+                    cursor.execute("DROP TABLE tables_searched")
+
+    def test_search_only_for_string_fields(self):
+        data = {"name": "Searched", "fields": [{"name": "score", "type": "number", "search": "fulltext"}]}
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["fields"][0]["non_field_errors"][0], "Search is only available for string fields."
+        )
+
+    def test_trigram_requires_extension(self):
+        if trigram_available():
+            self.skipTest("pg_trgm is installed")
+        data = {"name": "Searched", "fields": [{"name": "title", "type": "string", "search": "trigram"}]}
+        response = self.post_table(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["fields"][0]["non_field_errors"][0], "Trigram search requires the pg_trgm extension."
+        )
+
+    def test_trigram_search(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        for storage_mode in ["columns", "jsonb"]:
+            with self.subTest(storage_mode=storage_mode):
+                pk = self._create_table(storage_mode, search="trigram")
+                self.assertIn(f"tables_searched_{self._field(pk).pk}_trgm", self._index_names())
+                response = self._search(pk, search="quik")
+                self.assertEqual([row["title"] for row in response.json()], [TEXTS[0], TEXTS[2]])
+                response = self._search(pk, title__icontains="LAZY")
+                self.assertEqual([row["title"] for row in response.json()], [TEXTS[1]])
+                DynamicModel.objects.filter(pk=pk).delete()
+                with connection.cursor() as cursor:
+                    cursor.execute("DROP TABLE tables_searched")
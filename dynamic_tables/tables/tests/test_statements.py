@@ -0,0 +1,43 @@
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.statements import configure_connection
+from tables.tests.mixins import DynamicTableMixin
+
+
+class PreparedStatementsTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        data = {"name": "Readings", "fields": [{"name": "value", "type": "number"}]}
+        self.dynamic_model = self.create_table(data)
+        response = self.client.post(reverse("api:table-row", (self.dynamic_model.pk,)), {"value": 1}, format="json")
+        self.url = reverse("api:table-row-detail", (self.dynamic_model.pk, response.json()["id"]))
+
+    def _prepared_statements(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT statement FROM pg_prepared_statements")
+            return [statement for statement, in cursor.fetchall() if '"tables_readings"' in statement]
+
+    def test_statements_are_prepared_and_dropped_on_edit(self):
+        self.assertEqual(connection.connection.prepared_max, 200)
+        for _ in range(connection.connection.prepare_threshold + 1):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self._prepared_statements())
+
+        data = {"action": "create", "name": "unit", "type": "string", "allow_null": True}
+        self.client.put(
+            reverse("api:table-edit", (self.dynamic_model.pk,)), data=json.dumps(data), content_type="application/json"
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"id": response.json()["id"], "value": 1, "unit": None})
+        self.assertEqual(self._prepared_statements(), [])
+
+    def test_psycopg_without_prepared_statement_cache_is_refused(self):
+        wrapper = SimpleNamespace(vendor="postgresql", connection=SimpleNamespace(prepared_max=100))
+        with self.assertRaises(ImproperlyConfigured):
+            configure_connection(None, wrapper)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.helpers import get_dynamic_table
+from tables.models import DynamicModel
+from tables.stats import table_name
+from tables.tests.mixins import DynamicTableMixin
+
+
+class StatsTestCase(DynamicTableMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _create_table(self, name, **options):
+        data = {
+            "name": name,
+            "fields": [
+                {"name": "code", "type": "string", "indexed": True},
+                {"name": "value", "type": "number", "allow_null": False},
+            ],
+            **options,
+        }
+        return self.post_table(data).json()["id"]
+
+    def _create_rows(self, pk, values):
+        for value in values:
+            self.client.post(reverse("api:table-row", (pk,)), {"code": "x" * 3000, "value": value}, format="json")
+
+    def test_table_stats(self):
+        pk = self._create_table("Measurements")
+        self._create_rows(pk, range(3))
+        self.client.get(reverse("api:table-rows", (pk,)))
+
+        response = self.client.get(reverse("api:table-stats", (pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.json()
+        self.assertEqual(stats["partitions"], 0)
+        self.assertGreater(stats["heap_bytes"], 0)
+        self.assertGreater(stats["index_bytes"], 0)
+        self.assertGreaterEqual(stats["total_bytes"], stats["heap_bytes"] + stats["index_bytes"])
+        self.assertEqual(stats["dead_ratio"], 0)
+        self.assertIsNone(stats["last_vacuum"])
+        indexes = {index["name"]: index for index in stats["indexes"]}
+        self.assertTrue(indexes["tables_measurements_pkey"]["primary"])
+        self.assertFalse(indexes["tables_measurements_pkey"]["unused"])
+        # The pattern ops index Django adds next to an indexed string field is never used by the row filters.
+        self.assertEqual(len(indexes), 3)
+        self.assertTrue(indexes["tables_measurements_code_60bcf20f_like"]["unused"])
+        self.assertEqual(stats["requests"], {"row": 3, "rows": 1, "stats": 1})
+        self.assertIn("rows_cache_hits", stats["metrics"])
+
+        # Statistics are cached, request counters are not.
+        self._create_rows(pk, range(3))
+        cached = self.client.get(reverse("api:table-stats", (pk,))).json()
+        self.assertEqual(cached["heap_bytes"], stats["heap_bytes"])
+        self.assertEqual(cached["requests"]["row"], 6)
+
+    def test_index_stats_before_postgres_16(self):
+        pk = self._create_table("Measurements")
+        connections["default"].ensure_connection()
+        with mock.patch.dict(connections["default"].__dict__, {"pg_version": 150000}):
+            response = self.client.get(reverse("api:table-stats", (pk,)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({index["last_scan"] for index in response.json()["indexes"]}, {None})
+
+    def test_partitioned_table_stats(self):
+        pk = self._create_table("Partitioned", partition_strategy="range", partition_key="value", partition_interval=10)
+        self._create_rows(pk, [1, 15, 25])
+        stats = self.client.get(reverse("api:table-stats", (pk,))).json()
+        self.assertEqual(stats["partitions"], 6)
+        self.assertGreater(stats["heap_bytes"], 0)
+        # Indexes of the partitions are reported as the index of the table they were created from.
+        self.assertEqual(len(stats["indexes"]), 3)
+        self.assertIn("tables_partitioned_pkey", [index["name"] for index in stats["indexes"]])
+
+    def test_all_stats(self):
+        small = self._create_table("Small")
+        large = self._create_table("Large")
+        self._create_rows(large, range(20))
+        response = self.client.get(reverse("api:table-all-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tables = response.json()
+        self.assertEqual([table["id"] for table in tables], [large, small])
+        for pk in (small, large):
+            dynamic_model = DynamicModel.objects.get(pk=pk)
+            self.assertEqual(table_name(dynamic_model), get_dynamic_table(dynamic_model).model._meta.db_table)
+        self.assertEqual(tables[0]["name"], "Large")
+        self.assertNotIn("indexes", tables[0])
+        self.assertGreater(tables[0]["total_bytes"], tables[1]["total_bytes"])
@@ -0,0 +1,123 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.models import DynamicModel
+from tables.tests.mixins import DynamicTableMixin
+
+
+class UpsertTestCase(DynamicTableMixin, APITestCase):
+    def _create_table(self, **options):
+        data = {
+            "name": "Synced",
+            "fields": [
+                {"name": "code", "type": "string", "allow_null": False, "natural_key": True},
+                {"name": "qty", "type": "number"},
+                {"name": "note", "type": "string"},
+            ],
+            **options,
+        }
+        return self.post_table(data)
+
+    def _upsert(self, pk, rows, update=None):
+        data = {"rows": rows, **({"update": update} if update else {})}
+        return self.client.post(
+            reverse("api:table-upsert", (pk,)), data=json.dumps(data), content_type="application/json"
+        )
+
+    def _rows(self, pk):
+        rows = self.client.get(reverse("api:table-rows", (pk,))).json()
+        return {row["code"]: (row["qty"], row["note"]) for row in rows}
+
+    def test_upsert_inserts_and_updates(self):
+        pk = self._create_table().json()["id"]
+        response = self._upsert(pk, [{"code": "a", "qty": 1, "note": "x"}, {"code": "b", "qty": 2, "note": "y"}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"inserted": 2, "updated": 0})
+
+        response = self._upsert(pk, [{"code": "b", "qty": 5, "note": "z"}, {"code": "c", "qty": 3, "note": None}])
+        self.assertEqual(response.json(), {"inserted": 1, "updated": 1})
+        self.assertEqual(self._rows(pk), {"a": (1, "x"), "b": (5, "z"), "c": (3, None)})
+
+    def test_upsert_update_rules(self):
+        pk = self._create_table().json()["id"]
+        self._upsert(pk, [{"code": "a", "qty": 1, "note": "x"}, {"code": "b", "qty": 2, "note": "y"}])
+        response = self._upsert(
+            pk, [{"code": "a", "qty": 7, "note": None}, {"code": "b", "note": "z"}], {"qty": "keep", "note": "coalesce"}
+        )
+        self.assertEqual(response.json(), {"inserted": 0, "updated": 2})
+        self.assertEqual(self._rows(pk), {"a": (1, "x"), "b": (2, "z")})
+
+        response = self._upsert(pk, [{"code": "a", "qty": 9}], {"qty": "keep", "note": "keep"})
+        self.assertEqual(response.json(), {"inserted": 0, "updated": 1})
+        self.assertEqual(self._rows(pk)["a"], (1, "x"))
+
+    @override_settings(TABLE_UPSERT_BATCH_SIZE=2)
+    def test_upsert_runs_one_statement_per_batch(self):
+        pk = self._create_table().json()["id"]
+        rows = [{"code": str(i), "qty": i} for i in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._upsert(pk, rows)
+        self.assertEqual(response.json(), {"inserted": 5, "updated": 0})
+        table_queries = [query["sql"] for query in queries.captured_queries if "tables_synced" in query["sql"]]
+        self.assertEqual(len(table_queries), 3)
+        self.assertTrue(all("ON CONFLICT" in sql for sql in table_queries))
+
+    def test_upsert_partitioned_table(self):
+        response = self._create_table(partition_strategy="hash", partition_key="code", partition_count=2)
+        pk = response.json()["id"]
+        self._upsert(pk, [{"code": "a", "qty": 1}, {"code": "b", "qty": 2}])
+        response = self._upsert(pk, [{"code": "a", "qty": 3}])
+        self.assertEqual(response.json(), {"inserted": 0, "updated": 1})
+        self.assertEqual(self._rows(pk), {"a": (3, None), "b": (2, None)})
+
+    def test_upsert_validation(self):
+        pk = self._create_table().json()["id"]
+        response = self._upsert(pk, [{"code": "a"}, {"code": "a"}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["rows"], "Rows contain duplicate natural keys.")
+        response = self._upsert(pk, [{"code": "a"}, {"qty": 1}])
+        self.assertEqual(list(response.json()["rows"]), ["1"])
+        response = self._upsert(pk, [{"code": "a"}], {"code": "keep"})
+        self.assertEqual(response.json()["update"][0], "code is not a non-key field of this model.")
+
+        response = self.client.post(reverse("api:table-row", (pk,)), {"code": "a"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse("api:table-row", (pk,)), {"code": "a"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upsert_requires_natural_key(self):
+        data = {"name": "Plain", "fields": [{"name": "code", "type": "string"}]}
+        response = self.post_table(data)
+        response = self._upsert(response.json()["id"], [{"code": "a"}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["non_field_errors"][0], "This model has no natural key.")
+
+    def test_natural_key_validation(self):
+        cases = [
+            ({"storage_mode": "jsonb"}, "Natural keys are only available in columns storage mode."),
+            (
+                {"partition_strategy": "range", "partition_key": "id", "partition_interval": 10},
+                "Natural key must include the partition key.",
+            ),
+        ]
+        for options, message in cases:
+            with self.subTest(message=message):
+                response = self._create_table(**options)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.json()["non_field_errors"][0], message)
+
+        data = {"name": "Synced", "fields": [{"name": "code", "type": "string", "natural_key": True}]}
+        response = self.post_table(data)
+        self.assertEqual(response.json()["non_field_errors"][0], "Natural key fields cannot allow null.")
+
+    def test_natural_key_field_cannot_be_modified(self):
+        pk = self._create_table().json()["id"]
+        field = DynamicModel.objects.get(pk=pk).fields.get(name="code")
+        response = self.client.put(reverse("api:table-edit", (pk,)), {"id": field.pk, "action": "delete"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["non_field_errors"][0], "Natural key field cannot be modified.")
@@ -148,6 +148,16 @@ class DynamicModelViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.json()["name"][0], "dynamic model with this name already exists.")
 
+    def test_reserved_model_name(self):
+        for name in ["Job", "rollup", "ROWTOMBSTONE", "DynamicModel"]:
+            with self.subTest(name=name):
+                data = {"name": name, "fields": [{"name": "field_1", "type": "boolean"}]}
+                response = self.client.post(
+                    self.urls["create_table"], data=json.dumps(data), content_type="application/json"
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.json()["name"][0], "This name is reserved.")
+
     def test_incorrect_model_type(self):
         data = {
             "name": "Test",
@@ -179,6 +189,57 @@ class DynamicModelViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), expected_data)
 
+    def test_get_table_data_filtered(self):
+        self.CustomModel.objects.create(field_1="Test1", field_2=True, field_3=1)
+        self.CustomModel.objects.create(field_1="Test2", field_2=False, field_3=2)
+        self.CustomModel.objects.create(field_1="Test3", field_2=None, field_3=3)
+
+        response = self.client.get(self.urls["get_table_data"], {"field_2": "false"})
+        self.assertEqual([row["field_1"] for row in response.json()], ["Test2"])
+        response = self.client.get(self.urls["get_table_data"], {"field_3__gte": 2, "field_2__isnull": "true"})
+        self.assertEqual([row["field_1"] for row in response.json()], ["Test3"])
+
+    def test_get_table_data_invalid_filter(self):
+        response = self.client.get(self.urls["get_table_data"], {"field_3__gt": "Test"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.urls["get_table_data"], {"field_3__regex": "1"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_rows_by_ids(self):
+        rows = [self.CustomModel.objects.create(field_1=f"Test{i}", field_3=i) for i in range(3)]
+        response = self.client.get(self.urls["get_table_data"], {"ids": f"{rows[2].pk},{rows[0].pk},999"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["field_1"] for row in response.json()], ["Test2", "Test0"])
+        response = self.client.get(self.urls["get_table_data"], {"ids": "1,x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", response.json())
+
+        url = reverse("api:table-lookup", (self.dynamic_model.pk,))
+        response = self.client.post(url, {"ids": [rows[1].pk, rows[1].pk]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["field_1"] for row in response.json()], ["Test1"])
+        response = self.client.post(url, {"ids": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_row_detail(self):
+        row = self.CustomModel.objects.create(field_1="Test1", field_2=True, field_3=1)
+        url = reverse("api:table-row-detail", (self.dynamic_model.pk, row.pk))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"id": row.pk, "field_1": "Test1", "field_2": True, "field_3": 1.0})
+
+        response = self.client.patch(url, {"field_3": 5}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"id": row.pk, "field_1": "Test1", "field_2": True, "field_3": 5.0})
+        response = self.client.patch(url, {"field_1": None}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(self.CustomModel.objects.exists())
+        for method in [self.client.get, self.client.patch, self.client.delete]:
+            self.assertEqual(method(url).status_code, status.HTTP_404_NOT_FOUND)
+
     def test_add_table_data_success(self):
         data = {
             "field_1": "Test1",
@@ -243,6 +304,14 @@ class DynamicModelViewTestCase(APITestCase):
         fields = DynamicModel._meta.get_fields()
         self.assertTrue(any(isinstance(field, models.FloatField) and field.name == data["name"] for field in fields))
 
+    def test_edit_field_indexed(self):
+        data = {"id": self.field_3.id, "action": "update", "indexed": True, "allow_null": True}
+        response = self.client.put(self.urls["edit_table"], data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, self.CustomModel._meta.db_table)
+        self.assertTrue(any(c["index"] and c["columns"] == ["field_3"] for c in constraints.values()))
+
     def test_edit_field_name_incorrect_id_on_update(self):
         _, field_1, _, _, _ = self._construct_model("DynamicModel3")
         data = {
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from tables.helpers import _dynamic_tables, construct_dynamic_model, get_dynamic_table
+from tables.models import DynamicModel, DynamicModelField
+
+
+class WarmUpTestCase(TestCase):
+    def setUp(self):
+        _dynamic_tables.clear()
+        self.dynamic_models = []
+        for i, name in enumerate(["WarmFirst", "WarmSecond", "WarmThird"]):
+            dynamic_model = DynamicModel.objects.create(
+                name=name, last_used_at=timezone.now() - timedelta(hours=i) if i else None
+            )
+            DynamicModelField.objects.create(
+                dynamic_model=dynamic_model, name="field_1", type=DynamicModelField.DynamicModelFieldType.STRING
+            )
+            self.dynamic_models.append(dynamic_model)
+
+    def test_warm_up_all(self):
+        with self.assertNumQueries(2), self.assertLogs("tables.apps", "INFO") as logs:
+            report = apps.get_app_config("tables").warm_up("all")
+        self.assertIn("Warmed up 3 dynamic models", logs.output[0])
+        self.assertEqual(report["tables"], 3)
+        self.assertGreater(report["memory_bytes"], 0)
+        for dynamic_model in DynamicModel.objects.all():
+            with self.assertNumQueries(0):
+                table = get_dynamic_table(dynamic_model)
+            self.assertTrue(hasattr(table.model, "field_1"))
+
+    def test_warm_up_most_recently_used(self):
+        with self.assertLogs("tables.apps", "INFO"):
+            report = apps.get_app_config("tables").warm_up(1)
+        self.assertEqual(report["tables"], 1)
+        self.assertEqual(list(_dynamic_tables), [(self.dynamic_models[1].pk, "WarmSecond")])
+
+    def test_warm_up_none(self):
+        self.assertIsNone(apps.get_app_config("tables").warm_up("none"))
+        self.assertEqual(_dynamic_tables, {})
+
+    def test_warm_up_command(self):
+        out = StringIO()
+        with self.assertLogs("tables.apps", "INFO"):
+            call_command("warm_dynamic_models", mode="all", stdout=out)
+        self.assertIn("Warmed up 3 dynamic models", out.getvalue())
+
+
+class DynamicTableCacheTestCase(APITestCase):
+    def setUp(self):
+        _dynamic_tables.clear()
+        self.dynamic_model = DynamicModel.objects.create(name="CachedTable")
+        self.field = DynamicModelField.objects.create(
+            dynamic_model=self.dynamic_model, name="field_1", type=DynamicModelField.DynamicModelFieldType.STRING
+        )
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(construct_dynamic_model(self.dynamic_model))
+
+    def test_table_is_built_once_per_schema_version(self):
+        table = get_dynamic_table(self.dynamic_model)
+        with self.assertNumQueries(0):
+            self.assertIs(get_dynamic_table(self.dynamic_model), table)
+
+        data = {"id": self.field.id, "action": "update", "name": "renamed", "allow_null": True}
+        self.client.put(reverse("api:table-edit", (self.dynamic_model.pk,)), data)
+        self.dynamic_model.refresh_from_db()
+        new_table = get_dynamic_table(self.dynamic_model)
+        self.assertIsNot(new_table, table)
+        self.assertTrue(hasattr(new_table.model, "renamed"))
+
+    def test_requests_mark_table_as_used(self):
+        self.client.get(reverse("api:table-rows", (self.dynamic_model.pk,)))
+        self.dynamic_model.refresh_from_db()
+        self.assertIsNotNone(self.dynamic_model.last_used_at)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db import connection
+from rest_framework import serializers
+from tables.constants import UpsertRuleE
+from tables.helpers import check_references, construct_serializer_field, get_dynamic_table
+from tables.models import DynamicModel
+
+# Postgres accepts at most 65535 bind parameters in a single statement.
+MAX_QUERY_PARAMS = 65535
+
+
+def construct_upsert_serializer(fields):
+    # Rows are expected to repeat existing natural keys, so the unique validators of the row serializer are left out.
+    attrs = {field.name: construct_serializer_field(field) for field in fields}
+    return type("UpsertRowSerializer", (serializers.Serializer,), attrs)
+
+
+def upsert_rows(dynamic_model: DynamicModel, rows: list, rules: dict | None = None):
+    """
+    Insert rows, or update the rows with the same natural key, with one `INSERT ... ON CONFLICT` statement per batch.
+
+    Non-key fields are overwritten by default, `rules` can keep the stored value or only replace it with non-null
+    values. Returns the numbers of inserted and updated rows.
+    """
+    table = get_dynamic_table(dynamic_model)
+    fields = [field for field in table.fields if not field.is_computed]
+    serializer = construct_upsert_serializer(fields)(data=rows, many=True)
+    if not serializer.is_valid():
+        errors = {index: row_errors for index, row_errors in enumerate(serializer.errors) if row_errors}
+        raise serializers.ValidationError({"rows": errors})
+    errors = check_references(table.model, fields, serializer.validated_data)
+    if errors:
+        raise serializers.ValidationError({"rows": errors})
+
+    quote_name = connection.ops.quote_name
+    db_table = quote_name(table.model._meta.db_table)
+    model_fields = {field.name: table.model._meta.get_field(field.name) for field in fields}
+    # Validated data is keyed by attribute names, which differ from field names for references.
+    attnames = {name: field.attname for name, field in model_fields.items()}
+    key = [field.name for field in fields if field.natural_key]
+    keys = [tuple(data[attnames[name]] for name in key) for data in serializer.validated_data]
+    if len(set(keys)) != len(keys):
+        raise serializers.ValidationError({"rows": "Rows contain duplicate natural keys."})
+
+    columns = {name: quote_name(field.column) for name, field in model_fields.items()}
+    assignments = []
+    for name, column in columns.items():
+        rule = (rules or {}).get(name, UpsertRuleE.OVERWRITE.value)
+        if name in key or rule == UpsertRuleE.KEEP.value:
+            continue
+        if rule == UpsertRuleE.COALESCE.value:
+            assignments.append(f"{column} = COALESCE(EXCLUDED.{column}, {db_table}.{column})")
+        else:
+            assignments.append(f"{column} = EXCLUDED.{column}")
+    conflict_action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+    column_list = ", ".join(columns.values())
+    key_list = ", ".join(columns[name] for name in key)
+    # Typed placeholders keep columns of nulls from being read as text.
+    row_sql = f"({', '.join(f'%s::{field.db_type(connection)}' for field in model_fields.values())})"
+
+    updated = 0
+    batch_size = min(settings.TABLE_UPSERT_BATCH_SIZE, MAX_QUERY_PARAMS // len(columns))
+    with connection.cursor() as cursor:
+        for start in range(0, len(serializer.validated_data), batch_size):
+            batch = serializer.validated_data[start : start + batch_size]
+            params = [data.get(attnames[name]) for data in batch for name in columns]
+            # All parts of the statement share one snapshot, so `existing` sees the matching rows as they were
+            # before the insert. Counting them also works for partitioned tables, where `RETURNING xmax` does not.
+            cursor.execute(
+                f"""
+                WITH rows ({column_list}) AS (VALUES {", ".join([row_sql] * len(batch))}),
+                existing AS (SELECT 1 FROM {db_table} JOIN rows USING ({key_list})),
+                upserted AS (
+                    INSERT INTO {db_table} ({column_list}) SELECT {column_list} FROM rows
+                    ON CONFLICT ({key_list}) {conflict_action}
+                )
+                SELECT COUNT(*) FROM existing
+                """,
+                params,
+            )
+            updated += cursor.fetchone()[0]
+    # Rows left alone by DO NOTHING count as updated, since their key already exists.
+    return {"inserted": len(keys) - updated, "updated": updated}
@@ -1,7 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from tables import views
+from tables import async_views, views
 
 router = DefaultRouter()
 router.register(r"table", views.DynamicModelView, basename="table")
+router.register(r"jobs", views.JobView, basename="job")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/table/<int:pk>/rows/", async_views.rows, name="async-table-rows"),
+    path("async/table/<int:pk>/row/", async_views.row, name="async-table-row"),
+    path("async/table/<int:pk>/export/", async_views.export, name="async-table-export"),
+]
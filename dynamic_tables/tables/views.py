@@ -1,16 +1,72 @@
-from django.db import connection, transaction
-from drf_yasg.utils import no_body, swagger_auto_schema
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, serializers, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.viewsets import GenericViewSet
-from tables.constants import ActionTypeE
-from tables.helpers import construct_dynamic_model, construct_dynamic_serializer, construct_field
-from tables.models import DynamicModel, DynamicModelField
+from tables.admission import ADMISSION_METRICS, admitted
+from tables.aggregates import aggregate_rows
+from tables.async_views import ASYNC_ACTIONS
+from tables.cache import (
+    ROWS_CACHE_METRICS,
+    cache_rows_response,
+    get_cached_rows_response,
+    invalidate_rows_cache,
+    rows_cache_enabled,
+    rows_cache_key,
+)
+from tables.changes import get_changes, install_change_trigger
+from tables.cloning import clone_dynamic_model
+from tables.coalescing import create_row
+from tables.constants import ActionTypeE, EndpointClassE, PartitionActionTypeE
+from tables.helpers import (
+    SEARCH_FIELD_PREFIX,
+    check_row_references,
+    construct_dynamic_model,
+    construct_rows_queryset,
+    get_dynamic_table,
+    lookup_rows,
+    parse_expand,
+    parse_row_ids,
+    query_rows,
+    serialize_rows,
+    tabulate_rows,
+    update_row,
+)
+from tables.jobs import enqueue_job
+from tables.metrics import get_metrics, increment, request_metric
+from tables.models import DynamicModel, DynamicModelField, Job
+from tables.openapi import get_openapi
+from tables.partitioning import create_partitioned_model, detach_partition, ensure_partitions, list_partitions
+from tables.renderers import tabular_renderer_classes
+from tables.replicas import is_pinned_to_primary, reads_from_replica, replica_read
+from tables.rollups import create_rollup, drop_rollup, read_rollup, sync_rollups
+from tables.sampling import is_random_sample
 from tables.serializers import (
+    DynamicModelCloneSerializer,
     DynamicModelFieldAlterationSerializer,
     DynamicModelFieldSerializer,
     DynamicModelSerializer,
+    JobSerializer,
+    PartitionAlterationSerializer,
+    RollupSerializer,
+    RowsImportSerializer,
+    RowsLookupSerializer,
+    RowsUpsertSerializer,
+)
+from tables.stats import get_table_stats, get_tables_summary
+from tables.upsert import upsert_rows
+
+ROW_BODY = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    description="Field values of a row, described for each table by its schema endpoint.",
+    additional_properties=True,
 )
 
 
@@ -18,6 +74,18 @@ class DynamicModelView(mixins.CreateModelMixin, GenericViewSet):
     serializer_class = DynamicModelSerializer
     queryset = DynamicModel.objects.all()
 
+    def get_object(self):
+        # Admission control looks the model up before the action does.
+        if getattr(self, "_object", None) is None:
+            self._object = super().get_object()
+            self._object.mark_used()
+            increment(self._object.pk, request_metric(self.action))
+        return self._object
+
+    @classmethod
+    def request_actions(cls):
+        return sorted({name for action in cls.get_extra_actions() for name in action.mapping.values()}) + ASYNC_ACTIONS
+
     @swagger_auto_schema(
         tags=["Tables"],
         operation_summary="Create a new dynamic model instance.",
@@ -42,33 +110,174 @@ class DynamicModelView(mixins.CreateModelMixin, GenericViewSet):
         instance = serializer.save()
         Dynamic = construct_dynamic_model(instance)
         with connection.schema_editor() as schema_editor:
-            schema_editor.create_model(Dynamic)
+            if instance.is_partitioned:
+                create_partitioned_model(schema_editor, Dynamic, instance)
+            else:
+                schema_editor.create_model(Dynamic)
+        if instance.is_partitioned:
+            ensure_partitions(instance)
+        if instance.track_changes:
+            install_change_trigger(instance, Dynamic)
 
+    @admitted(EndpointClassE.READ)
+    @replica_read
     @swagger_auto_schema(
         tags=["Tables"],
         operation_summary="Retrieve rows for a dynamic model.",
         responses={200: "List of rows for the dynamic model."},
     )
-    @action(methods=["GET"], detail=True, url_path="rows")
+    @action(methods=["GET"], detail=True, url_path="rows", renderer_classes=tabular_renderer_classes())
     def rows(self, request, *args, **kwargs):
         """
         Endpoint to retrieve rows for a dynamic model associated with this instance.
 
         This endpoint dynamically constructs a model and serializer based on the
         current instance's fields and serves all rows of that dynamic model.
+        Rows can be filtered with `<field>` or `<field>__<lookup>` query parameters, searched in searchable fields
+        with `search` (best matches first), sampled with `sample` (a percentage like `5%` or an approximate row
+        count, with `sample_method` and a `seed` for repeatable samples), sorted with `ordering` (comma separated
+        fields, `-` for descending) and paged with `limit` and `offset`. With `ids`, a comma separated list of row
+        ids, only those rows are looked up by primary key and the other parameters are ignored, except `expand`.
+        `expand` lists reference fields whose ids are replaced with the referenced rows, loaded with one lookup
+        per field.
+        Besides JSON, rows can be requested in a columnar JSON layout (`application/vnd.tables.columnar+json`)
+        and as MessagePack (`application/msgpack`), or with the `format` query parameter.
+
+        When row caching is enabled for the table, the encoded response is served from
+        the rows cache until a write or schema change invalidates it. Reads are served by a
+        replica when one is configured, unless the client wrote recently. Clients which wrote
+        recently bypass the rows cache and responses read from a replica are not cached, a
+        lagging replica would otherwise fill the cache with rows older than its data version.
 
         Returns a response with status 200 and a JSON array containing serialized rows.
         """
         object = self.get_object()
-        Dynamic = construct_dynamic_model(object)
-        serializer_class = construct_dynamic_serializer(Dynamic, "__all__")
-        serializer = serializer_class(Dynamic.objects.all(), many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Unseeded samples are random and expanded rows embed rows of other tables, so they are not cached.
+        cacheable = (
+            rows_cache_enabled(object)
+            and not is_pinned_to_primary(request)
+            and not is_random_sample(request.query_params)
+            and "expand" not in request.query_params
+        )
+        cache_key = rows_cache_key(object, request) if cacheable else None
+        if cache_key:
+            cached_response = get_cached_rows_response(object, cache_key)
+            if cached_response is not None:
+                return cached_response
+
+        table = get_dynamic_table(object)
+        expand = parse_expand(table, request.query_params["expand"]) if "expand" in request.query_params else []
+        if "ids" in request.query_params:
+            rows = lookup_rows(object, table, parse_row_ids(request.query_params["ids"]))
+        else:
+            rows = query_rows(object, table, request.query_params)
+        response = Response(self.render_rows(request, table, rows, expand), status=status.HTTP_200_OK)
+        if cache_key and not reads_from_replica(request):
+            cache_rows_response(object, cache_key, response)
+        return response
+
+    @admitted(EndpointClassE.READ)
+    @replica_read
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve rows of a dynamic model by id.",
+        request_body=RowsLookupSerializer(),
+        responses={
+            200: "List of the rows found, in the order of the requested ids.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["POST"], detail=True, url_path="rows/lookup", renderer_classes=tabular_renderer_classes())
+    def lookup(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve rows by id for a dynamic model associated with this instance.
+
+        The body variant of `rows?ids=`, for id lists too long for a query string. Rows are looked up
+        by primary key, ids without a row are left out of the response.
+
+        Returns a response with status 200 and a JSON array containing serialized rows.
+        """
+        object = self.get_object()
+        serializer = RowsLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        table = get_dynamic_table(object)
+        rows = lookup_rows(object, table, serializer.validated_data["ids"])
+        return Response(self.render_rows(request, table, rows), status=status.HTTP_200_OK)
+
+    def render_rows(self, request, table, rows, expand=()):
+        # Tabular renderers encode value tuples straight from the database, the others get serialized rows.
+        if getattr(request.accepted_renderer, "tabular", False):
+            return tabulate_rows(table, rows, expand)
+        return serialize_rows(table, rows, expand)
+
+    @admitted(EndpointClassE.READ)
+    @replica_read
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Aggregate rows of a dynamic model.",
+        manual_parameters=[
+            openapi.Parameter("group_by", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("metrics", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: "List of groups with their metrics.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["GET"], detail=True, url_path="aggregate", renderer_classes=tabular_renderer_classes())
+    def aggregate(self, request, *args, **kwargs):
+        """
+        Endpoint to aggregate rows of a dynamic model associated with this instance.
+
+        Rows filtered like in `rows` are grouped by the comma separated `group_by` fields, and every group
+        gets the comma separated `metrics`: `count` or `<sum|avg|min|max>:<field>`, named `<function>_<field>`.
+        Responses are negotiated like rows.
+
+        Returns a response with status 200 and one entry per group, ordered by the group fields.
+        """
+        object = self.get_object()
+        result = aggregate_rows(object, get_dynamic_table(object), request.query_params)
+        if not getattr(request.accepted_renderer, "tabular", False):
+            result = [dict(zip(result.columns, row)) for row in result.rows]
+        return Response(result, status=status.HTTP_200_OK)
+
+    @admitted(EndpointClassE.READ)
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve rows changed since a cursor.",
+        manual_parameters=[
+            openapi.Parameter("since", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: "Inserted or updated rows, ids of deleted rows and the cursor of the next page.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["GET"], detail=True, url_path="changes")
+    def changes(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve changes of a dynamic model associated with this instance since a cursor.
+
+        Requires change tracking, enabled with `track_changes` when the model is created. Rows are returned in the
+        order they were changed, once per page even if changed several times, and deleted rows by id.
+        Pass the returned `cursor` as `since` to get the next page, `has_more` tells whether one is ready.
+
+        Returns a response with status 200 and a JSON object with `upserted`, `deleted`, `cursor` and `has_more`.
+        """
+        object = self.get_object()
+        if not object.track_changes:
+            raise serializers.ValidationError("Change tracking is not enabled for this model.")
+        since = serializers.IntegerField(min_value=0).run_validation(request.query_params.get("since", 0))
+        limit = serializers.IntegerField(min_value=1, max_value=settings.TABLE_CHANGES_PAGE_SIZE).run_validation(
+            request.query_params.get("limit", settings.TABLE_CHANGES_PAGE_SIZE)
+        )
+        return Response(get_changes(object, since, limit), status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         tags=["Tables"],
         operation_summary="Create a row for a dynamic model.",
-        request_body=no_body,
+        request_body=ROW_BODY,
         responses={
             201: "Serialized data of the created row.",
             400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
@@ -81,18 +290,173 @@ class DynamicModelView(mixins.CreateModelMixin, GenericViewSet):
 
         This endpoint dynamically constructs a model and serializer based on the
         current instance's fields and creates a new row using the provided data.
+        For models with `coalesce_writes`, concurrent single-row writes are committed together.
 
         Returns a response with status 201 and the serialized data of the created row.
         """
         object = self.get_object()
-        Dynamic = construct_dynamic_model(object)
-        serializer_class = construct_dynamic_serializer(Dynamic, "__all__")
-        serializer = serializer_class(data=request.data)
+        table = get_dynamic_table(object)
+        serializer = table.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        instance = Dynamic.objects.create(**serializer.validated_data)
-        serializer = serializer_class(instance)
+        check_row_references(table, serializer.validated_data)
+        instance = create_row(object, table.model, serializer.validated_data)
+        serializer = table.serializer_class(instance)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        methods=["GET"],
+        tags=["Tables"],
+        operation_summary="Retrieve a row of a dynamic model.",
+        responses={200: "Serialized data of the row.", 404: "No row with this id."},
+    )
+    @swagger_auto_schema(
+        methods=["PATCH"],
+        tags=["Tables"],
+        operation_summary="Update fields of a row of a dynamic model.",
+        request_body=ROW_BODY,
+        responses={
+            200: "Serialized data of the updated row.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+            404: "No row with this id.",
+        },
+    )
+    @swagger_auto_schema(
+        methods=["DELETE"],
+        tags=["Tables"],
+        operation_summary="Delete a row of a dynamic model.",
+        responses={
+            204: "Row deleted.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+            404: "No row with this id.",
+        },
+    )
+    @action(methods=["GET", "PATCH", "DELETE"], detail=True, url_path=r"row/(?P<row_id>[0-9]+)", url_name="row-detail")
+    def row_detail(self, request, row_id, *args, **kwargs):
+        """
+        Endpoint to retrieve, partially update or delete one row of a dynamic model by its id.
+
+        The row is found through a primary key lookup. Updates only change the fields sent in the
+        request, which are validated like in row creation. Rows referenced by rows of other tables
+        cannot be deleted.
+
+        Returns a response with status 200 and the serialized row, 204 after a delete, or 404 when
+        the table has no row with this id.
+        """
+        object = self.get_object()
+        table = get_dynamic_table(object)
+        row_id = int(row_id)
+        if request.method == "DELETE":
+            try:
+                # Foreign keys are checked at commit, checking them here turns a violation into a 400.
+                with transaction.atomic():
+                    deleted, _ = table.model.objects.filter(pk=row_id).delete()
+                    connection.check_constraints()
+            except IntegrityError:
+                raise serializers.ValidationError("Row is referenced by rows of other tables.")
+            if not deleted:
+                raise NotFound("No row matches the given query.")
+            invalidate_rows_cache(object)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        instance = construct_rows_queryset(object, table.model, table.fields).in_bulk([row_id]).get(row_id)
+        if instance is None:
+            raise NotFound("No row matches the given query.")
+        if request.method == "PATCH":
+            serializer = table.serializer_class(instance, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            check_row_references(table, serializer.validated_data)
+            instance = update_row(instance, serializer.validated_data)
+            invalidate_rows_cache(object)
+        return Response(table.serializer_class(instance).data, status=status.HTTP_200_OK)
+
+    @admitted(EndpointClassE.BULK_WRITE)
+    @transaction.atomic()
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Insert or update rows of a dynamic model by natural key.",
+        request_body=RowsUpsertSerializer(),
+        responses={
+            200: "Numbers of inserted and updated rows.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["POST"], detail=True, url_path="upsert")
+    def upsert(self, request, *args, **kwargs):
+        """
+        Endpoint to insert or update many rows in a dynamic model associated with this instance.
+
+        Rows are matched on the natural key fields of the model and written in batches of
+        `INSERT ... ON CONFLICT DO UPDATE` statements. Per field `update` rules decide whether
+        matched rows are overwritten (default), kept or only updated with non-null values.
+
+        Returns a response with status 200 and the numbers of inserted and updated rows.
+        """
+        object = self.get_object()
+        serializer = RowsUpsertSerializer(data=request.data, context={"instance": object})
+        serializer.is_valid(raise_exception=True)
+        result = upsert_rows(object, serializer.validated_data["rows"], serializer.validated_data.get("update"))
+        invalidate_rows_cache(object)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @admitted(EndpointClassE.BULK_WRITE)
+    @transaction.atomic()
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Clone a dynamic model with its rows.",
+        request_body=DynamicModelCloneSerializer(),
+        responses={
+            201: "Serialized data of the cloned dynamic model instance with the number of copied rows.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["POST"], detail=True, url_path="clone")
+    def clone(self, request, *args, **kwargs):
+        """
+        Endpoint to clone a dynamic model associated with this instance under a new name.
+
+        The table structure and the rows, optionally restricted with the same filters as the rows endpoint,
+        are copied inside the database in a single transaction, so the clone is a consistent snapshot.
+
+        Returns a response with status 201 and the serialized data of the cloned dynamic model instance.
+        """
+        object = self.get_object()
+        serializer = DynamicModelCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        clone, copied_rows = clone_dynamic_model(
+            object, serializer.validated_data["name"], serializer.validated_data.get("filters")
+        )
+        data = {**self.get_serializer(clone).data, "copied_rows": copied_rows}
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @admitted(EndpointClassE.BULK_WRITE)
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Import rows into a dynamic model in the background.",
+        request_body=RowsImportSerializer(),
+        responses={
+            202: JobSerializer,
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @action(methods=["POST"], detail=True, url_path="import", url_name="import")
+    def import_rows(self, request, *args, **kwargs):
+        """
+        Endpoint to import many rows into a dynamic model associated with this instance.
+
+        The rows are validated and inserted in batches by a table worker (`manage.py run_table_workers`),
+        so the request returns immediately. Progress is available on the returned job.
+
+        Returns a response with status 202 and the serialized job.
+        """
+        object = self.get_object()
+        serializer = RowsImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data["rows"]
+        job = enqueue_job(object, Job.JobKind.IMPORT, {"rows": rows}, total=len(rows))
+        location = reverse("api:job-detail", (job.pk,), request=request)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={"Location": location})
+
+    @admitted(EndpointClassE.SCHEMA)
     @transaction.atomic()
     @swagger_auto_schema(
         tags=["Tables"],
@@ -119,32 +483,316 @@ class DynamicModelView(mixins.CreateModelMixin, GenericViewSet):
 
         field_action = serializer.validated_data.pop("action")
         field_pk = serializer.validated_data.pop("id", None)
+        CurrentDynamicModel = construct_dynamic_model(object)
 
-        if field_action == ActionTypeE.CREATE.value:
+        if object.storage_mode == DynamicModel.StorageMode.JSONB:
+            self.alter_jsonb_field(object, field_action, field_pk, serializer.validated_data)
+            self.schema_editor_sync_derived(object, CurrentDynamicModel)
+        elif field_action == ActionTypeE.CREATE.value:
             dynamic_model_field = DynamicModelField.objects.create(dynamic_model=object, **serializer.validated_data)
             self.schema_editor_add_field(object, dynamic_model_field.name)
+            self.schema_editor_sync_derived(object, CurrentDynamicModel)
         elif field_action == ActionTypeE.DELETE.value:
             dynamic_model_field = DynamicModelField.objects.get(pk=field_pk)
-            self.schema_editor_remove_field(object, dynamic_model_field.name)
             dynamic_model_field.delete()
+            # Search columns and indexes depend on the column, so they are dropped first.
+            self.schema_editor_sync_derived(object, CurrentDynamicModel)
+            self.schema_editor_remove_field(CurrentDynamicModel, dynamic_model_field.name)
         else:
             field_name = serializer.validated_data.get("name", None)
             dynamic_model_field = DynamicModelField.objects.get(pk=field_pk)
             dynamic_model_field_name = dynamic_model_field.name
-            CurrentDynamicModel = construct_dynamic_model(object)
             self.update_dynamic_model_field(dynamic_model_field, serializer.validated_data)
             self.schema_editor_alter_field(CurrentDynamicModel, dynamic_model_field_name, field_name)
+            self.schema_editor_sync_derived(object, CurrentDynamicModel)
 
+        object.bump_schema_version()
+        if object.storage_mode == DynamicModel.StorageMode.COLUMNS:
+            # Rollup triggers refer to columns by name.
+            sync_rollups(object)
+        invalidate_rows_cache(object)
         serializer = self.get_serializer(object)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve the OpenAPI schema of the rows of a dynamic model.",
+        responses={
+            200: "Swagger 2.0 document of the row endpoints.",
+            304: "The schema matches the If-None-Match ETag.",
+        },
+    )
+    @action(methods=["GET"], detail=True, url_path="schema", url_name="schema")
+    def openapi_schema(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve an OpenAPI schema of the row endpoints of a dynamic model associated with this instance.
+
+        Row request and response bodies are described with the model's fields. The document is generated once
+        per schema version and served with an ETag, so clients polling with If-None-Match get a 304 until
+        the schema changes.
+
+        Returns a response with status 200 and the Swagger 2.0 document, or 304 when it has not changed.
+        """
+        object = self.get_object()
+        content, etag = get_openapi(object)
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            content, content_type="application/json"
+        )
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve service metrics for a dynamic model.",
+        responses={200: "Counters collected for the dynamic model."},
+    )
+    @action(methods=["GET"], detail=True, url_path="metrics")
+    def metrics(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve service counters for a dynamic model associated with this instance.
+
+        Counters are per worker process unless the default cache is shared, and restart from 0 when evicted. The
+        number of queued requests is always the one of the process serving the request.
+
+        Returns a response with status 200 and a JSON object mapping counter names to their values.
+        """
+        object = self.get_object()
+        return Response(get_metrics(object.pk, ROWS_CACHE_METRICS + ADMISSION_METRICS), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve storage and usage statistics of a dynamic model.",
+        responses={200: "Sizes, row estimates, vacuum state, index usage and request counters of the table."},
+    )
+    @action(methods=["GET"], detail=True, url_path="stats")
+    def stats(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve storage and usage statistics of the table of a dynamic model associated with this
+        instance.
+
+        Row estimates, heap, index and TOAST sizes, dead rows and the last vacuum and analyze come from
+        `pg_class` and `pg_stat_user_tables`, index sizes and scans from `pg_stat_user_indexes`, summed over
+        partitions. They are cached for `TABLE_STATS_CACHE_TIMEOUT` seconds, the service's own counters are not.
+        Request counters and metrics are kept like those of `metrics`, per worker process with a local cache.
+
+        Returns a response with status 200 and a JSON object with the statistics, `requests` with the number of
+        requests per endpoint and `metrics` with the counters of the metrics endpoint.
+        """
+        object = self.get_object()
+        requests = get_metrics(object.pk, [request_metric(name) for name in self.request_actions()])
+        data = {
+            **get_table_stats(object),
+            "requests": {name.removeprefix("requests_"): count for name, count in requests.items() if count},
+            "metrics": get_metrics(object.pk, ROWS_CACHE_METRICS + ADMISSION_METRICS),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Retrieve storage and usage statistics of all dynamic models.",
+        responses={200: "Statistics of every table without index details, largest first."},
+    )
+    # Named to sort before `edit`, whose route also matches `stats/` and is registered in the order of the names.
+    @action(methods=["GET"], detail=False, url_path="stats", url_name="all-stats")
+    def all_stats(self, request, *args, **kwargs):
+        """
+        Endpoint to retrieve storage and usage statistics of the tables of all dynamic models.
+
+        Tables are described like in `stats`, without their indexes and request counters, and the summary is
+        cached for `TABLE_STATS_CACHE_TIMEOUT` seconds.
+
+        Returns a response with status 200 and a JSON array of tables ordered by total size, largest first.
+        """
+        return Response(get_tables_summary(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="List partitions of a dynamic model.",
+        responses={200: "List of partitions with their bounds and estimated row counts."},
+    )
+    @action(methods=["GET"], detail=True, url_path="partitions")
+    def partitions(self, request, *args, **kwargs):
+        """
+        Endpoint to list partitions of a partitioned dynamic model associated with this instance.
+
+        Returns a response with status 200 and a JSON array describing each partition.
+        """
+        object = self.get_object()
+        if not object.is_partitioned:
+            raise serializers.ValidationError("This model is not partitioned.")
+        return Response(list_partitions(object), status=status.HTTP_200_OK)
+
+    @admitted(EndpointClassE.SCHEMA)
+    @transaction.atomic()
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Detach or drop a partition of a dynamic model.",
+        request_body=PartitionAlterationSerializer(),
+        responses={
+            200: "List of remaining partitions.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @partitions.mapping.post
+    def alter_partitions(self, request, *args, **kwargs):
+        """
+        Endpoint to detach or drop an old range partition of a dynamic model associated with this instance.
+
+        Both actions only change catalog metadata, detached partitions stay available as standalone tables.
+
+        Returns a response with status 200 and a JSON array describing the remaining partitions.
+        """
+        object = self.get_object()
+        if not object.is_partitioned:
+            raise serializers.ValidationError("This model is not partitioned.")
+        serializer = PartitionAlterationSerializer(
+            data=request.data, context={"instance": object, "partitions": list_partitions(object)}
+        )
+        serializer.is_valid(raise_exception=True)
+        detach_partition(
+            object,
+            serializer.validated_data["name"],
+            drop=serializer.validated_data["action"] == PartitionActionTypeE.DROP.value,
+        )
+        invalidate_rows_cache(object)
+        return Response(list_partitions(object), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="List rollups of a dynamic model.",
+        responses={200: RollupSerializer(many=True)},
+    )
+    @action(methods=["GET"], detail=True, url_path="rollups")
+    def rollups(self, request, *args, **kwargs):
+        """
+        Endpoint to list rollups of a dynamic model associated with this instance.
+
+        Returns a response with status 200 and a JSON array of rollup definitions.
+        """
+        object = self.get_object()
+        return Response(RollupSerializer(object.rollups.all(), many=True).data, status=status.HTTP_200_OK)
+
+    @admitted(EndpointClassE.SCHEMA)
+    @transaction.atomic()
+    @swagger_auto_schema(
+        tags=["Tables"],
+        operation_summary="Create a rollup of a dynamic model.",
+        request_body=RollupSerializer(),
+        responses={
+            201: RollupSerializer,
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+        },
+    )
+    @rollups.mapping.post
+    def create_rollup(self, request, *args, **kwargs):
+        """
+        Endpoint to create a rollup of a dynamic model associated with this instance.
+
+        A rollup keeps the `count` of rows and `<sum|min|max>:<field>` metrics of the groups of `group_by` fields
+        in a companion table. Writes are logged by triggers and folded into it by `manage.py refresh_rollups`.
+        The rollup is filled from the current rows while writes to the table wait.
+
+        Returns a response with status 201 and the rollup definition.
+        """
+        object = self.get_object()
+        serializer = RollupSerializer(data=request.data, context={"instance": object})
+        serializer.is_valid(raise_exception=True)
+        rollup = serializer.save(dynamic_model=object)
+        create_rollup(rollup)
+        rollup.refresh_from_db()
+        return Response(RollupSerializer(rollup).data, status=status.HTTP_201_CREATED)
+
+    @admitted(EndpointClassE.READ)
+    @swagger_auto_schema(
+        methods=["GET"],
+        tags=["Tables"],
+        operation_summary="Read the groups of a rollup.",
+        manual_parameters=[openapi.Parameter("max_lag", openapi.IN_QUERY, type=openapi.TYPE_NUMBER)],
+        responses={
+            200: "Groups with their metrics, the time of the last refresh and the lag in seconds.",
+            400: "Bad Request: Indicates one of the following issues: invalid input data, missing required fields, or other client-side errors.",
+            404: "No rollup with this name.",
+        },
+    )
+    @swagger_auto_schema(
+        methods=["DELETE"],
+        tags=["Tables"],
+        operation_summary="Delete a rollup.",
+        responses={204: "Rollup deleted.", 404: "No rollup with this name."},
+    )
+    @action(
+        methods=["GET", "DELETE"],
+        detail=True,
+        url_path=r"rollups/(?P<rollup_name>[a-zA-Z]+)",
+        url_name="rollup-detail",
+    )
+    def rollup_detail(self, request, rollup_name, *args, **kwargs):
+        """
+        Endpoint to read or delete a rollup of a dynamic model associated with this instance.
+
+        Groups are read from the rollup table, named like in `aggregate`, and do not include writes logged
+        since the last refresh. `lag_seconds` is how long the oldest of them has been waiting, with `max_lag`
+        a rollup lagging further behind is refreshed before it is read.
+
+        Returns a response with status 200 and the groups with `refreshed_at` and `lag_seconds`, 204 after a
+        delete, or 404 when the model has no rollup with this name.
+        """
+        object = self.get_object()
+        rollup = object.rollups.filter(name=rollup_name).first()
+        if rollup is None:
+            raise NotFound("No rollup matches the given query.")
+        if request.method == "DELETE":
+            with transaction.atomic():
+                drop_rollup(rollup)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        max_lag = request.query_params.get("max_lag")
+        if max_lag is not None:
+            max_lag = serializers.FloatField(min_value=0).run_validation(max_lag)
+        return Response(read_rollup(rollup, max_lag), status=status.HTTP_200_OK)
+
+    def alter_jsonb_field(self, dynamic_model: DynamicModel, field_action: str, field_pk, validated_data: dict):
+        # Values are stored under the field id, so renames and removals leave the JSONB documents untouched
+        # and only typed expression indexes and search columns need DDL.
+        if field_action == ActionTypeE.CREATE.value:
+            DynamicModelField.objects.create(dynamic_model=dynamic_model, **validated_data)
+        elif field_action == ActionTypeE.DELETE.value:
+            DynamicModelField.objects.get(pk=field_pk).delete()
+        else:
+            self.update_dynamic_model_field(DynamicModelField.objects.get(pk=field_pk), validated_data)
+
+    def schema_editor_sync_derived(self, dynamic_model: DynamicModel, CurrentDynamicModel):
+        # Meta indexes and search columns are derived from field options, so they are applied by diffing
+        # the models generated before and after an edit.
+        NewDynamic = construct_dynamic_model(dynamic_model)
+        current_indexes = {index.name: index for index in CurrentDynamicModel._meta.indexes}
+        new_indexes = {index.name: index for index in NewDynamic._meta.indexes}
+        current_columns = {
+            field.name: field
+            for field in CurrentDynamicModel._meta.concrete_fields
+            if field.name.startswith(SEARCH_FIELD_PREFIX)
+        }
+        new_columns = {
+            field.name: field
+            for field in NewDynamic._meta.concrete_fields
+            if field.name.startswith(SEARCH_FIELD_PREFIX)
+        }
+        with connection.schema_editor() as schema_editor:
+            for name in current_indexes.keys() - new_indexes.keys():
+                schema_editor.remove_index(CurrentDynamicModel, current_indexes[name])
+            for name in current_columns.keys() - new_columns.keys():
+                schema_editor.remove_field(CurrentDynamicModel, current_columns[name])
+            for name in new_columns.keys() - current_columns.keys():
+                schema_editor.add_field(NewDynamic, new_columns[name])
+            for name in new_indexes.keys() - current_indexes.keys():
+                schema_editor.add_index(NewDynamic, new_indexes[name])
+
     def schema_editor_add_field(self, dynamic_model: DynamicModel, field_name: str):
         Dynamic = construct_dynamic_model(dynamic_model)
         with connection.schema_editor() as schema_editor:
             schema_editor.add_field(Dynamic, Dynamic._meta.get_field(field_name))
 
-    def schema_editor_remove_field(self, dynamic_model: DynamicModel, field_name: str):
-        Dynamic = construct_dynamic_model(dynamic_model)
+    def schema_editor_remove_field(self, Dynamic, field_name: str):
         with connection.schema_editor() as schema_editor:
             schema_editor.remove_field(Dynamic, Dynamic._meta.get_field(field_name))
 
@@ -161,3 +809,21 @@ class DynamicModelView(mixins.CreateModelMixin, GenericViewSet):
                 CurrentDynamicModel._meta.get_field(current_field_name),
                 NewDynamic._meta.get_field(new_field_name if new_field_name else current_field_name),
             )
+
+
+class JobView(mixins.RetrieveModelMixin, GenericViewSet):
+    serializer_class = JobSerializer
+    queryset = Job.objects.all()
+
+    @swagger_auto_schema(
+        tags=["Jobs"],
+        operation_summary="Retrieve status and progress of a background job.",
+        responses={200: JobSerializer},
+    )
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve status and progress of a background job.
+
+        Returns serialized data of the job with status 200.
+        """
+        return super().retrieve(request, *args, **kwargs)